@@ -0,0 +1,49 @@
+"""Замер времени импорта библиотеки (холодный старт CLI и serverless-обработчиков).
+
+Каждый модуль импортируется в новом процессе интерпретатора с ``-X importtime``, из вывода берется
+накопленное время импорта самого модуля (без запуска интерпретатора). Для каждого модуля выводятся
+медиана и минимум по ``--repeat`` запускам и то, был ли при импорте загружен ``requests``.
+
+.. code-block:: console
+
+    $ python benchmarks/bench_import.py
+    $ python benchmarks/bench_import.py yandex_360 yandex_360.users --repeat 50
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+MODULES = ('yandex_360', 'yandex_360.users', 'yandex_360.client', 'yandex_360.tools', 'yandex_360.aio', 'requests')
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def import_time(module):
+    """Время импорта модуля в новом процессе, секунд, и признак загрузки requests"""
+
+    code = f"import sys, {module}; print('requests' in sys.modules)"
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, (ROOT, os.environ.get('PYTHONPATH')))))
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], env=env, check=True,
+                          stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+    for line in reversed(proc.stderr.splitlines()):
+        fields = line.split('|')
+        if len(fields) == 3 and fields[2].strip() == module:
+            return int(fields[1]) / 1e6, proc.stdout.strip() == 'True'
+    raise RuntimeError(f'нет строки импорта {module}')
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('modules', nargs='*', default=MODULES)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    for module in args.modules:
+        runs = [import_time(module) for _ in range(args.repeat)]
+        times = [elapsed for elapsed, _ in runs]
+        loaded = 'да' if runs[-1][1] else 'нет'
+        print(f'{module:<20} медиана {statistics.median(times) * 1000:7.2f} мс  минимум {min(times) * 1000:7.2f} мс  requests: {loaded}')
+
+if __name__ == '__main__':
+    main()
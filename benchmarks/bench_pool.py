@@ -0,0 +1,80 @@
+"""Сравнение запросов без пула соединений (как в jreq) и через пул Yandex360Client.
+
+Запуск:
+
+.. code-block:: console
+
+    $ python benchmarks/bench_pool.py --requests 500 --latency 0.002
+
+Локальный сервер считает принятые TCP-соединения: без пула каждый запрос открывает
+новое соединение (а в реальном API — и новое TLS-рукопожатие), с пулом — одно на поток.
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from yandex_360 import ratelimit, users
+from yandex_360.client import Yandex360Client, using
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    latency = 0.0
+    connections = 0
+    lock = threading.Lock()
+
+    def setup(self):
+        super().setup()
+        with Handler.lock:
+            Handler.connections += 1
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        body = json.dumps({'users': [], 'page': 1, 'pages': 1, 'perPage': 100, 'total': 0}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+def run(label, func, count):
+    Handler.connections = 0
+    start = time.perf_counter()
+    for _ in range(count):
+        func()
+    elapsed = time.perf_counter() - start
+    print(f'{label:<12} {count} запросов: {elapsed:.3f} c, {count/elapsed:.0f} req/s, соединений: {Handler.connections}')
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=300)
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--pool-size', type=int, default=10)
+    args = parser.parse_args()
+
+    # замеряется только пул соединений, ограничение частоты запросов отключено
+    ratelimit.configure(directory=None, security=None, admin=None)
+    Handler.latency = args.latency
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f'http://127.0.0.1:{server.server_port}'
+    url = f'{base_url}/directory/v1/org/1/users/?page=1&perPage=100'
+
+    run('без пула', lambda: requests.get(url, headers={'Authorization': 'OAuth x'}).json(), args.requests)
+
+    with Yandex360Client('x', '1', pool_size=args.pool_size, base_url=base_url) as client:
+        with using(client):
+            run('с пулом', lambda: users.show_users('x', '1'), args.requests)
+
+    server.shutdown()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,170 @@
+"""Набор замеров производительности библиотеки на локальном тестовом сервере.
+
+Сценарии выполняются против :class:`yandex_360.fakeserver.FakeServer` с фиксированной задержкой
+ответа, каждый — в отдельном процессе, чтобы пиковый объем памяти (RSS) относился только к нему:
+
+* ``get_users`` — tools.get_users (постраничная загрузка всех сотрудников);
+* ``get_id_user_by_nickname`` — поиск последнего сотрудника (полный проход по страницам);
+* ``get_mail_log`` — tools.get_mail_log (цепочка nextPageToken);
+* ``update_user`` — параллельные users.update_user;
+* ``add_member_group`` — параллельные groups.add_member_group.
+
+Для каждого сценария выводятся время (лучшее из ``--repeat`` запусков), количество запросов,
+запросов в секунду и пиковый RSS.
+Результаты сравниваются с сохраненными в ``baseline.json``:
+
+.. code-block:: console
+
+    $ python benchmarks/bench_suite.py                  # замер и сравнение с baseline.json
+    $ python benchmarks/bench_suite.py --save           # замер и сохранение baseline.json
+    $ python benchmarks/bench_suite.py get_users --users 100000 --latency 0.01
+
+Код завершения 1 означает, что время сценария выросло больше чем на ``--threshold``
+или изменилось количество запросов.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+TOKEN = 'bench'
+ORG_ID = '1'
+
+def _peak_rss():
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == 'darwin' else rss * 1024
+
+def _scenarios(args):
+    from yandex_360 import groups, tools, users
+
+    uids = [str(1130000000000000 + i) for i in range(min(args.bulk, args.users))]
+
+    def get_users():
+        assert len(tools.get_users(TOKEN, ORG_ID, max_workers=args.workers)['users']) == args.users
+
+    def get_id_user_by_nickname():
+        assert tools.get_id_user_by_nickname(f'user{args.users - 1}', TOKEN, ORG_ID)
+
+    def get_mail_log():
+        assert len(tools.get_mail_log(TOKEN, ORG_ID)['events']) == args.events
+
+    def update_user():
+        for resp in tools.map_parallel(lambda uid: users.update_user(TOKEN, ORG_ID, uid, {'position': 'Бенчмарк'}), uids, args.workers):
+            assert tools.check_request(resp)
+
+    def add_member_group():
+        for resp in tools.map_parallel(lambda uid: groups.add_member_group(TOKEN, ORG_ID, 1, {'type': 'user', 'id': uid}), uids, args.workers):
+            assert tools.check_request(resp)
+
+    return {func.__name__: func for func in (get_users, get_id_user_by_nickname, get_mail_log, update_user, add_member_group)}
+
+SCENARIOS = ('get_users', 'get_id_user_by_nickname', 'get_mail_log', 'update_user', 'add_member_group')
+
+def run_scenario(name, url, args):
+    """Выполнение одного сценария в текущем процессе (вызывается в дочернем процессе)"""
+
+    from yandex_360 import ratelimit
+    from yandex_360.client import Yandex360Client, using
+
+    ratelimit.configure(directory=None, security=None, admin=None)
+    func = _scenarios(args)[name]
+    with Yandex360Client(TOKEN, ORG_ID, base_url=url) as client, using(client):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+    return {'wall': elapsed, 'rss': _peak_rss()}
+
+def measure(names, args):
+    from yandex_360.fakeserver import FakeOrg, FakeServer
+
+    org = FakeOrg(users=args.users, events=args.events, seed=args.seed, orgID=ORG_ID)
+    results = {}
+    with FakeServer(org, latency=args.latency) as server:
+        for name in names:
+            cmd = [sys.executable, os.path.abspath(__file__), '--child', name, '--url', server.url,
+                   '--users', str(args.users), '--events', str(args.events), '--bulk', str(args.bulk), '--workers', str(args.workers)]
+            result = None
+            for _ in range(args.repeat):
+                server.reset_stats()
+                out = subprocess.run(cmd, check=True, stdout=subprocess.PIPE, universal_newlines=True).stdout
+                run = json.loads(out.strip().splitlines()[-1])
+                run['requests'] = server.requests
+                if result is None or run['wall'] < result['wall']:
+                    result = run
+            result['rps'] = server.requests / result['wall'] if result['wall'] else 0.0
+            results[name] = result
+            rss = f"{result['rss'] / 2 ** 20:.1f} МБ" if result['rss'] else '—'
+            print(f"{name:<26} {result['wall']:8.3f} c {result['requests']:7d} запросов {result['rps']:8.0f} req/s  RSS {rss}")
+    return results
+
+def compare(results, baseline, threshold):
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get('results', {}).get(name)
+        if base is None:
+            continue
+        change = result['wall'] / base['wall'] - 1 if base['wall'] else 0.0
+        mark = ''
+        if change > threshold:
+            mark = '  <- медленнее'
+            regressions.append(name)
+        if result['requests'] != base['requests']:
+            mark += f"  <- запросов было {base['requests']}"
+            if name not in regressions:
+                regressions.append(name)
+        print(f'{name:<26} {change:+7.1%}{mark}')
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('scenarios', nargs='*', metavar='scenario', help=', '.join(SCENARIOS))
+    parser.add_argument('--users', type=int, default=10000)
+    parser.add_argument('--events', type=int, default=5000)
+    parser.add_argument('--bulk', type=int, default=500)
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--latency', type=float, default=0.002)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--threshold', type=float, default=0.2)
+    parser.add_argument('--baseline', default=BASELINE)
+    parser.add_argument('--save', action='store_true')
+    parser.add_argument('--child')
+    parser.add_argument('--url')
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_scenario(args.child, args.url, args)))
+        return
+
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"неизвестные сценарии: {', '.join(sorted(unknown))}")
+
+    params = {key: getattr(args, key) for key in ('users', 'events', 'bulk', 'workers', 'latency', 'seed')}
+    results = measure(args.scenarios or SCENARIOS, args)
+
+    if args.save:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump({'params': params, 'results': results}, f, indent=2, sort_keys=True)
+        print(f'сохранено: {args.baseline}')
+        return
+
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get('params') != params:
+            print(f"параметры отличаются от baseline: {baseline.get('params')}")
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
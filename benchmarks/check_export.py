@@ -0,0 +1,73 @@
+"""Проверка параллельной выгрузки аудит-логов (:mod:`yandex_360.export`) на локальном тестовом сервере.
+
+Сценарии:
+
+* ``sparse`` — события равномерно распределены по периоду, окна делятся при превышении ``max_pages``;
+* ``dense`` — все события приходятся на одну секунду: окно нельзя разделить, выгрузка должна
+  дочитать цепочку ``nextPageToken``, а не запрашивать одно и то же окно повторно.
+
+Каждый сценарий должен вернуть все события без повторов, от новых к старым, не превысив
+бюджет запросов. Код завершения 1 означает ошибку.
+
+.. code-block:: console
+
+    $ python benchmarks/check_export.py
+"""
+
+import sys
+from datetime import datetime, timedelta, timezone
+
+from yandex_360 import export, logs, ratelimit
+from yandex_360.client import Yandex360Client, using
+from yandex_360.fakeserver import FakeOrg, FakeServer
+
+TOKEN = 'check'
+ORG_ID = '1'
+NOW = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+class BudgetExceeded(Exception):
+    pass
+
+def run(name, org, afterDate, beforeDate, budget, **kwargs):
+    calls = [0]
+
+    def show(*args, **params):
+        calls[0] += 1
+        if calls[0] > budget:
+            raise BudgetExceeded(f'больше {budget} запросов')
+        return logs.mail_log(*args, **params)
+
+    with FakeServer(org) as server, Yandex360Client(TOKEN, ORG_ID, base_url=server.url) as client, using(client):
+        try:
+            result = export.LogExporter(show, TOKEN, ORG_ID, afterDate, beforeDate, **kwargs).collect()
+        except BudgetExceeded as e:
+            print(f'{name:<8} ошибка: {e}')
+            return False
+
+    events = result.get('events', [])
+    ids = [event['uniqId'] for event in events]
+    dates = [event['date'] for event in events]
+    problems = []
+    if len(ids) != len(org.mail_events) or set(ids) != {event['uniqId'] for event in org.mail_events}:
+        problems.append(f'событий {len(set(ids))} из {len(org.mail_events)}')
+    if len(ids) != len(set(ids)):
+        problems.append('повторы uniqId')
+    if dates != sorted(dates, reverse=True):
+        problems.append('нарушен порядок от новых к старым')
+    print(f"{name:<8} {len(ids):6d} событий {calls[0]:6d} запросов  {'; '.join(problems) or 'ok'}")
+    return not problems
+
+def main():
+    ratelimit.configure(directory=None, security=None, admin=None)
+    ok = run('sparse', FakeOrg(users=50, events=5000, days=30, now=NOW),
+             export.format_date(NOW - timedelta(days=30)), export.format_date(NOW + timedelta(seconds=1)),
+             budget=500, shards=4, max_pages=3)
+    # days=1/86400: все события с датой NOW
+    ok &= run('dense', FakeOrg(users=50, events=1500, days=1 / 86400, now=NOW),
+              export.format_date(NOW - timedelta(seconds=2)), export.format_date(NOW + timedelta(seconds=1)),
+              budget=100, shards=2, max_pages=3)
+    if not ok:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
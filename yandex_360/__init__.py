@@ -1,12 +1,39 @@
 """Библиотека Yandex 360 API
 
+Модули библиотеки загружаются при первом обращении к ним как к атрибутам пакета
+(:pep:`562`), поэтому ``import yandex_360`` не импортирует ни модули API, ни ``requests``:
+
+.. code-block:: python
+
+    import yandex_360
+
+    usr = yandex_360.users.show_user(token, orgID, userID)   # загружается только yandex_360.users
+
 .. moduleauthor:: Купцов Игорь Валерьевич <ya360@uh.net.ru>
 
 """
 
+import importlib
+
 try:
     from ._version import __version__
 except:
     __version__ = 'dev'
 
 __author__ = 'Купцов Игорь Валерьевич'
+
+_SUBMODULES = frozenset((
+    'a2fa', 'aio', 'antispam', 'audit2fa', 'auth', 'cassette', 'client', 'delegation', 'departments',
+    'directory', 'dns', 'domains', 'eventstore', 'export', 'fakeserver', 'groups', 'logs', 'logsync',
+    'mail', 'mailsnapshot', 'membership', 'metrics', 'org', 'orgtree', 'pwd', 'ratelimit', 'reconcile',
+    'replica', 'routing', 'sinks', 'tools', 'users',
+))
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        # import_module сам записывает модуль в атрибуты пакета, следующие обращения идут мимо __getattr__
+        return importlib.import_module(f'{__name__}.{name}')
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+def __dir__():
+    return sorted(set(globals()) | _SUBMODULES)
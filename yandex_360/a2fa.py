@@ -8,7 +8,7 @@
 
 """
 
-from jreq.jreq import safe_request
+from .client import safe_request
 import json
 
 def show_domain_2fa(token, orgID):
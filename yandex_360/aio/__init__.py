@@ -0,0 +1,43 @@
+"""Асинхронный API библиотеки для asyncio.
+
+Пакет содержит асинхронные аналоги всех функций модулей ``users``, ``groups``, ``departments``, ``mail``,
+``domains``, ``dns``, ``logs``, ``org``, ``a2fa``, ``antispam``, ``auth``, ``pwd``, ``routing``
+с теми же сигнатурами, а также асинхронные функции модуля :mod:`yandex_360.aio.tools`.
+Запросы выполняются через общий пул соединений ``aiohttp`` с ограничением одновременных запросов.
+
+Требуется Python 3.7+ и пакет ``aiohttp`` (``pip install yandex-360[aio]``).
+
+.. code-block:: python
+
+    from yandex_360 import aio
+
+    async def main():
+        async with aio.AsyncClient(token, orgID, concurrency=50) as client:
+            usrs = await client.tools.get_users()
+            results = await asyncio.gather(*(client.users.show_user_2fa(u['id']) for u in usrs['users']))
+
+"""
+
+import importlib
+import inspect
+import sys
+import types
+
+from .client import AsyncClient, using, current, close, safe_request, mirror
+
+_MODULES = ('users', 'groups', 'departments', 'domains', 'dns', 'mail', 'logs', 'org',
+            'a2fa', 'antispam', 'auth', 'pwd', 'routing')
+
+def _mirror_module(name):
+    module = importlib.import_module(f'{__package__.rpartition(".")[0]}.{name}')
+    amodule = types.ModuleType(f'{__name__}.{name}', module.__doc__)
+    for attr, func in vars(module).items():
+        if inspect.isfunction(func) and func.__module__ == module.__name__ and not attr.startswith('_'):
+            setattr(amodule, attr, mirror(func))
+    sys.modules[amodule.__name__] = amodule
+    return amodule
+
+for _name in _MODULES:
+    globals()[_name] = _mirror_module(_name)
+
+from . import tools
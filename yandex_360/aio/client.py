@@ -0,0 +1,291 @@
+"""Модуль асинхронного HTTP-клиента с общим пулом соединений.
+
+Требуется пакет ``aiohttp`` (``pip install yandex-360[aio]``).
+"""
+
+import asyncio
+import contextvars
+import functools
+import inspect
+import json
+import random
+import weakref
+
+import aiohttp
+
+from .. import client as sync_client
+from .. import ratelimit
+from ..client import API_URL
+
+DEFAULT_POOL_SIZE = 100
+"""Размер пула соединений по умолчанию"""
+
+DEFAULT_CONCURRENCY = 100
+"""Максимальное количество одновременных запросов клиента по умолчанию"""
+
+_current = contextvars.ContextVar('yandex_360_aio_client', default=None)
+_default_clients = weakref.WeakKeyDictionary()
+
+class _Call:
+    """Параметры запроса, сформированного синхронной функцией модуля"""
+
+    def __init__(self, mode, url, headers=None, body=None):
+        self.mode = mode
+        self.url = url
+        self.headers = headers
+        self.body = body
+
+class _Recorder:
+    """Клиент, который не выполняет запрос, а возвращает его параметры"""
+
+    def request(self, mode, url, headers=None, body=None, try_number=1):
+        return _Call(mode, url, headers, body)
+
+_recorder = _Recorder()
+
+def mirror(func):
+    """Функция создает асинхронный аналог функции модуля библиотеки
+
+    Синхронная функция формирует адрес, заголовки и тело запроса, сам запрос выполняется асинхронно.
+
+    :param func: функция модуля (например, users.show_user)
+    :type func: function
+    :return: асинхронная функция с той же сигнатурой
+    :rtype: function
+    """
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        with sync_client.using(_recorder):
+            call = func(*args, **kwargs)
+        return await safe_request(call.mode, call.url, call.headers, call.body)
+
+    return wrapper
+
+def current():
+    """Функция возвращает клиент, активный в текущем контексте
+
+    :return: клиент или None
+    :rtype: AsyncClient
+    """
+
+    return _current.get()
+
+class using:
+    """Контекстный менеджер, направляющий запросы текущего контекста через клиент
+
+    :param client: клиент
+    :type client: AsyncClient
+    """
+
+    def __init__(self, client):
+        self.client = client
+
+    def __enter__(self):
+        self.token = _current.set(self.client)
+        return self.client
+
+    def __exit__(self, *exc):
+        _current.reset(self.token)
+
+def default_client():
+    """Функция возвращает общий клиент текущего цикла событий
+
+    :return: клиент
+    :rtype: AsyncClient
+    """
+
+    loop = asyncio.get_event_loop()
+    client = _default_clients.get(loop)
+    if client is None:
+        client = _default_clients[loop] = AsyncClient()
+    return client
+
+async def close():
+    """Функция закрывает общий клиент текущего цикла событий"""
+
+    client = _default_clients.pop(asyncio.get_event_loop(), None)
+    if client is not None:
+        await client.close()
+
+async def safe_request(mode, url, headers=None, body=None, try_number=1):
+    """Асинхронная функция безопасного запроса
+
+    Запрос выполняется через клиент, активный в текущем контексте, либо через общий клиент цикла событий.
+
+    :param mode: метод запроса (get, post, put, patch, delete)
+    :type mode: str
+    :param url: адрес запроса
+    :type url: str
+    :param headers: заголовки запроса
+    :type headers: dict
+    :param body: тело запроса (если предусмотрено)
+    :type body: str
+    :param try_number: номер попытки передачи запроса
+    :type try_number: int
+    :return: результат запроса
+    :rtype: dict
+    """
+
+    client = current() or default_client()
+    return await client.request(mode, url, headers, body, try_number)
+
+class _AsyncBoundModule:
+    """Асинхронный модуль библиотеки с подставленными token и orgID клиента"""
+
+    def __init__(self, client, module):
+        self._client = client
+        self._module = module
+
+    def __getattr__(self, name):
+        func = getattr(self._module, name)
+        if not callable(func) or inspect.isclass(func):
+            return func
+        params = list(inspect.signature(func).parameters)
+        client = self._client
+
+        def bind(args, kwargs):
+            if params[:2] == ['token', 'orgID']:
+                return (client.token, client.orgID) + args, kwargs
+            if 'token' in params:
+                kwargs.setdefault('token', client.token)
+            if 'orgID' in params:
+                kwargs.setdefault('orgID', client.orgID)
+            return args, kwargs
+
+        if inspect.isasyncgenfunction(func):
+            async def bound(*args, **kwargs):
+                args, kwargs = bind(args, kwargs)
+                agen = func(*args, **kwargs)
+                while True:
+                    with using(client):
+                        try:
+                            item = await agen.__anext__()
+                        except StopAsyncIteration:
+                            return
+                    yield item
+        elif inspect.iscoroutinefunction(func):
+            async def bound(*args, **kwargs):
+                args, kwargs = bind(args, kwargs)
+                with using(client):
+                    return await func(*args, **kwargs)
+        else:
+            def bound(*args, **kwargs):
+                args, kwargs = bind(args, kwargs)
+                return func(*args, **kwargs)
+
+        bound.__name__ = name
+        bound.__doc__ = func.__doc__
+        return bound
+
+class AsyncClient:
+    """Асинхронный клиент Yandex 360 API с пулом соединений и ограничением одновременных запросов
+
+    Асинхронные модули библиотеки доступны как атрибуты клиента, token и orgID подставляются автоматически:
+    ``await client.users.show_user(userID)``.
+
+    :param token: :term:`Яндекс токен приложения`
+    :type token: str
+    :param orgID: :term:`ID организации в Яндекс 360`
+    :type orgID: str
+    :param pool_size: максимальное количество соединений в пуле
+    :type pool_size: int
+    :param concurrency: максимальное количество одновременных запросов
+    :type concurrency: int
+    :param base_url: базовый адрес API (например, адрес локального тестового сервера)
+    :type base_url: str
+    """
+
+    def __init__(self, token=None, orgID=None, pool_size=DEFAULT_POOL_SIZE, concurrency=DEFAULT_CONCURRENCY, base_url=API_URL):
+        self.token = token
+        self.orgID = orgID
+        self.pool_size = pool_size
+        self.concurrency = concurrency
+        self.base_url = base_url.rstrip('/')
+        self._session = None
+        self._semaphore = None
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        from .. import aio
+        module = getattr(aio, name, None)
+        if module is None or not inspect.ismodule(module):
+            raise AttributeError(name)
+        bound = _AsyncBoundModule(self, module)
+        setattr(self, name, bound)
+        return bound
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    def _get_session(self):
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=self.pool_size))
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self._session
+
+    async def close(self):
+        """Функция закрывает все соединения пула"""
+
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def request(self, mode, url, headers=None, body=None, try_number=1):
+        """Функция выполняет запрос через пул соединений клиента
+
+        Запрос проходит через общий ограничитель частоты и политику повтора модуля :mod:`yandex_360.ratelimit`.
+
+        :param mode: метод запроса (get, post, put, patch, delete)
+        :type mode: str
+        :param url: адрес запроса
+        :type url: str
+        :param headers: заголовки запроса
+        :type headers: dict
+        :param body: тело запроса (если предусмотрено)
+        :type body: str
+        :param try_number: номер попытки передачи запроса
+        :type try_number: int
+        :return: результат запроса
+        :rtype: dict
+        """
+
+        if self.base_url != API_URL and url.startswith(API_URL):
+            url = self.base_url + url[len(API_URL):]
+
+        session = self._get_session()
+        attempt = 0
+        while True:
+            wait = ratelimit.limiter.reserve(url)
+            while wait:
+                await asyncio.sleep(wait)
+                wait = ratelimit.limiter.reserve(url)
+            info = None
+            try:
+                async with self._semaphore:
+                    info = sync_client.start_request(mode, url) if sync_client.has_hooks() else None
+                    async with session.request(mode.upper(), url, data=body, headers=headers) as response:
+                        delay = ratelimit.retry.delay(attempt, response.status, response.headers)
+                        raw = await response.read()
+                if delay is not None:
+                    if info is not None:
+                        sync_client.finish_request(info, response.status, len(raw))
+                    ratelimit.limiter.pause(url, delay)
+                    await asyncio.sleep(delay)
+                    attempt += 1
+                    continue
+                resp = json.loads(raw)
+                if info is not None:
+                    sync_client.finish_request(info, response.status, len(raw))
+            except (aiohttp.ClientConnectionError, json.decoder.JSONDecodeError) as e:
+                if info is not None:
+                    sync_client.fail_request(info, e)
+                await asyncio.sleep(2**try_number + random.random()*0.01)
+                try_number += 1
+            else:
+                sync_client.notify_write(mode, url)
+                return resp
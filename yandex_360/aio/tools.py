@@ -0,0 +1,247 @@
+"""Модуль асинхронных вспомогательных функций.
+
+Функции повторяют :mod:`yandex_360.tools`: страницы 2..pages загружаются одновременно
+(не более ``max_workers`` запросов), списки с nextPageToken — по цепочке токенов.
+"""
+
+import asyncio
+from collections import deque
+
+from . import users, groups, departments, domains, dns, org, logs
+from ..tools import check_request, RequestError, DEFAULT_MAX_WORKERS
+
+class Paginator:
+    """Асинхронный постраничный обход списков Yandex 360 API, аналог :class:`yandex_360.tools.Paginator`
+
+    :param show: асинхронная функция запроса одной страницы (например, aio.users.show_users)
+    :type show: function
+    :param token: :term:`Яндекс токен приложения`
+    :type token: str
+    :param orgID: :term:`ID организации в Яндекс 360`
+    :type orgID: str
+    :param args: дополнительные позиционные аргументы функции show
+    :param max_workers: максимальное количество одновременных запросов страниц
+    :type max_workers: int
+    :param kwargs: дополнительные именованные аргументы функции show
+    """
+
+    def __init__(self, show, token, orgID, *args, max_workers=DEFAULT_MAX_WORKERS, **kwargs):
+        self.show = show
+        self.token = token
+        self.orgID = orgID
+        self.args = args
+        self.kwargs = kwargs
+        self.max_workers = max_workers
+        self.calls = 0
+
+    async def _request(self, **extra):
+        self.calls += 1
+        return await self.show(self.token, self.orgID, *self.args, **self.kwargs, **extra)
+
+    async def pages(self):
+        """Асинхронный генератор ответов по страницам в порядке страниц
+
+        :return: ответы запросов
+        :rtype: async generator
+        """
+
+        resp = await self._request()
+        yield resp
+        if not check_request(resp):
+            return
+
+        if 'pages' in resp:
+            pending = deque()
+            try:
+                for page in range(2, resp['pages']+1):
+                    pending.append(asyncio.ensure_future(self._request(page=page)))
+                    if len(pending) >= self.max_workers:
+                        resp = await pending.popleft()
+                        yield resp
+                        if not check_request(resp):
+                            return
+                while pending:
+                    resp = await pending.popleft()
+                    yield resp
+                    if not check_request(resp):
+                        return
+            finally:
+                for task in pending:
+                    task.cancel()
+        else:
+            while resp.get('nextPageToken'):
+                resp = await self._request(pageToken=resp['nextPageToken'])
+                yield resp
+                if not check_request(resp):
+                    return
+
+    async def items(self, key):
+        """Асинхронный генератор записей списка
+
+        :param key: ключ списка в ответе (users, groups, events...)
+        :type key: str
+        :return: записи списка
+        :rtype: async generator
+        :raises RequestError: при ошибке запроса
+        """
+
+        async for resp in self.pages():
+            if not check_request(resp):
+                raise RequestError(resp)
+            for item in resp[key]:
+                yield item
+
+    async def collect(self, key):
+        """Функция загружает все страницы и объединяет списки в порядке страниц
+
+        :param key: ключ списка в ответе (users, groups, events...)
+        :type key: str
+        :return: объединенный результат или ответ с ошибкой
+        :rtype: dict
+        """
+
+        lst = []
+        async for resp in self.pages():
+            if not check_request(resp):
+                return resp
+            lst += resp[key]
+
+        if 'pages' in resp:
+            return {key:lst,"page":resp['page'],"pages":resp['pages'],"perPage":resp['perPage'],"total":resp['total']}
+
+        return {key:lst,"nextPageToken":resp.get('nextPageToken', '')}
+
+async def _resolve(show, key, field, values, token, orgID):
+    result = dict.fromkeys(values)
+    left = set(result)
+    if not left:
+        return result
+
+    pages = Paginator(show, token, orgID, max_workers=1).pages()
+    try:
+        async for resp in pages:
+            if not check_request(resp):
+                return resp
+            for item in resp[key]:
+                if item[field] in left:
+                    result[item[field]] = item['id']
+                    left.discard(item[field])
+            if not left:
+                break
+    finally:
+        await pages.aclose()
+
+    return result
+
+async def _get_id(show, key, field, sstr, token, orgID):
+    result = await _resolve(show, key, field, [sstr], token, orgID)
+    if not check_request(result):
+        return result
+    if result[sstr] is not None:
+        return {'id':result[sstr]}
+
+async def get_id_group_by_label(sstr, token, orgID):
+    """Асинхронный аналог :func:`yandex_360.tools.get_id_group_by_label`"""
+
+    return await _get_id(groups.show_groups, 'groups', 'label', sstr, token, orgID)
+
+async def get_id_department_by_label(sstr, token, orgID):
+    """Асинхронный аналог :func:`yandex_360.tools.get_id_department_by_label`"""
+
+    return await _get_id(departments.show_departments, 'departments', 'label', sstr, token, orgID)
+
+async def get_id_user_by_nickname(sstr, token, orgID):
+    """Асинхронный аналог :func:`yandex_360.tools.get_id_user_by_nickname`"""
+
+    return await _get_id(users.show_users, 'users', 'nickname', sstr, token, orgID)
+
+async def resolve_nicknames(nicknames, token, orgID):
+    """Асинхронный аналог :func:`yandex_360.tools.resolve_nicknames`"""
+
+    return await _resolve(users.show_users, 'users', 'nickname', nicknames, token, orgID)
+
+async def resolve_group_labels(labels, token, orgID):
+    """Асинхронный аналог :func:`yandex_360.tools.resolve_group_labels`"""
+
+    return await _resolve(groups.show_groups, 'groups', 'label', labels, token, orgID)
+
+async def resolve_department_labels(labels, token, orgID):
+    """Асинхронный аналог :func:`yandex_360.tools.resolve_department_labels`"""
+
+    return await _resolve(departments.show_departments, 'departments', 'label', labels, token, orgID)
+
+async def get_groups(token, orgID, max_workers=DEFAULT_MAX_WORKERS):
+    """Асинхронный аналог :func:`yandex_360.tools.get_groups`"""
+
+    return await Paginator(groups.show_groups, token, orgID, max_workers=max_workers).collect('groups')
+
+async def get_departments(token, orgID, max_workers=DEFAULT_MAX_WORKERS):
+    """Асинхронный аналог :func:`yandex_360.tools.get_departments`"""
+
+    return await Paginator(departments.show_departments, token, orgID, max_workers=max_workers).collect('departments')
+
+async def get_users(token, orgID, max_workers=DEFAULT_MAX_WORKERS):
+    """Асинхронный аналог :func:`yandex_360.tools.get_users`"""
+
+    return await Paginator(users.show_users, token, orgID, max_workers=max_workers).collect('users')
+
+async def get_domains(token, orgID, max_workers=DEFAULT_MAX_WORKERS):
+    """Асинхронный аналог :func:`yandex_360.tools.get_domains`"""
+
+    return await Paginator(domains.show_domains, token, orgID, max_workers=max_workers).collect('domains')
+
+async def get_dns(token, orgID, domain, max_workers=DEFAULT_MAX_WORKERS):
+    """Асинхронный аналог :func:`yandex_360.tools.get_dns`"""
+
+    return await Paginator(dns.show_dns, token, orgID, domain, max_workers=max_workers).collect('records')
+
+async def get_orgs(token, orgID):
+    """Асинхронный аналог :func:`yandex_360.tools.get_orgs`"""
+
+    return await Paginator(org.show_orgs, token, orgID).collect('organizations')
+
+async def get_disk_log(token, orgID, beforeDate=None, afterDate=None, includeUids=None, excludeUids=None):
+    """Асинхронный аналог :func:`yandex_360.tools.get_disk_log`"""
+
+    return await Paginator(logs.disk_log, token, orgID, beforeDate=beforeDate, afterDate=afterDate, includeUids=includeUids, excludeUids=excludeUids).collect('events')
+
+async def get_mail_log(token, orgID, beforeDate=None, afterDate=None, includeUids=None, excludeUids=None, types=None):
+    """Асинхронный аналог :func:`yandex_360.tools.get_mail_log`"""
+
+    return await Paginator(logs.mail_log, token, orgID, beforeDate=beforeDate, afterDate=afterDate, includeUids=includeUids, excludeUids=excludeUids, types=types).collect('events')
+
+async def iter_users(token, orgID, max_workers=DEFAULT_MAX_WORKERS):
+    """Асинхронный генератор, аналог :func:`yandex_360.tools.iter_users`"""
+
+    async for item in Paginator(users.show_users, token, orgID, max_workers=max_workers).items('users'):
+        yield item
+
+async def iter_groups(token, orgID, max_workers=DEFAULT_MAX_WORKERS):
+    """Асинхронный генератор, аналог :func:`yandex_360.tools.iter_groups`"""
+
+    async for item in Paginator(groups.show_groups, token, orgID, max_workers=max_workers).items('groups'):
+        yield item
+
+async def iter_departments(token, orgID, max_workers=DEFAULT_MAX_WORKERS):
+    """Асинхронный генератор, аналог :func:`yandex_360.tools.iter_departments`"""
+
+    async for item in Paginator(departments.show_departments, token, orgID, max_workers=max_workers).items('departments'):
+        yield item
+
+async def iter_dns(token, orgID, domain, max_workers=DEFAULT_MAX_WORKERS):
+    """Асинхронный генератор, аналог :func:`yandex_360.tools.iter_dns`"""
+
+    async for item in Paginator(dns.show_dns, token, orgID, domain, max_workers=max_workers).items('records'):
+        yield item
+
+async def iter_disk_log(token, orgID, beforeDate=None, afterDate=None, includeUids=None, excludeUids=None):
+    """Асинхронный генератор, аналог :func:`yandex_360.tools.iter_disk_log`"""
+
+    async for item in Paginator(logs.disk_log, token, orgID, beforeDate=beforeDate, afterDate=afterDate, includeUids=includeUids, excludeUids=excludeUids).items('events'):
+        yield item
+
+async def iter_mail_log(token, orgID, beforeDate=None, afterDate=None, includeUids=None, excludeUids=None, types=None):
+    """Асинхронный генератор, аналог :func:`yandex_360.tools.iter_mail_log`"""
+
+    async for item in Paginator(logs.mail_log, token, orgID, beforeDate=beforeDate, afterDate=afterDate, includeUids=includeUids, excludeUids=excludeUids, types=types).items('events'):
+        yield item
@@ -9,7 +9,7 @@
 
 """
 
-from jreq.jreq import safe_request
+from .client import safe_request
 import json
 
 def show_whitelist(token, orgID):
@@ -0,0 +1,143 @@
+"""Модуль проверки статуса 2FA всех сотрудников организации.
+
+Сотрудники загружаются потоком (:func:`yandex_360.tools.iter_users`), запросы users.show_user_2fa
+выполняются параллельно в ограниченном пуле потоков с общим ограничителем частоты запросов
+(:mod:`yandex_360.ratelimit`). Результат построчно дописывается в CSV, который одновременно служит
+контрольной точкой: при повторном запуске уже проверенные сотрудники пропускаются.
+
+.. code-block:: python
+
+    from yandex_360 import audit2fa
+
+    def progress(stats):
+        print(f"{stats['done']} проверено, без 2FA: {stats['without2fa']}", end='\\r')
+
+    report = audit2fa.scan_2fa(token, orgID, '2fa.csv', max_workers=16, progress=progress)
+    print(report['without2fa'], report['withoutIds'][:10])
+
+"""
+
+import csv
+import os
+import time
+
+from . import tools, users
+
+FIELDS = ('userId', 'nickname', 'email', 'isEnabled', 'isAdmin', 'has2fa', 'error')
+"""Колонки CSV-отчета"""
+
+DEFAULT_MAX_WORKERS = 16
+"""Количество потоков по умолчанию"""
+
+def load_report(path):
+    """Функция читает CSV-отчет
+
+    Для сотрудника, встречающегося несколько раз (повторная проверка после ошибки), берется последняя строка.
+
+    :param path: путь к CSV-отчету
+    :type path: str
+    :return: {userId: строка отчета}
+    :rtype: dict
+    """
+
+    if not os.path.exists(path):
+        return {}
+
+    with open(path, newline='', encoding='utf-8') as f:
+        return {row['userId']: row for row in csv.DictReader(f)}
+
+def scan_2fa(token, orgID, path, max_workers=DEFAULT_MAX_WORKERS, progress=None, usrs=None):
+    """Функция проверяет статус 2FA всех сотрудников и записывает потоковый CSV-отчет
+
+    Сотрудники, уже записанные в отчет без ошибки, повторно не проверяются.
+
+    :param token: :term:`Яндекс токен приложения`
+    :type token: str
+    :param orgID: :term:`ID организации в Яндекс 360`
+    :type orgID: str
+    :param path: путь к CSV-отчету (дописывается)
+    :type path: str
+    :param max_workers: количество одновременных запросов
+    :type max_workers: int
+    :param progress: функция, вызываемая после каждого сотрудника со статистикой
+    :type progress: function
+    :param usrs: сотрудники (по умолчанию загружаются tools.iter_users)
+    :type usrs: iterable
+    :return: :numref:`отчет %s <Отчет scan_2fa>`
+    :rtype: dict
+    :raises tools.RequestError: при ошибке загрузки списка сотрудников
+
+    .. code-block:: python
+        :caption: Отчет scan_2fa
+        :name: Отчет scan_2fa
+
+        {
+            "done": int,
+            "skipped": int,
+            "with2fa": int,
+            "without2fa": int,
+            "errors": int,
+            "withoutIds": [
+                str
+            ],
+            "calls": int,
+            "elapsed": float,
+            "rate": float
+        }
+
+    """
+
+    previous = load_report(path)
+    stats = {'done': 0, 'skipped': 0, 'with2fa': 0, 'without2fa': 0, 'errors': 0, 'withoutIds': [], 'calls': 0, 'elapsed': 0.0, 'rate': 0.0}
+
+    def count(row):
+        if row['error']:
+            stats['errors'] += 1
+        elif row['has2fa'] == 'True':
+            stats['with2fa'] += 1
+        else:
+            stats['without2fa'] += 1
+            stats['withoutIds'].append(row['userId'])
+
+    def pending():
+        for user in tools.iter_users(token, orgID) if usrs is None else usrs:
+            row = previous.get(str(user['id']))
+            if row is not None and not row['error']:
+                stats['skipped'] += 1
+                count(row)
+                continue
+            yield user
+
+    def check(user):
+        return user, users.show_user_2fa(token, orgID, user['id'])
+
+    start = time.monotonic()
+    new = not os.path.exists(path) or os.path.getsize(path) == 0
+    with open(path, 'a', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, FIELDS)
+        if new:
+            writer.writeheader()
+
+        for user, resp in tools.map_parallel(check, pending(), max_workers):
+            ok = tools.check_request(resp)
+            row = {
+                'userId': str(user['id']),
+                'nickname': user.get('nickname'),
+                'email': user.get('email'),
+                'isEnabled': user.get('isEnabled'),
+                'isAdmin': user.get('isAdmin'),
+                'has2fa': resp.get('has2fa') if ok else '',
+                'error': '' if ok else f"{resp.get('code')}: {resp.get('message')}",
+            }
+            writer.writerow(row)
+            f.flush()
+            count({key: str(value) for key, value in row.items()})
+            stats['calls'] += 1
+            stats['done'] += 1
+            stats['elapsed'] = time.monotonic() - start
+            stats['rate'] = stats['done'] / stats['elapsed'] if stats['elapsed'] else 0.0
+            if progress is not None:
+                progress(stats)
+
+    stats['elapsed'] = time.monotonic() - start
+    return stats
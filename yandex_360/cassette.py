@@ -0,0 +1,261 @@
+"""Модуль записи и воспроизведения запросов к API (кассеты).
+
+В режиме записи каждый запрос модулей библиотеки выполняется как обычно, а пара «запрос — ответ»
+сохраняется в сжатый файл кассеты (JSON, gzip или zstd по расширению). Заголовки, включая токен,
+не сохраняются. В режиме воспроизведения ответы выдаются из кассеты без обращения к сети,
+при необходимости с записанной или заданной задержкой. Одинаковые запросы (например, повторный
+опрос статуса задачи) воспроизводятся в порядке записи. Воспроизведенные запросы, как и обычные,
+передаются обработчикам событий запросов (:func:`yandex_360.client.add_hook`) с записанными кодом
+ответа и размером и оповещают подписчиков об изменяющих запросах.
+
+.. code-block:: python
+
+    from yandex_360 import cassette, reconcile
+
+    # первый запуск записывает nightly.json.gz, последующие воспроизводят его
+    with cassette.use_cassette('nightly.json.gz', token, orgID):
+        reconcile.reconcile_users(desired, token, orgID)
+
+"""
+
+import gzip
+import json
+import os
+import threading
+import time
+from collections import deque
+from urllib.parse import urlsplit
+
+from .client import (API_URL, Yandex360Client, add_hook, fail_request, finish_request, has_hooks, notify_write,
+                     remove_hook, start_request, using)
+
+VERSION = 1
+"""Версия формата кассеты"""
+
+class CassetteError(LookupError):
+    """В кассете нет ответа на запрос
+
+    :param method: метод запроса
+    :type method: str
+    :param url: адрес запроса
+    :type url: str
+    """
+
+    def __init__(self, method, url):
+        super().__init__(f'{method} {url}')
+        self.method = method
+        self.url = url
+
+def _key(mode, url, body):
+    parts = urlsplit(url)
+    path = parts.path + ('?' + parts.query if parts.query else '')
+    if isinstance(body, bytes):
+        body = body.decode('utf-8', 'replace')
+    return mode.upper(), path, body
+
+def _open(path, mode, name=None):
+    name = name or path
+    if name.endswith('.zst'):
+        import zstandard
+        if mode == 'rb':
+            return zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), closefd=True)
+        return zstandard.ZstdCompressor(level=10).stream_writer(open(path, 'wb'), closefd=True)
+    if name.endswith('.gz'):
+        return gzip.open(path, mode)
+    return open(path, mode)
+
+def load(path):
+    """Функция читает записи кассеты
+
+    :param path: путь к файлу кассеты
+    :type path: str
+    :return: записи: [{'method': str, 'path': str, 'body': str, 'response': dict, 'elapsed': float,
+        'status': int, 'bytes': int}]
+    :rtype: list
+    """
+
+    with _open(path, 'rb') as f:
+        data = json.loads(f.read())
+    if data.get('version') != VERSION:
+        raise ValueError(f"неподдерживаемая версия кассеты: {data.get('version')}")
+    return data['interactions']
+
+def save(path, interactions):
+    """Функция записывает кассету
+
+    :param path: путь к файлу кассеты
+    :type path: str
+    :param interactions: записи
+    :type interactions: list
+    """
+
+    data = json.dumps({'version': VERSION, 'interactions': interactions}, ensure_ascii=False, separators=(',', ':'))
+    tmp = f'{path}.tmp'
+    with _open(tmp, 'wb', path) as f:
+        f.write(data.encode('utf-8'))
+    os.replace(tmp, path)
+
+class RecordingClient(Yandex360Client):
+    """Клиент, выполняющий запросы и записывающий их в кассету
+
+    Кассета записывается методом :meth:`save` и при закрытии клиента.
+
+    :param path: путь к файлу кассеты (.gz — gzip, .zst — zstd)
+    :type path: str
+    :param token: :term:`Яндекс токен приложения`
+    :type token: str
+    :param orgID: :term:`ID организации в Яндекс 360`
+    :type orgID: str
+    :param kwargs: параметры Yandex360Client: pool_size, base_url
+    """
+
+    def __init__(self, path, token, orgID, **kwargs):
+        super().__init__(token, orgID, **kwargs)
+        self.path = path
+        self.interactions = []
+        self._lock = threading.Lock()
+        self._last = threading.local()
+        add_hook(self)
+
+    def after(self, info):
+        # код и размер последнего ответа в потоке запроса (после повторов 429/503)
+        self._last.status = info['status']
+        self._last.bytes = info['bytes']
+
+    def request(self, mode, url, headers=None, body=None, try_number=1):
+        start = time.perf_counter()
+        self._last.status = self._last.bytes = None
+        resp = super().request(mode, url, headers, body, try_number)
+        method, path, body = _key(mode, url, body)
+        with self._lock:
+            self.interactions.append({'method': method, 'path': path, 'body': body, 'response': resp,
+                                      'elapsed': round(time.perf_counter() - start, 6),
+                                      'status': self._last.status, 'bytes': self._last.bytes})
+        return resp
+
+    def save(self):
+        """Функция записывает в кассету выполненные к этому моменту запросы"""
+
+        with self._lock:
+            interactions = list(self.interactions)
+        save(self.path, interactions)
+
+    def close(self):
+        """Функция записывает кассету и закрывает соединения пула"""
+
+        remove_hook(self)
+        self.save()
+        super().close()
+
+class ReplayClient(Yandex360Client):
+    """Клиент, отвечающий на запросы из кассеты без обращения к сети
+
+    :param path: путь к файлу кассеты
+    :type path: str
+    :param token: :term:`Яндекс токен приложения`
+    :type token: str
+    :param orgID: :term:`ID организации в Яндекс 360`
+    :type orgID: str
+    :param latency: задержка ответа: None — без задержки, 'recorded' — записанная, число — секунд
+    :type latency: float
+    :param repeat_last: при исчерпании записей на запрос повторять последний ответ (иначе CassetteError)
+    :type repeat_last: bool
+    """
+
+    def __init__(self, path, token='', orgID='', latency=None, repeat_last=False):
+        super().__init__(token, orgID, pool_size=1)
+        self.path = path
+        self.latency = latency
+        self.repeat_last = repeat_last
+        self.calls = 0
+        self._lock = threading.Lock()
+        self._queues = {}
+        self._last = {}
+        for interaction in load(path):
+            key = (interaction['method'], interaction['path'], interaction['body'])
+            self._queues.setdefault(key, deque()).append(interaction)
+
+    def _next(self, key):
+        with self._lock:
+            self.calls += 1
+            queue = self._queues.get(key)
+            if queue:
+                interaction = self._last[key] = queue.popleft()
+            elif self.repeat_last and key in self._last:
+                interaction = self._last[key]
+            else:
+                raise CassetteError(key[0], key[1])
+        return interaction
+
+    def request(self, mode, url, headers=None, body=None, try_number=1):
+        info = start_request(mode, url) if has_hooks() else None
+        try:
+            interaction = self._next(_key(mode, url, body))
+        except CassetteError as e:
+            if info is not None:
+                fail_request(info, e)
+            raise
+
+        delay = interaction['elapsed'] if self.latency == 'recorded' else self.latency
+        if delay:
+            time.sleep(delay)
+        data = json.dumps(interaction['response'])
+        if info is not None:
+            # в кассетах без кода и размера ответа — 200 и размер записанного JSON
+            status = interaction.get('status') or 200
+            size = interaction.get('bytes')
+            finish_request(info, status, len(data) if size is None else size)
+        notify_write(mode, url)
+        return json.loads(data)
+
+    def remaining(self):
+        """Функция возвращает количество невоспроизведенных записей
+
+        :return: количество записей
+        :rtype: int
+        """
+
+        with self._lock:
+            return sum(len(queue) for queue in self._queues.values())
+
+class use_cassette:
+    """Контекстный менеджер, направляющий запросы текущего потока через кассету
+
+    При mode='auto' кассета записывается, если файла нет, и воспроизводится, если он есть.
+    При записи кассета сохраняется при выходе из контекста, в том числе по исключению:
+    запросы, выполненные до ошибки, не теряются.
+
+    :param path: путь к файлу кассеты
+    :type path: str
+    :param token: :term:`Яндекс токен приложения`
+    :type token: str
+    :param orgID: :term:`ID организации в Яндекс 360`
+    :type orgID: str
+    :param mode: режим: auto, record или replay
+    :type mode: str
+    :param latency: задержка ответа при воспроизведении: None, 'recorded' или секунд
+    :type latency: float
+    :param base_url: базовый адрес API при записи
+    :type base_url: str
+    """
+
+    def __init__(self, path, token='', orgID='', mode='auto', latency=None, base_url=API_URL):
+        if mode == 'auto':
+            mode = 'replay' if os.path.exists(path) else 'record'
+        if mode == 'record':
+            self.client = RecordingClient(path, token, orgID, base_url=base_url)
+        elif mode == 'replay':
+            self.client = ReplayClient(path, token, orgID, latency=latency)
+        else:
+            raise ValueError(f'неизвестный режим кассеты: {mode}')
+        self.mode = mode
+        self._using = using(self.client)
+
+    def __enter__(self):
+        return self._using.__enter__()
+
+    def __exit__(self, *exc):
+        try:
+            self._using.__exit__(*exc)
+        finally:
+            self.client.close()
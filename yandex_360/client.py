@@ -0,0 +1,400 @@
+"""Модуль HTTP-клиента с пулом постоянных (keep-alive) соединений.
+
+Все функции модулей библиотеки выполняют запросы через :func:`safe_request` этого модуля.
+По умолчанию используется общий для процесса пул соединений, поэтому повторные запросы
+не устанавливают заново TCP/TLS соединение с API.
+
+.. code-block:: python
+
+    from yandex_360.client import Yandex360Client
+
+    with Yandex360Client(token, orgID, pool_size=20) as client:
+        usrs = client.tools.get_users()
+        user = client.users.show_user(userID)
+
+"""
+
+import importlib
+import json
+import random
+import threading
+import time
+import weakref
+
+from . import ratelimit
+
+API_URL = 'https://api360.yandex.net'
+"""Базовый адрес Yandex 360 API"""
+
+DEFAULT_POOL_SIZE = 10
+"""Размер пула соединений по умолчанию"""
+
+_MODULES = ('users', 'groups', 'departments', 'domains', 'dns', 'mail', 'logs', 'org',
+            'a2fa', 'antispam', 'auth', 'pwd', 'routing', 'tools')
+
+_write_listeners = weakref.WeakSet()
+_hooks = []
+_local = threading.local()
+_lock = threading.Lock()
+_default_session = None
+
+def make_session(pool_size=DEFAULT_POOL_SIZE):
+    """Функция создает сессию с пулом постоянных соединений
+
+    :param pool_size: максимальное количество соединений в пуле
+    :type pool_size: int
+    :return: сессия
+    :rtype: requests.Session
+    """
+
+    # requests импортируется при создании первой сессии, а не при импорте библиотеки
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+
+    return session
+
+def get_session():
+    """Функция возвращает общую для процесса сессию с пулом соединений
+
+    :return: сессия
+    :rtype: requests.Session
+    """
+
+    global _default_session
+
+    if _default_session is None:
+        with _lock:
+            if _default_session is None:
+                _default_session = make_session()
+
+    return _default_session
+
+def current():
+    """Функция возвращает клиент, активный в текущем потоке
+
+    :return: клиент или None, если запросы идут через общую сессию
+    :rtype: Yandex360Client
+    """
+
+    return getattr(_local, 'client', None)
+
+class using:
+    """Контекстный менеджер, направляющий запросы текущего потока через клиент
+
+    :param client: клиент (None — общая сессия)
+    :type client: Yandex360Client
+    """
+
+    def __init__(self, client):
+        self.client = client
+
+    def __enter__(self):
+        self.previous = current()
+        _local.client = self.client
+        return self.client
+
+    def __exit__(self, *exc):
+        _local.client = self.previous
+
+def send(session, mode, url, headers=None, body=None, try_number=1):
+    """Функция безопасного запроса через сессию
+
+    Запрос проходит через общий ограничитель частоты :data:`yandex_360.ratelimit.limiter`.
+    Ответы 429 и 503 повторяются по политике :data:`yandex_360.ratelimit.retry` с учетом Retry-After.
+    При ошибке соединения или некорректном JSON запрос повторяется с экспоненциальной задержкой.
+
+    :param session: сессия
+    :type session: requests.Session
+    :param mode: метод запроса (get, post, put, patch, delete)
+    :type mode: str
+    :param url: адрес запроса
+    :type url: str
+    :param headers: заголовки запроса
+    :type headers: dict
+    :param body: тело запроса (если предусмотрено)
+    :type body: str
+    :param try_number: номер попытки передачи запроса
+    :type try_number: int
+    :return: результат запроса
+    :rtype: dict
+    """
+
+    from requests.exceptions import ConnectionError as RequestsConnectionError
+
+    attempt = 0
+    while True:
+        ratelimit.limiter.acquire(url)
+        info = start_request(mode, url) if _hooks else None
+        try:
+            response = session.request(mode.upper(), url, data=body, headers=headers)
+            delay = ratelimit.retry.delay(attempt, response.status_code, response.headers)
+            if delay is not None:
+                if info is not None:
+                    finish_request(info, response.status_code, len(response.content))
+                ratelimit.limiter.pause(url, delay)
+                time.sleep(delay)
+                attempt += 1
+                continue
+            resp = response.json()
+            # after — только для ответа с корректным JSON, иначе обработчики получают error
+            if info is not None:
+                finish_request(info, response.status_code, len(response.content))
+        except (RequestsConnectionError, json.decoder.JSONDecodeError) as e:
+            if info is not None:
+                fail_request(info, e)
+            time.sleep(2**try_number + random.random()*0.01)
+            try_number += 1
+        else:
+            notify_write(mode, url)
+            return resp
+
+def safe_request(mode, url, headers=None, body=None, try_number=1):
+    """Функция безопасного запроса
+
+    Запрос выполняется через клиент, активный в текущем потоке, либо через общую сессию.
+
+    :param mode: метод запроса (get, post, put, patch, delete)
+    :type mode: str
+    :param url: адрес запроса
+    :type url: str
+    :param headers: заголовки запроса
+    :type headers: dict
+    :param body: тело запроса (если предусмотрено)
+    :type body: str
+    :param try_number: номер попытки передачи запроса
+    :type try_number: int
+    :return: результат запроса
+    :rtype: dict
+    """
+
+    client = current()
+    if client is not None:
+        return client.request(mode, url, headers, body, try_number)
+
+    return send(get_session(), mode, url, headers, body, try_number)
+
+def add_write_listener(listener):
+    """Функция подписывает объект на изменяющие запросы (post, put, patch, delete)
+
+    После каждого такого запроса вызывается ``listener.on_write(mode, url)``. Подписка хранится
+    по слабой ссылке и снимается автоматически при удалении объекта.
+
+    :param listener: объект с методом on_write
+    :type listener: object
+    """
+
+    _write_listeners.add(listener)
+
+def notify_write(mode, url):
+    """Функция оповещает подписчиков о выполненном изменяющем запросе
+
+    :param mode: метод запроса
+    :type mode: str
+    :param url: адрес запроса
+    :type url: str
+    """
+
+    if mode != 'get':
+        for listener in list(_write_listeners):
+            listener.on_write(mode, url)
+
+def add_hook(hook):
+    """Функция подключает обработчик событий запросов
+
+    У обработчика вызываются необязательные методы ``before(info)`` перед отправкой запроса,
+    ``after(info)`` после получения ответа и ``error(info, exc)`` при ошибке соединения или
+    некорректном JSON. Каждая попытка (включая повторы после 429/503) — отдельный запрос.
+    ``info`` — словарь: method, url, status, bytes, elapsed (секунд), start (time.perf_counter).
+
+    :param hook: обработчик
+    :type hook: object
+    """
+
+    with _lock:
+        if hook not in _hooks:
+            _hooks.append(hook)
+
+def remove_hook(hook):
+    """Функция отключает обработчик событий запросов
+
+    :param hook: обработчик
+    :type hook: object
+    """
+
+    with _lock:
+        if hook in _hooks:
+            _hooks.remove(hook)
+
+def has_hooks():
+    """Функция проверяет, подключены ли обработчики событий запросов
+
+    :return: True, если подключен хотя бы один обработчик
+    :rtype: bool
+    """
+
+    return bool(_hooks)
+
+def _call_hooks(event, *args):
+    for hook in list(_hooks):
+        method = getattr(hook, event, None)
+        if method is not None:
+            method(*args)
+
+def start_request(mode, url):
+    """Функция оповещает обработчики о начале запроса
+
+    :param mode: метод запроса
+    :type mode: str
+    :param url: адрес запроса
+    :type url: str
+    :return: сведения о запросе для finish_request и fail_request
+    :rtype: dict
+    """
+
+    info = {'method': mode.upper(), 'url': url, 'status': None, 'bytes': 0, 'elapsed': None, 'start': time.perf_counter()}
+    _call_hooks('before', info)
+    return info
+
+def finish_request(info, status, size):
+    """Функция оповещает обработчики о полученном ответе
+
+    :param info: сведения о запросе из start_request
+    :type info: dict
+    :param status: код ответа
+    :type status: int
+    :param size: размер тела ответа, байт
+    :type size: int
+    """
+
+    info['status'] = status
+    info['bytes'] = size
+    info['elapsed'] = time.perf_counter() - info['start']
+    _call_hooks('after', info)
+
+def fail_request(info, exc):
+    """Функция оповещает обработчики об ошибке запроса
+
+    :param info: сведения о запросе из start_request
+    :type info: dict
+    :param exc: исключение
+    :type exc: Exception
+    """
+
+    if info['elapsed'] is None:
+        info['elapsed'] = time.perf_counter() - info['start']
+    _call_hooks('error', info, exc)
+
+def _bound_generator(client, gen):
+    """Генератор, выполняющий каждый шаг gen с активным клиентом"""
+
+    while True:
+        with using(client):
+            try:
+                item = next(gen)
+            except StopIteration:
+                return
+        yield item
+
+class _BoundModule:
+    """Модуль библиотеки с подставленными token и orgID клиента"""
+
+    def __init__(self, client, module):
+        self._client = client
+        self._module = module
+
+    def __getattr__(self, name):
+        import inspect
+
+        func = getattr(self._module, name)
+        if not inspect.isfunction(func):
+            return func
+        params = list(inspect.signature(func).parameters)
+        client = self._client
+
+        def bound(*args, **kwargs):
+            if params[:2] == ['token', 'orgID']:
+                args = (client.token, client.orgID) + args
+            else:
+                if 'token' in params:
+                    kwargs.setdefault('token', client.token)
+                if 'orgID' in params:
+                    kwargs.setdefault('orgID', client.orgID)
+            with using(client):
+                result = func(*args, **kwargs)
+            if inspect.isgenerator(result):
+                return _bound_generator(client, result)
+            return result
+
+        bound.__name__ = name
+        bound.__doc__ = func.__doc__
+        return bound
+
+class Yandex360Client:
+    """Клиент Yandex 360 API с собственным пулом постоянных соединений
+
+    Модули библиотеки доступны как атрибуты клиента, token и orgID подставляются автоматически:
+    ``client.users.show_user(userID)`` равносильно ``users.show_user(token, orgID, userID)``,
+    выполненному через пул соединений клиента.
+
+    :param token: :term:`Яндекс токен приложения`
+    :type token: str
+    :param orgID: :term:`ID организации в Яндекс 360`
+    :type orgID: str
+    :param pool_size: максимальное количество соединений в пуле
+    :type pool_size: int
+    :param base_url: базовый адрес API (например, адрес локального тестового сервера)
+    :type base_url: str
+    """
+
+    def __init__(self, token, orgID, pool_size=DEFAULT_POOL_SIZE, base_url=API_URL):
+        self.token = token
+        self.orgID = orgID
+        self.pool_size = pool_size
+        self.base_url = base_url.rstrip('/')
+        self.session = make_session(pool_size)
+
+    def __getattr__(self, name):
+        if name not in _MODULES:
+            raise AttributeError(name)
+        module = importlib.import_module(f'{__package__}.{name}')
+        bound = _BoundModule(self, module)
+        setattr(self, name, bound)
+        return bound
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Функция закрывает все соединения пула"""
+
+        self.session.close()
+
+    def request(self, mode, url, headers=None, body=None, try_number=1):
+        """Функция выполняет запрос через пул соединений клиента
+
+        :param mode: метод запроса (get, post, put, patch, delete)
+        :type mode: str
+        :param url: адрес запроса
+        :type url: str
+        :param headers: заголовки запроса
+        :type headers: dict
+        :param body: тело запроса (если предусмотрено)
+        :type body: str
+        :param try_number: номер попытки передачи запроса
+        :type try_number: int
+        :return: результат запроса
+        :rtype: dict
+        """
+
+        if self.base_url != API_URL and url.startswith(API_URL):
+            url = self.base_url + url[len(API_URL):]
+
+        return send(self.session, mode, url, headers, body, try_number)
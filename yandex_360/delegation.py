@@ -0,0 +1,148 @@
+"""Модуль массового управления правами доступа к почтовым ящикам.
+
+Запросы mail.edit_access_mailbox и mail.delete_access_mailbox выполняются асинхронно на стороне
+Яндекс 360 и возвращают ``taskId``. Модуль отправляет все изменения параллельно, затем один
+опрашивающий цикл отслеживает все незавершенные задачи через mail.show_status_access_mailbox.
+Интервал опроса растет, пока задачи не завершаются, и сбрасывается, как только завершается хотя бы одна.
+
+.. code-block:: python
+
+    from yandex_360 import delegation
+
+    grants = [{'userID': shared, 'touserID': uid, 'rights': ['shared_mailbox_imap_admin']} for uid in team]
+    result = delegation.delegate_mailboxes(grants, token, orgID)
+    for outcome in result['results']:
+        if outcome['status'] != 'complete':
+            print(outcome['touserID'], outcome['status'], outcome['error'])
+
+"""
+
+import time
+
+from . import mail, tools
+
+DEFAULT_MAX_WORKERS = 8
+"""Количество одновременных запросов по умолчанию"""
+
+DONE_STATUSES = ('complete', 'error')
+"""Конечные статусы задачи"""
+
+MAX_POLL_ERRORS = 5
+"""Количество неудачных опросов статуса задачи подряд, после которого опрос прекращается"""
+
+def _submit(grant, token, orgID):
+    if grant.get('rights'):
+        return mail.edit_access_mailbox(token, orgID, grant['userID'], grant['touserID'], {'rights': grant['rights']})
+    return mail.delete_access_mailbox(token, orgID, grant['userID'], grant['touserID'])
+
+def delegate_mailboxes(grants, token, orgID, max_workers=DEFAULT_MAX_WORKERS, interval=1.0, max_interval=30.0, timeout=600,
+                       max_poll_errors=MAX_POLL_ERRORS):
+    """Функция параллельно изменяет права доступа к почтовым ящикам и дожидается выполнения задач
+
+    :param grants: изменения: [{'userID': str, 'touserID': str, 'rights': [str]}], где userID — владелец ящика,
+        touserID — сотрудник, получающий доступ; пустой rights удаляет все права сотрудника
+    :type grants: list
+    :param token: :term:`Яндекс токен приложения`
+    :type token: str
+    :param orgID: :term:`ID организации в Яндекс 360`
+    :type orgID: str
+    :param max_workers: количество одновременных запросов
+    :type max_workers: int
+    :param interval: начальный интервал опроса задач, секунд
+    :type interval: float
+    :param max_interval: максимальный интервал опроса задач, секунд
+    :type max_interval: float
+    :param timeout: максимальное время ожидания задач, секунд
+    :type timeout: float
+    :param max_poll_errors: количество неудачных опросов статуса задачи подряд, после которого задача
+        считается неудавшейся (status failed, в error — последний ответ опроса)
+    :type max_poll_errors: int
+    :return: :numref:`результат %s <Результат delegate_mailboxes>`
+    :rtype: dict
+
+    .. code-block:: python
+        :caption: Результат delegate_mailboxes
+        :name: Результат delegate_mailboxes
+
+        {
+            "results": [
+                {
+                    "userID": str,
+                    "touserID": str,
+                    "rights": [
+                        str
+                    ],
+                    "taskId": str,
+                    "status": str,      # complete, error, failed (запрос или опрос статуса отклонен) или timeout
+                    "error": dict
+                }
+            ],
+            "complete": int,
+            "failed": int,
+            "calls": int,
+            "polls": int,
+            "elapsed": float
+        }
+
+    """
+
+    start = time.monotonic()
+    results = []
+    outstanding = {}
+    calls = 0
+
+    submitted = tools.map_parallel(lambda grant: _submit(grant, token, orgID), grants, max_workers)
+    for grant, resp in zip(grants, submitted):
+        calls += 1
+        outcome = {'userID': grant['userID'], 'touserID': grant['touserID'], 'rights': grant.get('rights') or [],
+                   'taskId': None, 'status': None, 'error': None}
+        results.append(outcome)
+        if not tools.check_request(resp) or not resp.get('taskId'):
+            outcome['status'] = 'failed'
+            outcome['error'] = resp
+            continue
+        outcome['taskId'] = resp['taskId']
+        outstanding[resp['taskId']] = outcome
+
+    poll_errors = {}
+    polls = 0
+    delay = interval
+    while outstanding:
+        # последний опрос выполняется в момент истечения timeout
+        time.sleep(max(0.0, min(delay, timeout - (time.monotonic() - start))))
+
+        tasks = list(outstanding)
+        finished = 0
+        statuses = tools.map_parallel(lambda taskID: mail.show_status_access_mailbox(token, orgID, taskID), tasks, max_workers)
+        for taskID, resp in zip(tasks, statuses):
+            calls += 1
+            if not tools.check_request(resp):
+                outcome = outstanding[taskID]
+                outcome['error'] = resp
+                poll_errors[taskID] = poll_errors.get(taskID, 0) + 1
+                if poll_errors[taskID] >= max_poll_errors:
+                    outcome['status'] = 'failed'
+                    del outstanding[taskID]
+                continue
+            poll_errors.pop(taskID, None)
+            status = resp.get('status')
+            if status in DONE_STATUSES:
+                outcome = outstanding.pop(taskID)
+                outcome['status'] = status
+                outcome['error'] = resp if status == 'error' else None
+                finished += 1
+        polls += 1
+        delay = interval if finished else min(delay * 2, max_interval)
+        if outstanding and time.monotonic() - start >= timeout:
+            for outcome in outstanding.values():
+                outcome['status'] = 'timeout'
+            break
+
+    return {
+        'results': results,
+        'complete': sum(outcome['status'] == 'complete' for outcome in results),
+        'failed': sum(outcome['status'] != 'complete' for outcome in results),
+        'calls': calls,
+        'polls': polls,
+        'elapsed': time.monotonic() - start,
+    }
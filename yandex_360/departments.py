@@ -9,7 +9,7 @@
 
 """
 
-from jreq.jreq import safe_request
+from .client import safe_request
 import json
 
 def add_department(token, orgID, body):
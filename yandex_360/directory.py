@@ -0,0 +1,169 @@
+"""Модуль локального индекса справочника организации: сотрудники, группы и подразделения.
+
+Справочник загружается один раз, после чего поиск по nickname, email, алиасу, externalId и label
+выполняется по хеш-индексам без запросов к API.
+
+.. code-block:: python
+
+    from yandex_360.directory import DirectoryIndex
+
+    idx = DirectoryIndex(token, orgID, ttl=600)
+    for nickname in nicknames:
+        print(idx.get_id_user_by_nickname(nickname))
+
+"""
+
+import re
+import threading
+import time
+
+from . import tools
+from .client import add_write_listener
+
+DEFAULT_TTL = 300
+"""Время жизни индекса по умолчанию, секунд"""
+
+_KINDS = {
+    'users': (tools.get_users, ('id', 'nickname', 'email', 'alias', 'externalId')),
+    'groups': (tools.get_groups, ('id', 'label', 'email', 'alias', 'externalId')),
+    'departments': (tools.get_departments, ('id', 'label', 'email', 'alias', 'externalId')),
+}
+
+_WRITE_URL = re.compile(r'/directory/v1/org/([^/]+)/(users|groups|departments)\b')
+
+def _keys(record, field):
+    if field == 'alias':
+        return record.get('aliases') or []
+    value = record.get(field)
+    if value is None or value == '':
+        return []
+    return [value]
+
+class DirectoryIndex:
+    """Индекс справочника организации с ограниченным временем жизни
+
+    Каждый вид записей (users, groups, departments) загружается при первом обращении и перезагружается
+    по истечении ``ttl`` секунд. Изменяющие запросы библиотеки к сотрудникам, группам или подразделениям
+    этой организации (users.update_user, groups.add_group и т.д.) сбрасывают соответствующий индекс.
+
+    :param token: :term:`Яндекс токен приложения`
+    :type token: str
+    :param orgID: :term:`ID организации в Яндекс 360`
+    :type orgID: str
+    :param ttl: время жизни индекса, секунд (None — без ограничения)
+    :type ttl: int
+    """
+
+    def __init__(self, token, orgID, ttl=DEFAULT_TTL):
+        self.token = token
+        self.orgID = orgID
+        self.ttl = ttl
+        self._lock = threading.RLock()
+        self._indexes = {}
+        self._loaded = {}
+        add_write_listener(self)
+
+    def on_write(self, mode, url):
+        """Функция сбрасывает индекс, затронутый изменяющим запросом
+
+        :param mode: метод запроса
+        :type mode: str
+        :param url: адрес запроса
+        :type url: str
+        """
+
+        match = _WRITE_URL.search(url)
+        if match and match.group(1) == str(self.orgID):
+            self.invalidate(match.group(2))
+
+    def invalidate(self, kind=None):
+        """Функция сбрасывает индекс
+
+        :param kind: вид записей: users, groups, departments (None — все)
+        :type kind: str
+        """
+
+        with self._lock:
+            for name in ([kind] if kind else list(_KINDS)):
+                self._indexes.pop(name, None)
+                self._loaded.pop(name, None)
+
+    def _index(self, kind):
+        with self._lock:
+            loaded = self._loaded.get(kind)
+            if loaded is not None and (self.ttl is None or time.monotonic() - loaded < self.ttl):
+                return self._indexes[kind]
+
+            get, fields = _KINDS[kind]
+            resp = get(self.token, self.orgID)
+            if not tools.check_request(resp):
+                return resp
+
+            index = {field: {} for field in fields}
+            for record in resp[kind]:
+                for field in fields:
+                    for key in _keys(record, field):
+                        index[field][key] = record
+
+            self._indexes[kind] = index
+            self._loaded[kind] = time.monotonic()
+            return index
+
+    def find(self, kind, field, value):
+        """Функция ищет запись справочника по значению поля
+
+        :param kind: вид записей: users, groups, departments
+        :type kind: str
+        :param field: поле поиска: id, nickname (users), label (groups, departments), email, alias, externalId
+        :type field: str
+        :param value: значение поля
+        :type value: str
+        :return: запись, None если запись не найдена, или ответ с ошибкой загрузки
+        :rtype: dict
+        """
+
+        index = self._index(kind)
+        if not tools.check_request(index):
+            return index
+
+        return index[field].get(value)
+
+    def _get_id(self, kind, field, sstr):
+        record = self.find(kind, field, sstr)
+        if record is None or not tools.check_request(record):
+            return record
+
+        return {'id':record['id']}
+
+    def get_id_user_by_nickname(self, sstr):
+        """Функция преобразования nickname пользователя в id
+
+        :param sstr: строка поиска
+        :type sstr: str
+        :return: ID пользователя {'id': str}
+        :rtype: dict
+        """
+
+        return self._get_id('users', 'nickname', sstr)
+
+    def get_id_group_by_label(self, sstr):
+        """Функция преобразования label группы в id
+
+        :param sstr: строка поиска
+        :type sstr: str
+        :return: ID группы: {'id': int}
+        :rtype: dict
+        """
+
+        return self._get_id('groups', 'label', sstr)
+
+    def get_id_department_by_label(self, sstr):
+        """Функция преобразования label подразделения в id
+
+        :param sstr: строка поиска
+        :type sstr: str
+        :return: ID подразделения: {'id': int}
+        :rtype: dict
+        """
+
+        return self._get_id('departments', 'label', sstr)
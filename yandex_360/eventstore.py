@@ -0,0 +1,193 @@
+"""Модуль локального хранилища событий аудит-логов на SQLite.
+
+Хранилище наполняется выгрузками аудит-логов (:mod:`yandex_360.export`, :mod:`yandex_360.logsync`,
+:func:`yandex_360.tools.iter_mail_log`) и позволяет повторно искать события без запросов к API.
+Индексы построены по date, userUid, eventType, clientIp и msgId.
+
+.. code-block:: python
+
+    from yandex_360 import eventstore, logsync
+
+    with eventstore.EventStore('audit.db') as store:
+        store.add(logsync.sync_mail_log(token, orgID, 'mail.checkpoint.json'), kind='mail')
+        for event in store.query(userUid='1130000000000001', clientIp='10.0.0.1', afterDate='2024-01-01T00:00:00Z'):
+            print(event['date'], event['eventType'])
+
+"""
+
+import hashlib
+import json
+import sqlite3
+
+from .export import parse_date, format_date
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS events (
+    uniqId TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    date TEXT,
+    userUid TEXT,
+    eventType TEXT,
+    clientIp TEXT,
+    msgId TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (kind, uniqId)
+);
+CREATE INDEX IF NOT EXISTS events_date ON events (date);
+CREATE INDEX IF NOT EXISTS events_user ON events (userUid, date);
+CREATE INDEX IF NOT EXISTS events_type ON events (eventType, date);
+CREATE INDEX IF NOT EXISTS events_ip ON events (clientIp, date);
+CREATE INDEX IF NOT EXISTS events_msg ON events (msgId);
+'''
+
+_FILTERS = ('kind', 'userUid', 'eventType', 'clientIp', 'msgId')
+
+DEFAULT_BATCH_SIZE = 5000
+"""Количество событий, записываемых одной транзакцией"""
+
+def _date(value):
+    return format_date(parse_date(value)) if value else None
+
+def _uniq_id(event):
+    # событие без uniqId получает ключ по содержимому, одинаковые такие события сохраняются один раз
+    uid = event.get('uniqId')
+    if uid is not None:
+        return str(uid)
+    return 'sha1:' + hashlib.sha1(json.dumps(event, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+class EventStore:
+    """Локальное хранилище событий аудит-логов
+
+    :param path: путь к файлу базы SQLite (``:memory:`` — в памяти)
+    :type path: str
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(_SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Функция закрывает базу"""
+
+        self.conn.close()
+
+    def write_batch(self, events, kind='mail'):
+        """Функция записывает пачку событий, уже сохраненные события (по kind и uniqId) пропускаются
+
+        Для событий без uniqId ключом служит хеш SHA-1 содержимого события.
+
+        :param events: события
+        :type events: list
+        :param kind: вид лога: mail или disk
+        :type kind: str
+        :return: количество новых событий
+        :rtype: int
+        """
+
+        rows = [(_uniq_id(event), kind, _date(event.get('date')), event.get('userUid'), event.get('eventType'),
+                 event.get('clientIp'), event.get('msgId'), json.dumps(event, ensure_ascii=False)) for event in events]
+        with self.conn:
+            before = self.conn.total_changes
+            self.conn.executemany('INSERT OR IGNORE INTO events VALUES (?, ?, ?, ?, ?, ?, ?, ?)', rows)
+            return self.conn.total_changes - before
+
+    def add(self, events, kind='mail', batch_size=DEFAULT_BATCH_SIZE):
+        """Функция записывает поток событий пачками
+
+        :param events: события, например export.export_mail_log(...)['events'] или logsync.sync_mail_log(...)
+        :type events: iterable
+        :param kind: вид лога: mail или disk
+        :type kind: str
+        :param batch_size: количество событий в транзакции
+        :type batch_size: int
+        :return: количество новых событий
+        :rtype: int
+        """
+
+        count = 0
+        batch = []
+        for event in events:
+            batch.append(event)
+            if len(batch) >= batch_size:
+                count += self.write_batch(batch, kind)
+                batch = []
+        if batch:
+            count += self.write_batch(batch, kind)
+        return count
+
+    def _where(self, afterDate, beforeDate, filters):
+        unknown = set(filters) - set(_FILTERS)
+        if unknown:
+            raise TypeError(f"неизвестные условия отбора: {', '.join(sorted(unknown))}")
+        clauses = []
+        params = []
+        for name in _FILTERS:
+            value = filters.get(name)
+            if value is not None:
+                clauses.append(f'{name} = ?')
+                params.append(value)
+        if afterDate:
+            clauses.append('date >= ?')
+            params.append(_date(afterDate))
+        if beforeDate:
+            clauses.append('date < ?')
+            params.append(_date(beforeDate))
+        return (' WHERE ' + ' AND '.join(clauses)) if clauses else '', params
+
+    def query(self, afterDate=None, beforeDate=None, limit=None, **filters):
+        """Генератор событий, отобранных по условиям, в порядке дат
+
+        :param afterDate: Нижняя граница периода выборки в формате ISO 8601
+        :type afterDate: str
+        :param beforeDate: Верхняя граница периода выборки в формате ISO 8601
+        :type beforeDate: str
+        :param limit: максимальное количество событий
+        :type limit: int
+        :param filters: условия равенства: kind, userUid, eventType, clientIp, msgId
+        :return: события
+        :rtype: generator
+        :raises TypeError: при неизвестном условии отбора
+        """
+
+        where, params = self._where(afterDate, beforeDate, filters)
+        sql = f'SELECT data FROM events{where} ORDER BY date'
+        if limit:
+            sql += ' LIMIT ?'
+            params.append(limit)
+        for (data,) in self.conn.execute(sql, params):
+            yield json.loads(data)
+
+    def count(self, afterDate=None, beforeDate=None, **filters):
+        """Функция возвращает количество событий, отобранных по условиям
+
+        :param afterDate: Нижняя граница периода выборки в формате ISO 8601
+        :type afterDate: str
+        :param beforeDate: Верхняя граница периода выборки в формате ISO 8601
+        :type beforeDate: str
+        :param filters: условия равенства: kind, userUid, eventType, clientIp, msgId
+        :return: количество событий
+        :rtype: int
+        :raises TypeError: при неизвестном условии отбора
+        """
+
+        where, params = self._where(afterDate, beforeDate, filters)
+        return self.conn.execute(f'SELECT COUNT(*) FROM events{where}', params).fetchone()[0]
+
+    def last_date(self, kind=None):
+        """Функция возвращает дату последнего сохраненного события
+
+        :param kind: вид лога: mail или disk (None — любой)
+        :type kind: str
+        :return: дата в формате ISO 8601 или None
+        :rtype: str
+        """
+
+        where, params = self._where(None, None, {'kind': kind})
+        return self.conn.execute(f'SELECT MAX(date) FROM events{where}', params).fetchone()[0]
@@ -0,0 +1,278 @@
+"""Модуль параллельной выгрузки аудит-логов Почты и Диска по временным окнам.
+
+Период ``[afterDate, beforeDate)`` делится на окна, цепочки ``nextPageToken`` каждого окна загружаются
+одновременно. Если окно оказывается плотным (больше ``max_pages`` страниц), его непрочитанная часть
+делится пополам и догружается отдельными окнами. Результаты объединяются без повторов по ``uniqId``
+в порядке API — от новых событий к старым.
+
+.. code-block:: python
+
+    from yandex_360 import export
+
+    events = export.export_mail_log(token, orgID, afterDate='2024-01-01T00:00:00Z',
+                                    beforeDate='2024-01-31T00:00:00Z', shards=16)
+
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime, timedelta, timezone
+
+from . import logs
+from .client import current, using
+from .tools import Paginator, check_request
+
+DEFAULT_SHARDS = 8
+"""Количество окон по умолчанию"""
+
+DEFAULT_MAX_PAGES = 20
+"""Количество страниц, после которого окно делится"""
+
+MIN_WINDOW = timedelta(seconds=1)
+"""Минимальная длительность окна"""
+
+def parse_date(value):
+    """Функция преобразования даты ISO 8601 в datetime (UTC)
+
+    :param value: дата в формате ISO 8601
+    :type value: str
+    :return: дата
+    :rtype: datetime
+    """
+
+    if value.endswith('Z'):
+        value = value[:-1] + '+00:00'
+    date = datetime.fromisoformat(value)
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return date.astimezone(timezone.utc)
+
+def format_date(date):
+    """Функция преобразования datetime в дату ISO 8601 (UTC)
+
+    :param date: дата
+    :type date: datetime
+    :return: дата в формате ISO 8601
+    :rtype: str
+    """
+
+    return date.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+def split_window(start, end, parts):
+    """Функция делит период на равные окна
+
+    :param start: начало периода
+    :type start: datetime
+    :param end: конец периода
+    :type end: datetime
+    :param parts: количество окон
+    :type parts: int
+    :return: окна [(начало, конец)]
+    :rtype: list
+    """
+
+    parts = max(1, min(parts, int((end - start) / MIN_WINDOW) or 1))
+    step = (end - start) / parts
+    bounds = [start + step * i for i in range(parts)] + [end]
+    return list(zip(bounds, bounds[1:]))
+
+class LogExporter:
+    """Параллельная выгрузка аудит-лога по временным окнам
+
+    :param show: функция запроса страницы лога: logs.mail_log или logs.disk_log
+    :type show: function
+    :param token: :term:`Яндекс токен приложения`
+    :type token: str
+    :param orgID: :term:`ID организации в Яндекс 360`
+    :type orgID: str
+    :param afterDate: Нижняя граница периода выборки в формате ISO 8601
+    :type afterDate: str
+    :param beforeDate: Верхняя граница периода выборки в формате ISO 8601
+    :type beforeDate: str
+    :param shards: количество начальных окон
+    :type shards: int
+    :param max_workers: количество потоков
+    :type max_workers: int
+    :param max_pages: количество страниц окна, после которого непрочитанная часть окна делится
+    :type max_pages: int
+    :param kwargs: фильтры функции show: includeUids, excludeUids, types
+    """
+
+    def __init__(self, show, token, orgID, afterDate, beforeDate, shards=DEFAULT_SHARDS, max_workers=DEFAULT_SHARDS, max_pages=DEFAULT_MAX_PAGES, **kwargs):
+        self.show = show
+        self.token = token
+        self.orgID = orgID
+        self.start = parse_date(afterDate)
+        self.end = parse_date(beforeDate)
+        self.shards = shards
+        self.max_workers = max_workers
+        self.max_pages = max_pages
+        self.kwargs = kwargs
+        self.calls = 0
+        self.splits = 0
+        self._lock = threading.Lock()
+
+    def _fetch(self, start, end):
+        """Функция загружает окно, возвращает (события, непрочитанный период или None, ошибка или None)
+
+        События приходят от новых к старым. После каждых max_pages страниц проверяется, можно ли отделить
+        более старую непрочитанную часть окна (см. :meth:`_rest`); если можно, цепочка окна дочитывается
+        только до ее начала, иначе — до конца.
+        """
+
+        pgn = Paginator(self.show, self.token, self.orgID, afterDate=format_date(start), beforeDate=format_date(end), **self.kwargs)
+        events = []
+        pages = 0
+        rest = None
+        error = None
+        for resp in pgn.pages():
+            if not check_request(resp):
+                error = resp
+                break
+            if rest is not None:
+                page = [event for event in resp['events'] if not event.get('date') or parse_date(event['date']) >= rest[1]]
+                events += page
+                if len(page) < len(resp['events']):
+                    break
+                continue
+            events += resp['events']
+            pages += 1
+            if pages % self.max_pages == 0 and resp.get('nextPageToken'):
+                rest = self._rest(start, end, events)
+
+        with self._lock:
+            self.calls += pgn.calls
+
+        return events, rest, error
+
+    @staticmethod
+    def _rest(start, end, events):
+        """Функция возвращает непрочитанную часть окна [start, cut) или None, если ее не стоит делить
+
+        cut — начало секунды самого старого прочитанного события (границы окон в запросах
+        с точностью до секунды). Часть окна делится, только если она короче окна и длиннее 2 * MIN_WINDOW.
+        """
+
+        dates = [parse_date(event['date']) for event in events if event.get('date')]
+        if not dates:
+            return None
+        cut = min(dates).replace(microsecond=0)
+        if cut >= end or cut - start <= 2 * MIN_WINDOW:
+            return None
+        return (start, cut)
+
+    def windows(self):
+        """Функция загружает все окна
+
+        :return: ({(начало, конец): события}, ошибка или None)
+        :rtype: tuple
+        """
+
+        results = {}
+        client = current()
+
+        def fetch(window):
+            with using(client):
+                return self._fetch(*window)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            pending = {pool.submit(fetch, window): window for window in split_window(self.start, self.end, self.shards)}
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    window = pending.pop(future)
+                    events, rest, error = future.result()
+                    if error is not None:
+                        for other in pending:
+                            other.cancel()
+                        return results, error
+                    results[window] = events
+                    if rest is not None:
+                        with self._lock:
+                            self.splits += 1
+                        for sub in split_window(rest[0], rest[1], 2):
+                            pending[pool.submit(fetch, sub)] = sub
+
+        return results, None
+
+    def collect(self):
+        """Функция выгружает события без повторов по uniqId, от новых к старым (как API и tools.get_mail_log)
+
+        :return: :numref:`результат запроса %s <Результат запроса get_mail_log>` или ответ с ошибкой
+        :rtype: dict
+        """
+
+        results, error = self.windows()
+        if error is not None:
+            return error
+
+        events = [event for window in sorted(results) for event in results[window]]
+        events.sort(key=lambda event: parse_date(event['date']) if event.get('date') else self.start, reverse=True)
+
+        seen = set()
+        lst = []
+        for event in events:
+            uid = event.get('uniqId')
+            if uid is not None:
+                if uid in seen:
+                    continue
+                seen.add(uid)
+            lst.append(event)
+
+        return {"events":lst,"nextPageToken":""}
+
+def export_mail_log(token, orgID, afterDate, beforeDate, shards=DEFAULT_SHARDS, max_workers=DEFAULT_SHARDS, max_pages=DEFAULT_MAX_PAGES, includeUids=None, excludeUids=None, types=None):
+    """Функция параллельно выгружает события аудит-лога Почты организации за период
+
+    :param token: :term:`Яндекс токен приложения`
+    :type token: str
+    :param orgID: :term:`ID организации в Яндекс 360`
+    :type orgID: str
+    :param afterDate: Нижняя граница периода выборки в формате ISO 8601
+    :type afterDate: str
+    :param beforeDate: Верхняя граница периода выборки в формате ISO 8601
+    :type beforeDate: str
+    :param shards: количество начальных окон
+    :type shards: int
+    :param max_workers: количество потоков
+    :type max_workers: int
+    :param max_pages: количество страниц окна, после которого непрочитанная часть окна делится
+    :type max_pages: int
+    :param includeUids: Список пользователей, действия которых должны быть включены в список событий
+    :type includeUids: list
+    :param excludeUids: Список пользователей, действия которых должны быть исключены из списка событий
+    :type excludeUids: list
+    :param types: Типы событий которые должны быть включены в список. По умолчанию включаются все события
+    :type types: list
+    :return: :numref:`результат запроса %s <Результат запроса get_mail_log>`
+    :rtype: dict
+    """
+
+    return LogExporter(logs.mail_log, token, orgID, afterDate, beforeDate, shards=shards, max_workers=max_workers, max_pages=max_pages, includeUids=includeUids, excludeUids=excludeUids, types=types).collect()
+
+def export_disk_log(token, orgID, afterDate, beforeDate, shards=DEFAULT_SHARDS, max_workers=DEFAULT_SHARDS, max_pages=DEFAULT_MAX_PAGES, includeUids=None, excludeUids=None):
+    """Функция параллельно выгружает события аудит-лога Диска организации за период
+
+    :param token: :term:`Яндекс токен приложения`
+    :type token: str
+    :param orgID: :term:`ID организации в Яндекс 360`
+    :type orgID: str
+    :param afterDate: Нижняя граница периода выборки в формате ISO 8601
+    :type afterDate: str
+    :param beforeDate: Верхняя граница периода выборки в формате ISO 8601
+    :type beforeDate: str
+    :param shards: количество начальных окон
+    :type shards: int
+    :param max_workers: количество потоков
+    :type max_workers: int
+    :param max_pages: количество страниц окна, после которого непрочитанная часть окна делится
+    :type max_pages: int
+    :param includeUids: Список пользователей, действия которых должны быть включены в список событий
+    :type includeUids: list
+    :param excludeUids: Список пользователей, действия которых должны быть исключены из списка событий
+    :type excludeUids: list
+    :return: :numref:`результат запроса %s <Результат запроса get_disk_log>`
+    :rtype: dict
+    """
+
+    return LogExporter(logs.disk_log, token, orgID, afterDate, beforeDate, shards=shards, max_workers=max_workers, max_pages=max_pages, includeUids=includeUids, excludeUids=excludeUids).collect()
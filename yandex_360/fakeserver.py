@@ -0,0 +1,763 @@
+"""Модуль локального тестового сервера, имитирующего Yandex 360 API.
+
+Сервер работает в отдельном потоке текущего процесса или отдельным процессом и обслуживает
+запросы модулей users, groups, departments, domains, dns, mail и logs к синтетической организации,
+сгенерированной по зерну (seed): одинаковые параметры дают одинаковые данные. Поддерживаются
+постраничная навигация (``page``/``perPage`` и цепочки ``nextPageToken``), задержка ответа
+и случайные ответы 429 для проверки повторов и ограничителя частоты запросов.
+
+Подключение к серверу — через ``base_url`` клиента:
+
+.. code-block:: python
+
+    from yandex_360 import tools
+    from yandex_360.client import Yandex360Client, using
+    from yandex_360.fakeserver import FakeOrg, FakeServer
+
+    with FakeServer(FakeOrg(users=100000), latency=0.01, fail_rate=0.01) as server:
+        with using(Yandex360Client('token', server.org.orgID, base_url=server.url)):
+            usrs = tools.get_users('token', server.org.orgID)
+        print(server.requests, server.stats)
+
+Запуск отдельным процессом:
+
+.. code-block:: console
+
+    $ python -m yandex_360.fakeserver --users 100000 --port 8360 --latency 0.01
+
+"""
+
+import argparse
+import bisect
+import itertools
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+MAX_PER_PAGE = 1000
+"""Максимальный размер страницы списков с нумерацией страниц"""
+
+MAX_PAGE_SIZE = 100
+"""Максимальный размер страницы аудит-логов"""
+
+_BASE_UID = 1130000000000000
+
+def _date(value):
+    return value.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+def _parse(value):
+    return datetime.strptime(value.replace('.000', '')[:19], '%Y-%m-%dT%H:%M:%S').replace(tzinfo=timezone.utc)
+
+class FakeOrg:
+    """Синтетическая организация
+
+    :param users: количество сотрудников
+    :type users: int
+    :param departments: количество подразделений
+    :type departments: int
+    :param groups: количество групп
+    :type groups: int
+    :param events: количество событий в каждом аудит-логе (почта, диск)
+    :type events: int
+    :param days: период событий аудит-логов, дней до ``now``
+    :type days: int
+    :param seed: зерно генератора данных
+    :type seed: int
+    :param orgID: :term:`ID организации в Яндекс 360`
+    :type orgID: str
+    :param domain: домен организации
+    :type domain: str
+    :param now: конец периода событий (по умолчанию 2024-01-01T00:00:00Z)
+    :type now: datetime
+    """
+
+    def __init__(self, users=1000, departments=None, groups=None, events=10000, days=30, seed=0, orgID='1', domain='example.org', now=None):
+        rng = random.Random(seed)
+        self.orgID = str(orgID)
+        self.domain = domain
+        self.lock = threading.Lock()
+        created = _date(datetime(2020, 1, 1, tzinfo=timezone.utc))
+
+        if departments is None:
+            departments = max(1, users // 50)
+        self.departments = {1: self._department(1, 0, 'all', created)}
+        for dep_id in range(2, departments + 1):
+            self.departments[dep_id] = self._department(dep_id, rng.randint(1, dep_id - 1), f'dep{dep_id}', created)
+
+        self.users = {}
+        for i in range(users):
+            uid = str(_BASE_UID + i)
+            nickname = f'user{i}'
+            self.users[uid] = {
+                'about': '', 'aliases': [], 'avatarId': '', 'birthday': '1990-01-01',
+                'contacts': [{'type': 'email', 'value': f'{nickname}@{domain}', 'main': True, 'alias': False, 'synthetic': True}],
+                'createdAt': created, 'departmentId': rng.randint(1, departments), 'email': f'{nickname}@{domain}',
+                'externalId': f'ext{i}', 'gender': rng.choice(('male', 'female')), 'groups': [], 'id': uid,
+                'isAdmin': i == 0, 'isDismissed': False, 'isEnabled': True, 'isRobot': False, 'language': 'ru',
+                'name': {'first': f'First{i}', 'last': f'Last{i}', 'middle': ''}, 'nickname': nickname,
+                'position': rng.choice(('Инженер', 'Менеджер', 'Аналитик', 'Бухгалтер')), 'timezone': 'Europe/Moscow',
+                'updatedAt': created,
+            }
+
+        if groups is None:
+            groups = max(1, users // 100)
+        uids = list(self.users)
+        self.groups = {}
+        for group_id in range(1, groups + 1):
+            members = [{'type': 'user', 'id': uid} for uid in rng.sample(uids, min(len(uids), rng.randint(1, 20)))]
+            if group_id > 1 and rng.random() < 0.2:
+                members.append({'type': 'group', 'id': str(rng.randint(1, group_id - 1))})
+            if rng.random() < 0.1:
+                members.append({'type': 'department', 'id': str(rng.randint(1, departments))})
+            self.groups[group_id] = {
+                'adminIds': [], 'aliases': [], 'authorId': uids[0] if uids else '', 'createdAt': created,
+                'description': '', 'email': f'group{group_id}@{domain}', 'externalId': '', 'id': group_id,
+                'label': f'group{group_id}', 'memberOf': [], 'members': members, 'name': f'Группа {group_id}',
+                'removed': False, 'type': 'generic',
+            }
+        for group_id, group in self.groups.items():
+            for member in group['members']:
+                if member['type'] == 'group':
+                    self.groups[int(member['id'])]['memberOf'].append(group_id)
+        self._refresh_counts()
+
+        self.domains = {domain: {
+            'country': 'ru', 'delegated': True, 'master': True, 'mx': True, 'name': domain,
+            'status': {name: {'match': True, 'value': ''} for name in ('dkim', 'mx', 'ns', 'spf')}, 'verified': True,
+        }}
+        self.dns = {domain: {n: {'recordId': n, 'type': 'A', 'name': f'host{n}', 'address': f'10.0.{n // 256}.{n % 256}', 'ttl': 3600}
+                             for n in range(1, 101)}}
+        self.settings = {}
+        self.tasks = {}
+        self.delegated = {}
+
+        now = now or datetime(2024, 1, 1, tzinfo=timezone.utc)
+        span = days * 86400
+        self.mail_events = []
+        self.disk_events = []
+        for n in range(events):
+            uid = rng.choice(uids) if uids else ''
+            login = self.users[uid]['email'] if uid else ''
+            when = _date(now - timedelta(seconds=span * (n + 1) // (events + 1)))
+            self.mail_events.append({
+                'bcc': '', 'cc': '', 'clientIp': f'10.{rng.randint(0, 255)}.{rng.randint(0, 255)}.{rng.randint(1, 254)}',
+                'date': when, 'destMid': '', 'eventType': rng.choice(('message_seen', 'message_sent', 'message_deleted')),
+                'folderName': 'Inbox', 'folderType': 'inbox', 'from': login, 'labels': [], 'mid': str(n),
+                'msgId': f'<{n}@{domain}>', 'orgId': int(self.orgID) if self.orgID.isdigit() else 0, 'requestId': str(n),
+                'source': 'web', 'subject': f'Письмо {n}', 'to': login, 'uniqId': f'm{n}', 'userLogin': login,
+                'userName': login, 'userUid': uid,
+            })
+            self.disk_events.append({
+                'clientIp': '10.0.0.1', 'date': when, 'eventType': rng.choice(('fs-copy', 'fs-move', 'fs-trash-append')),
+                'lastModificationDate': when, 'orgId': int(self.orgID) if self.orgID.isdigit() else 0, 'ownerLogin': login,
+                'ownerName': login, 'ownerUid': uid, 'path': f'/disk/file{n}', 'requestId': str(n), 'resourceFileId': str(n),
+                'rights': '', 'size': str(rng.randint(1, 10 ** 6)), 'uniqId': f'd{n}', 'userLogin': login,
+                'userName': login, 'userUid': uid,
+            })
+
+        self.mail_dates = [event['date'] for event in reversed(self.mail_events)]
+        self.disk_dates = [event['date'] for event in reversed(self.disk_events)]
+        self._ids = itertools.count(groups + departments + 1)
+
+    @staticmethod
+    def _department(dep_id, parent, label, created):
+        return {'aliases': [], 'createdAt': created, 'description': '', 'email': '', 'externalId': '', 'headId': '',
+                'id': dep_id, 'label': label, 'membersCount': 0, 'name': f'Подразделение {dep_id}', 'parentId': parent}
+
+    def _refresh_counts(self):
+        for group in self.groups.values():
+            group['membersCount'] = len(group['members'])
+
+    def next_id(self):
+        """Функция возвращает новый ID для создаваемых объектов
+
+        :return: ID
+        :rtype: int
+        """
+
+        with self.lock:
+            return next(self._ids)
+
+def _error(status, message):
+    return status, {'code': status, 'message': message}
+
+def _page(items, key, query):
+    page = max(1, int(query.get('page', ['1'])[0]))
+    per = min(MAX_PER_PAGE, max(1, int(query.get('perPage', ['100'])[0])))
+    total = len(items)
+    chunk = list(itertools.islice(items, (page - 1) * per, page * per))
+    return 200, {key: chunk, 'page': page, 'pages': (total + per - 1) // per, 'perPage': per, 'total': total}
+
+def _log(events, dates, query):
+    size = min(MAX_PAGE_SIZE, max(1, int(query.get('pageSize', ['100'])[0])))
+    offset = int(query.get('pageToken', ['0'])[0] or 0)
+    include = set(query.get('includeUids', ()))
+    exclude = set(query.get('excludeUids', ()))
+    types = set(query.get('types', ()))
+
+    # события упорядочены от новых к старым, dates — их даты по возрастанию
+    total = len(events)
+    lo = bisect.bisect_left(dates, _date(_parse(query['afterDate'][0]))) if 'afterDate' in query else 0
+    hi = bisect.bisect_right(dates, _date(_parse(query['beforeDate'][0]))) if 'beforeDate' in query else total
+    selected = events[total - hi:total - lo]
+    if include or exclude or types:
+        selected = [event for event in selected
+                    if (not include or event['userUid'] in include) and event['userUid'] not in exclude
+                    and (not types or event['eventType'] in types)]
+
+    chunk = selected[offset:offset + size]
+    token = str(offset + size) if offset + size < len(selected) else ''
+    return 200, {'events': chunk, 'nextPageToken': token}
+
+def _routes():
+    table = [
+        ('GET', r'/directory/v1/org/[^/]+/users/?', 'show_users'),
+        ('POST', r'/directory/v1/org/[^/]+/users/?', 'add_user'),
+        ('GET', r'/directory/v1/org/[^/]+/users/(?P<id>\d+)', 'show_user'),
+        ('PATCH', r'/directory/v1/org/[^/]+/users/(?P<id>\d+)', 'update_user'),
+        ('DELETE', r'/directory/v1/org/[^/]+/users/(?P<id>\d+)', 'delete_user'),
+        ('POST', r'/directory/v1/org/[^/]+/users/(?P<id>\d+)/aliases', 'add_alias_user'),
+        ('DELETE', r'/directory/v1/org/[^/]+/users/(?P<id>\d+)/aliases/(?P<alias>[^/]+)', 'delete_alias_user'),
+        ('PUT', r'/directory/v1/org/[^/]+/users/(?P<id>\d+)/contacts', 'update_user_contacts'),
+        ('DELETE', r'/directory/v1/org/[^/]+/users/(?P<id>\d+)/contacts', 'delete_user_contacts'),
+        ('PUT', r'/directory/v1/org/[^/]+/users/(?P<id>\d+)/avatar', 'upload_user_avatar'),
+        ('GET', r'/directory/v1/org/[^/]+/users/(?P<id>\d+)/2fa', 'show_user_2fa'),
+        ('DELETE', r'/directory/v1/org/[^/]+/users/(?P<id>\d+)/2fa', 'delete_user_2fa'),
+        ('GET', r'/directory/v1/org/[^/]+/groups/?', 'show_groups'),
+        ('POST', r'/directory/v1/org/[^/]+/groups/?', 'add_group'),
+        ('GET', r'/directory/v1/org/[^/]+/groups/(?P<id>\d+)', 'show_group'),
+        ('PATCH', r'/directory/v1/org/[^/]+/groups/(?P<id>\d+)', 'update_group'),
+        ('DELETE', r'/directory/v1/org/[^/]+/groups/(?P<id>\d+)', 'delete_group'),
+        ('GET', r'/directory/v1/org/[^/]+/groups/(?P<id>\d+)/members/?', 'show_members_group'),
+        ('POST', r'/directory/v1/org/[^/]+/groups/(?P<id>\d+)/members/?', 'add_member_group'),
+        ('DELETE', r'/directory/v1/org/[^/]+/groups/(?P<id>\d+)/members/?', 'delete_all_members_group'),
+        ('DELETE', r'/directory/v1/org/[^/]+/groups/(?P<id>\d+)/members/(?P<type>\w+)/(?P<member>[^/]+)', 'delete_member_group'),
+        ('PUT', r'/directory/v1/org/[^/]+/groups/(?P<id>\d+)/admins', 'update_admin_group'),
+        ('DELETE', r'/directory/v1/org/[^/]+/groups/(?P<id>\d+)/admins', 'delete_admins_group'),
+        ('GET', r'/directory/v1/org/[^/]+/departments/?', 'show_departments'),
+        ('POST', r'/directory/v1/org/[^/]+/departments/?', 'add_department'),
+        ('GET', r'/directory/v1/org/[^/]+/departments/(?P<id>\d+)', 'show_department'),
+        ('PATCH', r'/directory/v1/org/[^/]+/departments/(?P<id>\d+)', 'update_department'),
+        ('DELETE', r'/directory/v1/org/[^/]+/departments/(?P<id>\d+)', 'delete_department'),
+        ('POST', r'/directory/v1/org/[^/]+/departments/(?P<id>\d+)/aliases', 'add_alias_department'),
+        ('DELETE', r'/directory/v1/org/[^/]+/departments/(?P<id>\d+)/aliases/(?P<alias>[^/]+)', 'delete_alias_department'),
+        ('GET', r'/directory/v1/org/[^/]+/domains/?', 'show_domains'),
+        ('GET', r'/directory/v1/org/[^/]+/domains/(?P<domain>[^/]+)/dns', 'show_dns'),
+        ('POST', r'/directory/v1/org/[^/]+/domains/(?P<domain>[^/]+)/dns', 'add_dns'),
+        ('POST', r'/directory/v1/org/[^/]+/domains/(?P<domain>[^/]+)/dns/(?P<id>\d+)', 'edit_dns'),
+        ('DELETE', r'/directory/v1/org/[^/]+/domains/(?P<domain>[^/]+)/dns/(?P<id>\d+)', 'delete_dns'),
+        ('GET', r'/security/v1/org/[^/]+/audit_log/mail', 'mail_log'),
+        ('GET', r'/security/v1/org/[^/]+/audit_log/disk', 'disk_log'),
+        ('GET', r'/admin/v1/org/[^/]+/mail/users/(?P<id>\d+)/settings/(?P<setting>sender_info|user_rules|address_book)', 'show_settings'),
+        ('POST', r'/admin/v1/org/[^/]+/mail/users/(?P<id>\d+)/settings/(?P<setting>sender_info|user_rules|address_book)', 'edit_settings'),
+        ('DELETE', r'/admin/v1/org/[^/]+/mail/users/(?P<id>\d+)/settings/user_rules/(?P<rule>\d+)', 'delete_user_rules'),
+        ('POST', r'/admin/v1/org/[^/]+/mail/delegated', 'edit_access_mailbox'),
+        ('DELETE', r'/admin/v1/org/[^/]+/mail/delegated', 'delete_access_mailbox'),
+        ('GET', r'/admin/v1/org/[^/]+/mail/delegated/tasks/(?P<id>[^/]+)', 'show_status_access_mailbox'),
+        ('GET', r'/admin/v1/org/[^/]+/mail/delegated/(?P<id>\d+)/actors', 'show_users_access_mailbox'),
+        ('GET', r'/admin/v1/org/[^/]+/mail/delegated/(?P<id>\d+)/resources', 'show_access_mailbox_user'),
+    ]
+    return [(method, re.compile(pattern + '$'), name) for method, pattern, name in table]
+
+class _API:
+    """Обработчики запросов к синтетической организации"""
+
+    def __init__(self, org, task_delay):
+        self.org = org
+        self.task_delay = task_delay
+
+    def _user(self, match):
+        return self.org.users.get(match['id'])
+
+    def show_users(self, match, query, body):
+        return _page(self.org.users.values(), 'users', query)
+
+    def add_user(self, match, query, body):
+        uid = str(_BASE_UID + 10 ** 9 + self.org.next_id())
+        user = {'id': uid, 'aliases': [], 'contacts': [], 'groups': [], 'isEnabled': True, 'isAdmin': False,
+                'departmentId': body.get('departmentId', 1), 'email': f"{body.get('nickname')}@{self.org.domain}", **body}
+        user.pop('password', None)
+        self.org.users[uid] = user
+        return 200, user
+
+    def show_user(self, match, query, body):
+        user = self._user(match)
+        return (200, user) if user else _error(404, 'Not Found')
+
+    def update_user(self, match, query, body):
+        user = self._user(match)
+        if not user:
+            return _error(404, 'Not Found')
+        for key in ('password', 'passwordChangeRequired'):
+            body.pop(key, None)
+        if isinstance(body.get('name'), dict):
+            body['name'] = {**user.get('name', {}), **body['name']}
+        user.update(body)
+        user['updatedAt'] = _date(datetime.now(timezone.utc))
+        return 200, user
+
+    def delete_user(self, match, query, body):
+        return (200, {'userId': match['id'], 'deleted': True}) if self.org.users.pop(match['id'], None) else _error(404, 'Not Found')
+
+    def add_alias_user(self, match, query, body):
+        user = self._user(match)
+        if not user:
+            return _error(404, 'Not Found')
+        user['aliases'].append(body.get('alias'))
+        return 200, {'alias': body.get('alias')}
+
+    def delete_alias_user(self, match, query, body):
+        user = self._user(match)
+        if not user or match['alias'] not in user['aliases']:
+            return _error(404, 'Not Found')
+        user['aliases'].remove(match['alias'])
+        return 200, {'alias': match['alias'], 'removed': True}
+
+    def update_user_contacts(self, match, query, body):
+        user = self._user(match)
+        if not user:
+            return _error(404, 'Not Found')
+        user['contacts'] = [c for c in user['contacts'] if c.get('synthetic')] + body.get('contacts', [])
+        return 200, user
+
+    def delete_user_contacts(self, match, query, body):
+        user = self._user(match)
+        if not user:
+            return _error(404, 'Not Found')
+        user['contacts'] = [c for c in user['contacts'] if c.get('synthetic')]
+        return 200, user
+
+    def upload_user_avatar(self, match, query, body):
+        user = self._user(match)
+        if not user:
+            return _error(404, 'Not Found')
+        user['avatarId'] = f"avatar{match['id']}"
+        return 200, {'url': f"https://avatars.{self.org.domain}/{user['avatarId']}"}
+
+    def show_user_2fa(self, match, query, body):
+        user = self._user(match)
+        return (200, {'userId': match['id'], 'has2fa': int(match['id']) % 3 != 0}) if user else _error(404, 'Not Found')
+
+    def delete_user_2fa(self, match, query, body):
+        return (200, {}) if self._user(match) else _error(404, 'Not Found')
+
+    def show_groups(self, match, query, body):
+        return _page(self.org.groups.values(), 'groups', query)
+
+    def add_group(self, match, query, body):
+        group_id = self.org.next_id()
+        group = {'id': group_id, 'aliases': [], 'adminIds': [], 'memberOf': [], 'members': [], 'membersCount': 0,
+                 'removed': False, 'type': 'generic', **body}
+        self.org.groups[group_id] = group
+        return 200, group
+
+    def _group(self, match):
+        return self.org.groups.get(int(match['id']))
+
+    def show_group(self, match, query, body):
+        group = self._group(match)
+        return (200, group) if group else _error(404, 'Not Found')
+
+    def update_group(self, match, query, body):
+        group = self._group(match)
+        if not group:
+            return _error(404, 'Not Found')
+        group.update(body)
+        group['membersCount'] = len(group['members'])
+        return 200, group
+
+    def delete_group(self, match, query, body):
+        return (200, {'id': int(match['id']), 'removed': True}) if self.org.groups.pop(int(match['id']), None) else _error(404, 'Not Found')
+
+    def show_members_group(self, match, query, body):
+        group = self._group(match)
+        if not group:
+            return _error(404, 'Not Found')
+        result = {'users': [], 'groups': [], 'departments': []}
+        for member in group['members']:
+            if member['type'] == 'user' and member['id'] in self.org.users:
+                user = self.org.users[member['id']]
+                result['users'].append({key: user.get(key) for key in ('avatarId', 'departmentId', 'email', 'gender', 'id', 'name', 'nickname', 'position')})
+            elif member['type'] == 'group':
+                nested = self.org.groups.get(int(member['id']), {})
+                result['groups'].append({'id': int(member['id']), 'membersCount': nested.get('membersCount', 0), 'name': nested.get('name', '')})
+            elif member['type'] == 'department':
+                dep = self.org.departments.get(int(member['id']), {})
+                result['departments'].append({'id': int(member['id']), 'membersCount': dep.get('membersCount', 0), 'name': dep.get('name', '')})
+        return 200, result
+
+    def add_member_group(self, match, query, body):
+        group = self._group(match)
+        if not group:
+            return _error(404, 'Not Found')
+        member = {'type': body.get('type'), 'id': str(body.get('id'))}
+        with self.org.lock:
+            if member not in group['members']:
+                group['members'].append(member)
+            group['membersCount'] = len(group['members'])
+        return 200, {**member, 'added': True}
+
+    def delete_member_group(self, match, query, body):
+        group = self._group(match)
+        if not group:
+            return _error(404, 'Not Found')
+        member = {'type': match['type'], 'id': match['member']}
+        with self.org.lock:
+            if member not in group['members']:
+                return _error(404, 'Not Found')
+            group['members'].remove(member)
+            group['membersCount'] = len(group['members'])
+        return 200, {**member, 'deleted': True}
+
+    def delete_all_members_group(self, match, query, body):
+        group = self._group(match)
+        if not group:
+            return _error(404, 'Not Found')
+        removed, group['members'] = group['members'], []
+        group['membersCount'] = 0
+        return 200, {'users': [m for m in removed if m['type'] == 'user'], 'groups': [m for m in removed if m['type'] == 'group'],
+                     'departments': [m for m in removed if m['type'] == 'department']}
+
+    def update_admin_group(self, match, query, body):
+        group = self._group(match)
+        if not group:
+            return _error(404, 'Not Found')
+        group['adminIds'] = [str(uid) for uid in body.get('adminIds', [])]
+        return 200, group
+
+    def delete_admins_group(self, match, query, body):
+        group = self._group(match)
+        if not group:
+            return _error(404, 'Not Found')
+        group['adminIds'] = []
+        return 200, group
+
+    def show_departments(self, match, query, body):
+        deps = list(self.org.departments.values())
+        if 'parentId' in query:
+            parent = int(query['parentId'][0])
+            deps = [dep for dep in deps if dep['parentId'] == parent]
+        return _page(deps, 'departments', query)
+
+    def add_department(self, match, query, body):
+        dep_id = self.org.next_id()
+        dep = FakeOrg._department(dep_id, body.get('parentId', 1), body.get('label', f'dep{dep_id}'), _date(datetime.now(timezone.utc)))
+        dep.update(body)
+        self.org.departments[dep_id] = dep
+        return 200, dep
+
+    def _department(self, match):
+        return self.org.departments.get(int(match['id']))
+
+    def show_department(self, match, query, body):
+        dep = self._department(match)
+        return (200, dep) if dep else _error(404, 'Not Found')
+
+    def update_department(self, match, query, body):
+        dep = self._department(match)
+        if not dep:
+            return _error(404, 'Not Found')
+        dep.update(body)
+        return 200, dep
+
+    def delete_department(self, match, query, body):
+        return (200, {'id': int(match['id']), 'removed': True}) if self.org.departments.pop(int(match['id']), None) else _error(404, 'Not Found')
+
+    def add_alias_department(self, match, query, body):
+        dep = self._department(match)
+        if not dep:
+            return _error(404, 'Not Found')
+        dep['aliases'].append(body.get('alias'))
+        return 200, dep
+
+    def delete_alias_department(self, match, query, body):
+        dep = self._department(match)
+        if not dep or match['alias'] not in dep['aliases']:
+            return _error(404, 'Not Found')
+        dep['aliases'].remove(match['alias'])
+        return 200, {'alias': match['alias'], 'removed': True}
+
+    def show_domains(self, match, query, body):
+        return _page(self.org.domains.values(), 'domains', query)
+
+    def show_dns(self, match, query, body):
+        records = self.org.dns.get(match['domain'])
+        if records is None:
+            return _error(404, 'Not Found')
+        return _page(records.values(), 'records', query)
+
+    def add_dns(self, match, query, body):
+        record = {**body, 'recordId': self.org.next_id()}
+        self.org.dns.setdefault(match['domain'], {})[record['recordId']] = record
+        return 200, record
+
+    def edit_dns(self, match, query, body):
+        record = self.org.dns.get(match['domain'], {}).get(int(match['id']))
+        if record is None:
+            return _error(404, 'Not Found')
+        record.update(body)
+        return 200, record
+
+    def delete_dns(self, match, query, body):
+        return (200, {}) if self.org.dns.get(match['domain'], {}).pop(int(match['id']), None) else _error(404, 'Not Found')
+
+    def mail_log(self, match, query, body):
+        return _log(self.org.mail_events, self.org.mail_dates, query)
+
+    def disk_log(self, match, query, body):
+        return _log(self.org.disk_events, self.org.disk_dates, query)
+
+    def _settings(self, uid):
+        return self.org.settings.setdefault(uid, {
+            'sender_info': {'defaultFrom': self.org.users[uid]['email'], 'fromName': '', 'signPosition': 'bottom', 'signs': []},
+            'user_rules': {'autoreplies': [], 'forwards': []},
+            'address_book': {'collectAddresses': True},
+        })
+
+    def show_settings(self, match, query, body):
+        if match['id'] not in self.org.users:
+            return _error(404, 'Not Found')
+        return 200, self._settings(match['id'])[match['setting']]
+
+    def edit_settings(self, match, query, body):
+        if match['id'] not in self.org.users:
+            return _error(404, 'Not Found')
+        settings = self._settings(match['id'])
+        if match['setting'] == 'user_rules':
+            rules = settings['user_rules']
+            for kind in ('autoreplies', 'forwards'):
+                for rule in body.get(kind) or []:
+                    rule_id = self.org.next_id()
+                    rules[kind].append({**rule, 'ruleId': rule_id})
+            return 200, {'ruleId': rule_id} if any(body.get(kind) for kind in ('autoreplies', 'forwards')) else {}
+        settings[match['setting']].update(body)
+        return 200, settings[match['setting']]
+
+    def delete_user_rules(self, match, query, body):
+        if match['id'] not in self.org.users:
+            return _error(404, 'Not Found')
+        rules = self._settings(match['id'])['user_rules']
+        for kind in ('autoreplies', 'forwards'):
+            rules[kind] = [rule for rule in rules[kind] if rule['ruleId'] != int(match['rule'])]
+        return 200, {}
+
+    def _task(self, query, rights):
+        resource, actor = query.get('resourceId', [''])[0], query.get('actorId', [''])[0]
+        if resource not in self.org.users or actor not in self.org.users:
+            return _error(404, 'Not Found')
+        task_id = str(self.org.next_id())
+        self.org.tasks[task_id] = time.monotonic() + self.task_delay
+        actors = self.org.delegated.setdefault(resource, {})
+        if rights:
+            actors[actor] = rights
+        else:
+            actors.pop(actor, None)
+        return 200, {'taskId': task_id}
+
+    def edit_access_mailbox(self, match, query, body):
+        return self._task(query, body.get('rights') or [])
+
+    def delete_access_mailbox(self, match, query, body):
+        return self._task(query, [])
+
+    def show_status_access_mailbox(self, match, query, body):
+        ready = self.org.tasks.get(match['id'])
+        if ready is None:
+            return _error(404, 'Not Found')
+        return 200, {'status': 'complete' if time.monotonic() >= ready else 'running'}
+
+    def show_users_access_mailbox(self, match, query, body):
+        actors = self.org.delegated.get(match['id'], {})
+        return 200, {'actors': [{'actorId': actor, 'rights': rights} for actor, rights in actors.items()]}
+
+    def show_access_mailbox_user(self, match, query, body):
+        resources = [{'resourceId': resource, 'rights': actors[match['id']]}
+                     for resource, actors in self.org.delegated.items() if match['id'] in actors]
+        return 200, {'resources': resources}
+
+class FakeServer:
+    """Локальный тестовый сервер Yandex 360 API
+
+    :param org: синтетическая организация (по умолчанию FakeOrg())
+    :type org: FakeOrg
+    :param latency: задержка каждого ответа, секунд
+    :type latency: float
+    :param jitter: случайная добавка к задержке, до jitter секунд
+    :type jitter: float
+    :param fail_rate: доля запросов, на которые отвечается 429
+    :type fail_rate: float
+    :param retry_after: значение заголовка Retry-After в ответах 429, секунд
+    :type retry_after: float
+    :param task_delay: время выполнения задач управления доступом к ящикам, секунд
+    :type task_delay: float
+    :param host: адрес прослушивания
+    :type host: str
+    :param port: порт (0 — любой свободный)
+    :type port: int
+    :param seed: зерно генератора задержек и ответов 429
+    :type seed: int
+    """
+
+    def __init__(self, org=None, latency=0.0, jitter=0.0, fail_rate=0.0, retry_after=0.1, task_delay=0.5,
+                 host='127.0.0.1', port=0, seed=0):
+        self.org = org if org is not None else FakeOrg()
+        self.latency = latency
+        self.jitter = jitter
+        self.fail_rate = fail_rate
+        self.retry_after = retry_after
+        self.api = _API(self.org, task_delay)
+        self.routes = _routes()
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = Counter()
+        self.requests = 0
+        self.throttled = 0
+        self.connections = 0
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+        self.httpd.daemon_threads = True
+        self.url = f'http://{host}:{self.httpd.server_port}'
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def start(self):
+        """Функция запускает сервер в фоновом потоке
+
+        :return: базовый адрес сервера для параметра base_url клиента
+        :rtype: str
+        """
+
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self.url
+
+    def stop(self):
+        """Функция останавливает сервер"""
+
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def reset_stats(self):
+        """Функция обнуляет счетчики запросов"""
+
+        with self.lock:
+            self.stats.clear()
+            self.requests = 0
+            self.throttled = 0
+            self.connections = 0
+
+    def dispatch(self, method, path, data):
+        """Функция обрабатывает запрос
+
+        :param method: метод HTTP
+        :type method: str
+        :param path: путь с параметрами запроса
+        :type path: str
+        :param data: тело запроса
+        :type data: bytes
+        :return: (код ответа, заголовки, тело ответа)
+        :rtype: tuple
+        """
+
+        with self.lock:
+            self.requests += 1
+            delay = self.latency + (self.rng.random() * self.jitter if self.jitter else 0)
+            throttle = self.fail_rate and self.rng.random() < self.fail_rate
+            if throttle:
+                self.throttled += 1
+        if delay:
+            time.sleep(delay)
+        if throttle:
+            return 429, {'Retry-After': str(self.retry_after)}, {'code': 429, 'message': 'Too Many Requests'}
+
+        url = urlparse(path)
+        query = parse_qs(url.query)
+        for route_method, pattern, name in self.routes:
+            if route_method != method:
+                continue
+            match = pattern.match(url.path)
+            if match:
+                with self.lock:
+                    self.stats[name] += 1
+                try:
+                    body = json.loads(data) if data else {}
+                except ValueError:
+                    body = {}
+                status, result = getattr(self.api, name)(match.groupdict(), query, body)
+                return status, {}, result
+
+        with self.lock:
+            self.stats['not_found'] += 1
+        status, result = _error(404, 'Not Found')
+        return status, {}, result
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                with server.lock:
+                    server.connections += 1
+
+            def _serve(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                data = self.rfile.read(length) if length else b''
+                status, headers, result = server.dispatch(self.command, self.path, data)
+                body = json.dumps(result, ensure_ascii=False).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _serve
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+def main():
+    parser = argparse.ArgumentParser(description='Локальный тестовый сервер Yandex 360 API')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8360)
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--departments', type=int)
+    parser.add_argument('--groups', type=int)
+    parser.add_argument('--events', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--org-id', default='1')
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--fail-rate', type=float, default=0.0)
+    args = parser.parse_args()
+
+    org = FakeOrg(users=args.users, departments=args.departments, groups=args.groups, events=args.events, seed=args.seed, orgID=args.org_id)
+    server = FakeServer(org, latency=args.latency, jitter=args.jitter, fail_rate=args.fail_rate, host=args.host, port=args.port)
+    print(f'{server.url} orgID={org.orgID} users={len(org.users)}', flush=True)
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+if __name__ == '__main__':
+    main()
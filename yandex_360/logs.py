@@ -2,7 +2,7 @@
 """
 
 from urllib.parse import urlencode
-from jreq.jreq import safe_request
+from .client import safe_request
 
 def disk_log(token, orgID, pageSize=100, pageToken=None, beforeDate=None, afterDate=None, includeUids=None, excludeUids=None):
     """Функция возвращает список событий в аудит-логе Диска организации.
@@ -0,0 +1,212 @@
+"""Модуль инкрементальной синхронизации аудит-логов с сохранением контрольной точки.
+
+Контрольная точка (JSON-файл) хранит дату последнего полученного события, uniqId недавних событий
+и, если синхронизация прервалась, окно и ``pageToken`` незавершенной цепочки. Каждый запуск загружает
+только новые события, а после сбоя продолжает цепочку с сохраненного токена.
+
+.. code-block:: python
+
+    from yandex_360 import logsync
+
+    for event in logsync.sync_mail_log(token, orgID, 'mail.checkpoint.json'):
+        siem.send(event)
+
+Контрольная точка сохраняется после обработки каждой страницы, поэтому при сбое повторно
+могут быть выданы только события последней страницы (доставка «хотя бы один раз»).
+"""
+
+import json
+import os
+from datetime import datetime, timedelta, timezone
+
+from . import logs
+from .export import parse_date, format_date
+from .tools import RequestError, check_request
+
+DEFAULT_OVERLAP = 300
+"""Перекрытие окон соседних запусков для событий, поступающих с задержкой, секунд"""
+
+def load_checkpoint(path):
+    """Функция читает контрольную точку
+
+    :param path: путь к файлу контрольной точки
+    :type path: str
+    :return: контрольная точка (пустая, если файла нет)
+    :rtype: dict
+    """
+
+    if not os.path.exists(path):
+        return {'lastDate': None, 'seen': {}, 'chain': None}
+
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+def save_checkpoint(path, checkpoint):
+    """Функция атомарно записывает контрольную точку
+
+    :param path: путь к файлу контрольной точки
+    :type path: str
+    :param checkpoint: контрольная точка
+    :type checkpoint: dict
+    """
+
+    tmp = f'{path}.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(checkpoint, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+class LogSync:
+    """Инкрементальная синхронизация аудит-лога
+
+    :param show: функция запроса страницы лога: logs.mail_log или logs.disk_log
+    :type show: function
+    :param token: :term:`Яндекс токен приложения`
+    :type token: str
+    :param orgID: :term:`ID организации в Яндекс 360`
+    :type orgID: str
+    :param path: путь к файлу контрольной точки
+    :type path: str
+    :param afterDate: начало выгрузки при первом запуске в формате ISO 8601 (None — вся история)
+    :type afterDate: str
+    :param overlap: перекрытие окон соседних запусков, секунд
+    :type overlap: int
+    :param kwargs: фильтры функции show: includeUids, excludeUids, types
+    """
+
+    def __init__(self, show, token, orgID, path, afterDate=None, overlap=DEFAULT_OVERLAP, **kwargs):
+        self.show = show
+        self.token = token
+        self.orgID = orgID
+        self.path = path
+        self.afterDate = afterDate
+        self.overlap = timedelta(seconds=overlap)
+        self.kwargs = kwargs
+        self.calls = 0
+
+    def _start_chain(self, checkpoint):
+        after = checkpoint['lastDate']
+        if after is not None:
+            after = format_date(parse_date(after) - self.overlap)
+        else:
+            after = self.afterDate
+        before = format_date(datetime.now(timezone.utc))
+        return {'afterDate': after, 'beforeDate': before, 'pageToken': None, 'maxDate': checkpoint['lastDate'], 'seen': {}}
+
+    def _prune(self, seen, last):
+        if last is None:
+            return seen
+        low = parse_date(last) - self.overlap
+        return {uid: date for uid, date in seen.items() if parse_date(date) >= low}
+
+    def _finish_chain(self, checkpoint):
+        chain = checkpoint['chain']
+        seen = dict(checkpoint['seen'])
+        seen.update(chain['seen'])
+        return {'lastDate': chain['maxDate'], 'seen': self._prune(seen, chain['maxDate']), 'chain': None}
+
+    def events(self):
+        """Генератор новых событий с момента прошлого запуска
+
+        :return: события в формате :numref:`результата запроса %s <Результат запроса get_mail_log>`
+        :rtype: generator
+        :raises RequestError: при ошибке запроса (контрольная точка сохраняет место остановки)
+        """
+
+        checkpoint = load_checkpoint(self.path)
+        if not checkpoint.get('chain'):
+            checkpoint['chain'] = self._start_chain(checkpoint)
+            save_checkpoint(self.path, checkpoint)
+
+        chain = checkpoint['chain']
+        window = {'afterDate': chain['afterDate'], 'beforeDate': chain['beforeDate']}
+        token = chain['pageToken']
+
+        while True:
+            resp = self.show(self.token, self.orgID, pageToken=token, **window, **self.kwargs)
+            self.calls += 1
+            if not check_request(resp):
+                raise RequestError(resp)
+
+            for event in resp['events']:
+                uid = event.get('uniqId')
+                if uid in checkpoint['seen'] or uid in chain['seen']:
+                    continue
+                date = event.get('date')
+                if date:
+                    if uid is not None:
+                        chain['seen'][uid] = date
+                    if chain['maxDate'] is None or parse_date(date) > parse_date(chain['maxDate']):
+                        chain['maxDate'] = date
+                yield event
+
+            token = resp.get('nextPageToken')
+            if not token:
+                break
+            chain['pageToken'] = token
+            chain['seen'] = self._prune(chain['seen'], chain['maxDate'])
+            save_checkpoint(self.path, checkpoint)
+
+        save_checkpoint(self.path, self._finish_chain(checkpoint))
+
+    def run(self, handler):
+        """Функция передает новые события обработчику
+
+        :param handler: функция, вызываемая для каждого события
+        :type handler: function
+        :return: количество новых событий
+        :rtype: int
+        """
+
+        count = 0
+        for event in self.events():
+            handler(event)
+            count += 1
+        return count
+
+def sync_mail_log(token, orgID, path, afterDate=None, overlap=DEFAULT_OVERLAP, includeUids=None, excludeUids=None, types=None):
+    """Генератор новых событий аудит-лога Почты с момента прошлого запуска
+
+    :param token: :term:`Яндекс токен приложения`
+    :type token: str
+    :param orgID: :term:`ID организации в Яндекс 360`
+    :type orgID: str
+    :param path: путь к файлу контрольной точки
+    :type path: str
+    :param afterDate: начало выгрузки при первом запуске в формате ISO 8601 (None — вся история)
+    :type afterDate: str
+    :param overlap: перекрытие окон соседних запусков, секунд
+    :type overlap: int
+    :param includeUids: Список пользователей, действия которых должны быть включены в список событий
+    :type includeUids: list
+    :param excludeUids: Список пользователей, действия которых должны быть исключены из списка событий
+    :type excludeUids: list
+    :param types: Типы событий которые должны быть включены в список. По умолчанию включаются все события
+    :type types: list
+    :return: события в формате :numref:`результата запроса %s <Результат запроса get_mail_log>`
+    :rtype: generator
+    """
+
+    return LogSync(logs.mail_log, token, orgID, path, afterDate=afterDate, overlap=overlap, includeUids=includeUids, excludeUids=excludeUids, types=types).events()
+
+def sync_disk_log(token, orgID, path, afterDate=None, overlap=DEFAULT_OVERLAP, includeUids=None, excludeUids=None):
+    """Генератор новых событий аудит-лога Диска с момента прошлого запуска
+
+    :param token: :term:`Яндекс токен приложения`
+    :type token: str
+    :param orgID: :term:`ID организации в Яндекс 360`
+    :type orgID: str
+    :param path: путь к файлу контрольной точки
+    :type path: str
+    :param afterDate: начало выгрузки при первом запуске в формате ISO 8601 (None — вся история)
+    :type afterDate: str
+    :param overlap: перекрытие окон соседних запусков, секунд
+    :type overlap: int
+    :param includeUids: Список пользователей, действия которых должны быть включены в список событий
+    :type includeUids: list
+    :param excludeUids: Список пользователей, действия которых должны быть исключены из списка событий
+    :type excludeUids: list
+    :return: события в формате :numref:`результата запроса %s <Результат запроса get_disk_log>`
+    :rtype: generator
+    """
+
+    return LogSync(logs.disk_log, token, orgID, path, afterDate=afterDate, overlap=overlap, includeUids=includeUids, excludeUids=excludeUids).events()
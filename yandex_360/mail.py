@@ -14,7 +14,7 @@
 """
 
 import json
-from jreq.jreq import safe_request
+from .client import safe_request
 
 
 def show_sender_info (token, orgID, userID):
@@ -0,0 +1,230 @@
+"""Модуль снимка почтовых настроек всех сотрудников организации.
+
+Для каждого сотрудника параллельно запрашиваются mail.show_sender_info, mail.show_user_rules
+(пересылка и автоответы) и mail.show_address_book. Снимок записывается потоково в NDJSON
+(одна строка на сотрудника, сжатие gzip или zstd по расширению файла, см. :class:`yandex_360.sinks.NDJSONSink`),
+поэтому объем памяти не зависит от размера организации. Два снимка можно сравнить, чтобы найти
+новые правила пересылки.
+
+.. code-block:: python
+
+    from yandex_360 import mailsnapshot
+
+    metrics = mailsnapshot.take_snapshot(token, orgID, 'mail-2024-06-01.ndjson.gz')
+    print(f"{metrics['users']} сотрудников, {metrics['rate']:.0f} запросов/с")
+
+    diff = mailsnapshot.diff_snapshots('mail-2024-05-01.ndjson.gz', 'mail-2024-06-01.ndjson.gz')
+    for forward in diff['newForwards']:
+        print(forward['nickname'], '->', forward['address'])
+
+"""
+
+import gzip
+import io
+import json
+import time
+
+from . import mail, tools
+from .sinks import NDJSONSink
+
+SETTINGS = {
+    'senderInfo': mail.show_sender_info,
+    'userRules': mail.show_user_rules,
+    'addressBook': mail.show_address_book,
+}
+"""Собираемые настройки и функции их запроса"""
+
+DEFAULT_MAX_WORKERS = 16
+"""Количество одновременных запросов по умолчанию"""
+
+DEFAULT_BATCH_SIZE = 100
+"""Количество сотрудников в пачке записи"""
+
+def take_snapshot(token, orgID, path, max_workers=DEFAULT_MAX_WORKERS, usrs=None, progress=None, batch_size=DEFAULT_BATCH_SIZE):
+    """Функция собирает почтовые настройки всех сотрудников и записывает снимок
+
+    :param token: :term:`Яндекс токен приложения`
+    :type token: str
+    :param orgID: :term:`ID организации в Яндекс 360`
+    :type orgID: str
+    :param path: путь к файлу снимка (.gz — gzip, .zst — zstd, иначе без сжатия)
+    :type path: str
+    :param max_workers: количество одновременных запросов
+    :type max_workers: int
+    :param usrs: сотрудники (по умолчанию загружаются tools.iter_users)
+    :type usrs: iterable
+    :param progress: функция, вызываемая после каждой записанной пачки с метриками
+    :type progress: function
+    :param batch_size: количество сотрудников в пачке записи
+    :type batch_size: int
+    :return: :numref:`метрики %s <Метрики take_snapshot>`
+    :rtype: dict
+    :raises tools.RequestError: при ошибке загрузки списка сотрудников
+
+    .. code-block:: python
+        :caption: Метрики take_snapshot
+        :name: Метрики take_snapshot
+
+        {
+            "users": int,
+            "calls": int,
+            "errors": int,
+            "elapsed": float,
+            "rate": float,          # запросов в секунду
+            "usersRate": float      # сотрудников в секунду
+        }
+
+    """
+
+    metrics = {'users': 0, 'calls': 0, 'errors': 0, 'elapsed': 0.0, 'rate': 0.0, 'usersRate': 0.0}
+    start = time.monotonic()
+
+    def collect(user):
+        record = {'userId': str(user['id']), 'nickname': user.get('nickname'), 'email': user.get('email'), 'errors': {}}
+        for name, show in SETTINGS.items():
+            resp = show(token, orgID, user['id'])
+            if tools.check_request(resp):
+                record[name] = resp
+            else:
+                record[name] = None
+                record['errors'][name] = resp
+        return record
+
+    def update():
+        metrics['elapsed'] = time.monotonic() - start
+        if metrics['elapsed']:
+            metrics['rate'] = metrics['calls'] / metrics['elapsed']
+            metrics['usersRate'] = metrics['users'] / metrics['elapsed']
+
+    usrs = tools.iter_users(token, orgID) if usrs is None else usrs
+    with NDJSONSink(path) as sink:
+        batch = []
+        for record in tools.map_parallel(collect, usrs, max_workers):
+            batch.append(record)
+            metrics['users'] += 1
+            metrics['calls'] += len(SETTINGS)
+            metrics['errors'] += len(record['errors'])
+            if len(batch) >= batch_size:
+                sink.write_batch(batch)
+                batch = []
+                update()
+                if progress is not None:
+                    progress(metrics)
+        if batch:
+            sink.write_batch(batch)
+
+    update()
+    return metrics
+
+def read_snapshot(path):
+    """Генератор записей снимка
+
+    :param path: путь к файлу снимка (.gz — gzip, .zst — zstd, иначе без сжатия)
+    :type path: str
+    :return: записи сотрудников
+    :rtype: generator
+    """
+
+    if path.endswith('.gz'):
+        f = gzip.open(path, 'rt', encoding='utf-8')
+    elif path.endswith('.zst'):
+        import zstandard
+        f = io.TextIOWrapper(zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), closefd=True), encoding='utf-8')
+    else:
+        f = open(path, encoding='utf-8')
+
+    with f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+def _forwards(record):
+    rules = record.get('userRules') or {}
+    return {(forward.get('address'), bool(forward.get('withStore'))): forward for forward in rules.get('forwards') or []}
+
+def _autoreplies(record):
+    rules = record.get('userRules') or {}
+    return {(reply.get('ruleName'), reply.get('text')): reply for reply in rules.get('autoreplies') or []}
+
+def diff_snapshots(old, new):
+    """Функция сравнивает два снимка
+
+    Старый снимок загружается в память по сотрудникам, новый читается потоково. Настройки
+    сотрудников, для которых в одном из снимков была ошибка запроса, не сравниваются.
+
+    :param old: путь к старому снимку
+    :type old: str
+    :param new: путь к новому снимку
+    :type new: str
+    :return: :numref:`результат %s <Результат diff_snapshots>`
+    :rtype: dict
+
+    .. code-block:: python
+        :caption: Результат diff_snapshots
+        :name: Результат diff_snapshots
+
+        {
+            "newForwards": [
+                {
+                    "userId": str,
+                    "nickname": str,
+                    "address": str,
+                    "ruleName": str,
+                    "withStore": bool
+                }
+            ],
+            "removedForwards": [
+                dict
+            ],
+            "newAutoreplies": [
+                {
+                    "userId": str,
+                    "nickname": str,
+                    "ruleName": str,
+                    "text": str
+                }
+            ],
+            "changed": {
+                str: [str]      # userId: изменившиеся настройки
+            },
+            "addedUsers": [
+                str
+            ],
+            "removedUsers": [
+                str
+            ]
+        }
+
+    """
+
+    before = {record['userId']: record for record in read_snapshot(old)}
+    result = {'newForwards': [], 'removedForwards': [], 'newAutoreplies': [], 'changed': {}, 'addedUsers': [], 'removedUsers': []}
+
+    for record in read_snapshot(new):
+        uid = record['userId']
+        prev = before.pop(uid, None)
+        if prev is None:
+            result['addedUsers'].append(uid)
+            prev = {}
+        who = {'userId': uid, 'nickname': record.get('nickname')}
+
+        if record.get('userRules') is not None and (not prev or prev.get('userRules') is not None):
+            was, now = _forwards(prev), _forwards(record)
+            for key in now.keys() - was.keys():
+                forward = now[key]
+                result['newForwards'].append({**who, 'address': forward.get('address'), 'ruleName': forward.get('ruleName'), 'withStore': forward.get('withStore')})
+            for key in was.keys() - now.keys():
+                forward = was[key]
+                result['removedForwards'].append({**who, 'address': forward.get('address'), 'ruleName': forward.get('ruleName'), 'withStore': forward.get('withStore')})
+            was, now = _autoreplies(prev), _autoreplies(record)
+            for key in now.keys() - was.keys():
+                result['newAutoreplies'].append({**who, 'ruleName': key[0], 'text': key[1]})
+
+        if prev:
+            changed = [name for name in SETTINGS
+                       if record.get(name) is not None and prev.get(name) is not None and record[name] != prev[name]]
+            if changed:
+                result['changed'][uid] = changed
+
+    result['removedUsers'] = list(before)
+    return result
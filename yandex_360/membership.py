@@ -0,0 +1,248 @@
+"""Модуль вычисления фактического состава групп.
+
+Участниками группы могут быть сотрудники, подразделения и другие группы, поэтому фактический
+состав группы (например, рассылки) — это транзитивное замыкание по вложенным группам.
+Граф групп строится один раз по списку групп, замыкания вычисляются по компонентам сильной
+связности (циклы вложенности допустимы и обнаруживаются) и запоминаются, после чего ответы
+не требуют запросов к API. Сотрудники подразделений (с вложенными) разворачиваются по
+:class:`yandex_360.orgtree.DepartmentTree`.
+
+.. code-block:: python
+
+    from yandex_360.membership import GroupGraph
+
+    graph = GroupGraph.from_api(token, orgID)
+    graph.effective_users(groupID)        # все сотрудники группы с учетом вложенности
+    graph.groups_of_user(userID)          # все группы, в которые сотрудник входит фактически
+    graph.cycles()                        # циклы вложенности групп
+
+"""
+
+from . import tools
+from .orgtree import DepartmentTree
+
+def _key(kind, id):
+    return (kind, str(id) if kind == 'user' else int(id))
+
+class GroupGraph:
+    """Граф вложенности групп
+
+    :param groups: группы (:numref:`результат запроса %s <Результат запроса get_groups>`, поле groups)
+    :type groups: iterable
+    :param tree: дерево подразделений с сотрудниками для разворачивания подразделений в сотрудников
+    :type tree: DepartmentTree
+    """
+
+    def __init__(self, groups, tree=None):
+        self.groups = {group['id']: group for group in groups}
+        self.tree = tree
+        self.members = {}
+        self.parents = {group_id: set() for group_id in self.groups}
+        self._containing = {}
+
+        for group_id, group in self.groups.items():
+            direct = {_key(member['type'], member['id']) for member in group.get('members') or []}
+            self.members[group_id] = direct
+            for member in direct:
+                self._containing.setdefault(member, set()).add(group_id)
+                if member[0] == 'group' and member[1] in self.parents:
+                    self.parents[member[1]].add(group_id)
+            for parent in group.get('memberOf') or []:
+                if parent in self.parents:
+                    self.parents[group_id].add(parent)
+
+        self._departments = {}
+        if tree is not None:
+            for dep_id, users in tree.users.items():
+                for user in users:
+                    self._departments[str(user['id'])] = dep_id
+
+        self._down = {}
+        self._up = {}
+        self._users = {}
+        self._cycles = []
+
+    @classmethod
+    def from_api(cls, token, orgID, with_departments=True, max_workers=tools.DEFAULT_MAX_WORKERS):
+        """Функция строит граф по данным API
+
+        :param token: :term:`Яндекс токен приложения`
+        :type token: str
+        :param orgID: :term:`ID организации в Яндекс 360`
+        :type orgID: str
+        :param with_departments: загрузить подразделения и сотрудников для разворачивания подразделений
+        :type with_departments: bool
+        :param max_workers: количество потоков для параллельной загрузки страниц
+        :type max_workers: int
+        :return: граф групп
+        :rtype: GroupGraph
+        :raises tools.RequestError: при ошибке запроса
+        """
+
+        tree = DepartmentTree.from_api(token, orgID, max_workers=max_workers) if with_departments else None
+        return cls(tools.iter_groups(token, orgID, max_workers=max_workers), tree)
+
+    def _closure(self, start, edges, memo, cycles=None):
+        """Замыкание по компонентам сильной связности (Тарьян), результаты запоминаются для всех пройденных групп"""
+
+        if start in memo:
+            return memo[start]
+
+        index = {}
+        low = {}
+        stack = []
+        on_stack = set()
+        work = [(start, iter(edges(start)))]
+        index[start] = low[start] = 0
+        stack.append(start)
+        on_stack.add(start)
+
+        while work:
+            node, children = work[-1]
+            advanced = False
+            for child in children:
+                if child in memo:
+                    continue
+                if child not in index:
+                    index[child] = low[child] = len(index)
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(edges(child))))
+                    advanced = True
+                    break
+                if child in on_stack:
+                    low[node] = min(low[node], index[child])
+            if advanced:
+                continue
+
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[node])
+            if low[node] != index[node]:
+                continue
+
+            component = []
+            while True:
+                member = stack.pop()
+                on_stack.discard(member)
+                component.append(member)
+                if member == node:
+                    break
+
+            reach = set()
+            cyclic = len(component) > 1 or node in edges(node)
+            for member in component:
+                for child in edges(member):
+                    reach.add(child)
+                    if child in memo:
+                        reach |= memo[child]
+            if cyclic and cycles is not None:
+                cycles.append(sorted(component))
+            result = frozenset(reach)
+            for member in component:
+                memo[member] = result
+
+        return memo[start]
+
+    def _children(self, group_id):
+        return [mid for kind, mid in self.members.get(group_id, ()) if kind == 'group' and mid in self.groups]
+
+    def _parents(self, group_id):
+        return self.parents.get(group_id, ())
+
+    def effective_groups(self, groupID):
+        """Функция возвращает все группы, вложенные в группу прямо или транзитивно
+
+        :param groupID: ID группы
+        :type groupID: int
+        :return: ID групп (группа входит в результат только при цикле вложенности)
+        :rtype: frozenset
+        """
+
+        return self._closure(groupID, self._children, self._down, self._cycles)
+
+    def effective_members(self, groupID):
+        """Функция возвращает всех участников группы с учетом вложенных групп
+
+        :param groupID: ID группы
+        :type groupID: int
+        :return: {('user' | 'department' | 'group', id)}
+        :rtype: set
+        """
+
+        result = set(self.members.get(groupID, ()))
+        for nested in self.effective_groups(groupID):
+            result |= self.members.get(nested, set())
+        return result
+
+    def effective_users(self, groupID):
+        """Функция возвращает ID всех сотрудников группы с учетом вложенных групп и подразделений
+
+        Без дерева подразделений учитываются только сотрудники, добавленные в группы напрямую.
+
+        :param groupID: ID группы
+        :type groupID: int
+        :return: ID сотрудников
+        :rtype: frozenset
+        """
+
+        if groupID not in self._users:
+            users = set()
+            for kind, mid in self.effective_members(groupID):
+                if kind == 'user':
+                    users.add(mid)
+                elif kind == 'department' and self.tree is not None and mid in self.tree.tin:
+                    users.update(str(user['id']) for user in self.tree.subtree_users(mid))
+            self._users[groupID] = frozenset(users)
+        return self._users[groupID]
+
+    def groups_of_group(self, groupID):
+        """Функция возвращает все группы, в которые группа входит прямо или транзитивно
+
+        :param groupID: ID группы
+        :type groupID: int
+        :return: ID групп
+        :rtype: frozenset
+        """
+
+        return self._closure(groupID, self._parents, self._up)
+
+    def groups_of_user(self, userID, departmentId=None):
+        """Функция возвращает все группы, в которые сотрудник входит фактически
+
+        Учитываются прямое членство, членство подразделения сотрудника и его родительских
+        подразделений, а также вложенность групп.
+
+        :param userID: ID сотрудника
+        :type userID: str
+        :param departmentId: ID подразделения сотрудника (по умолчанию берется из дерева подразделений)
+        :type departmentId: int
+        :return: ID групп
+        :rtype: set
+        """
+
+        userID = str(userID)
+        if departmentId is None:
+            departmentId = self._departments.get(userID)
+
+        direct = set(self._containing.get(('user', userID), ()))
+        if departmentId is not None and self.tree is not None and departmentId in self.tree.tin:
+            for dep in [departmentId] + self.tree.ancestors(departmentId):
+                direct |= self._containing.get(('department', dep), set())
+
+        result = set(direct)
+        for group_id in direct:
+            result |= self.groups_of_group(group_id)
+        return result
+
+    def cycles(self):
+        """Функция возвращает циклы вложенности групп
+
+        :return: списки ID групп, входящих в один цикл
+        :rtype: list
+        """
+
+        for group_id in self.groups:
+            self.effective_groups(group_id)
+        return list(self._cycles)
@@ -0,0 +1,367 @@
+"""Модуль метрик запросов к API.
+
+Обработчики подключаются к транспорту библиотеки (:func:`yandex_360.client.add_hook`) и получают
+события каждого запроса всех модулей:
+
+* :class:`MetricsHook` — количество запросов по кодам ответа, объем ответов, ошибки и гистограммы
+  задержек (в стиле HDR: логарифмические диапазоны с линейным делением, относительная погрешность
+  около 3%) по шаблону адреса, например ``directory/v1/org/{orgID}/users/{userID}``, и методу;
+  отчет в текстовом формате Prometheus;
+* :class:`SpanHook` — спан OpenTelemetry на каждый запрос (требуется пакет ``opentelemetry-api``)
+  или словарь с полями спана для собственного экспорта.
+
+.. code-block:: python
+
+    from yandex_360 import metrics, tools
+
+    with metrics.MetricsHook() as hook:
+        tools.get_users(token, orgID)
+
+    for row in hook.summary()[:5]:
+        print(row['endpoint'], row['count'], row['p99'])
+    open('metrics.prom', 'w').write(hook.prometheus())
+
+"""
+
+import functools
+import threading
+import time
+from urllib.parse import urlsplit
+
+from . import client
+
+_PLACEHOLDERS = {
+    'org': '{orgID}',
+    'users': '{userID}',
+    'groups': '{groupID}',
+    'departments': '{depID}',
+    'domains': '{domain}',
+    'dns': '{recordID}',
+    'aliases': '{alias}',
+    'tasks': '{taskID}',
+    'delegated': '{userID}',
+    'user_rules': '{ruleID}',
+    'members': '{memberType}',
+    '{memberType}': '{memberID}',
+}
+
+_LITERALS = set(_PLACEHOLDERS) | {'tasks'}
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+"""Границы диапазонов гистограммы задержек в отчете Prometheus, секунд"""
+
+@functools.lru_cache(maxsize=4096)
+def endpoint(url):
+    """Функция возвращает шаблон адреса запроса без параметров и идентификаторов
+
+    :param url: адрес запроса
+    :type url: str
+    :return: шаблон, например ``directory/v1/org/{orgID}/users/{userID}``
+    :rtype: str
+    """
+
+    parts = []
+    for segment in urlsplit(url).path.strip('/').split('/'):
+        previous = parts[-1] if parts else None
+        if previous in _PLACEHOLDERS and segment not in _LITERALS:
+            segment = _PLACEHOLDERS[previous]
+        parts.append(segment)
+    return '/'.join(parts)
+
+class Histogram:
+    """Гистограмма значений с логарифмическими диапазонами и линейным делением (в стиле HDR)
+
+    Значения от ``unit`` до любого максимума хранятся с относительной погрешностью ``2**-precision``.
+
+    :param precision: количество бит линейного деления диапазона
+    :type precision: int
+    :param unit: наименьшее различимое значение
+    :type unit: float
+    """
+
+    def __init__(self, precision=5, unit=1e-6):
+        self.precision = precision
+        self.sub = 1 << precision
+        self.unit = unit
+        self.counts = {}
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+
+    def _index(self, value):
+        if value < self.sub:
+            return value
+        shift = value.bit_length() - self.precision - 1
+        return (shift + 1) * self.sub + (value >> shift) - self.sub
+
+    def _bounds(self, index):
+        if index < self.sub:
+            return index, index + 1
+        shift = index // self.sub - 1
+        mantissa = index % self.sub + self.sub
+        return mantissa << shift, (mantissa + 1) << shift
+
+    def record(self, value):
+        """Функция добавляет значение
+
+        :param value: значение
+        :type value: float
+        """
+
+        index = self._index(max(0, int(value / self.unit)))
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other):
+        """Функция добавляет значения другой гистограммы с теми же параметрами
+
+        :param other: гистограмма
+        :type other: Histogram
+        """
+
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self.sum += other.sum
+        for value in (other.min, other.max):
+            if value is not None:
+                self.min = value if self.min is None else min(self.min, value)
+                self.max = value if self.max is None else max(self.max, value)
+
+    def percentile(self, q):
+        """Функция возвращает значение перцентиля
+
+        :param q: перцентиль от 0 до 100
+        :type q: float
+        :return: значение (верхняя граница диапазона, не больше максимума) или None
+        :rtype: float
+        """
+
+        if not self.count:
+            return None
+        rank = max(1, q / 100 * self.count)
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(self._bounds(index)[1] * self.unit, self.max)
+        return self.max
+
+    def cumulative(self, le):
+        """Функция возвращает количество значений, не превышающих le (с точностью до диапазона)
+
+        :param le: граница
+        :type le: float
+        :return: количество
+        :rtype: int
+        """
+
+        limit = le / self.unit
+        return sum(count for index, count in self.counts.items() if self._bounds(index)[0] <= limit)
+
+def _label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _labels(**labels):
+    return '{' + ','.join(f'{key}="{_label(value)}"' for key, value in labels.items()) + '}'
+
+class _Installable:
+    def install(self):
+        """Функция подключает обработчик к транспорту библиотеки
+
+        :return: обработчик
+        """
+
+        client.add_hook(self)
+        return self
+
+    def uninstall(self):
+        """Функция отключает обработчик"""
+
+        client.remove_hook(self)
+
+    def __enter__(self):
+        return self.install()
+
+    def __exit__(self, *exc):
+        self.uninstall()
+
+class MetricsHook(_Installable):
+    """Сбор метрик запросов по шаблону адреса и методу
+
+    :param buckets: границы диапазонов гистограммы задержек в отчете Prometheus, секунд
+    :type buckets: tuple
+    :param prefix: префикс имен метрик Prometheus
+    :type prefix: str
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, prefix='yandex360'):
+        self.buckets = buckets
+        self.prefix = prefix
+        self.lock = threading.Lock()
+        self.latency = {}
+        self.statuses = {}
+        self.bytes = {}
+        self.errors = {}
+
+    def after(self, info):
+        key = (endpoint(info['url']), info['method'])
+        with self.lock:
+            histogram = self.latency.get(key)
+            if histogram is None:
+                histogram = self.latency[key] = Histogram()
+            histogram.record(info['elapsed'])
+            status = key + (info['status'],)
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+            self.bytes[key] = self.bytes.get(key, 0) + info['bytes']
+
+    def error(self, info, exc):
+        key = (endpoint(info['url']), info['method'], type(exc).__name__)
+        with self.lock:
+            self.errors[key] = self.errors.get(key, 0) + 1
+
+    def reset(self):
+        """Функция обнуляет собранные метрики"""
+
+        with self.lock:
+            self.latency.clear()
+            self.statuses.clear()
+            self.bytes.clear()
+            self.errors.clear()
+
+    def summary(self):
+        """Функция возвращает сводку по шаблонам адресов, упорядоченную по суммарному времени запросов
+
+        :return: [{'endpoint': str, 'method': str, 'count': int, 'total': float, 'mean': float,
+            'p50': float, 'p90': float, 'p99': float, 'max': float, 'bytes': int, 'statuses': dict, 'errors': int}]
+        :rtype: list
+        """
+
+        with self.lock:
+            rows = []
+            for (path, method), histogram in self.latency.items():
+                rows.append({
+                    'endpoint': path,
+                    'method': method,
+                    'count': histogram.count,
+                    'total': histogram.sum,
+                    'mean': histogram.sum / histogram.count,
+                    'p50': histogram.percentile(50),
+                    'p90': histogram.percentile(90),
+                    'p99': histogram.percentile(99),
+                    'max': histogram.max,
+                    'bytes': self.bytes.get((path, method), 0),
+                    'statuses': {status: count for (p, m, status), count in self.statuses.items() if (p, m) == (path, method)},
+                    'errors': sum(count for (p, m, _), count in self.errors.items() if (p, m) == (path, method)),
+                })
+        return sorted(rows, key=lambda row: row['total'], reverse=True)
+
+    def prometheus(self):
+        """Функция возвращает метрики в текстовом формате Prometheus
+
+        :return: текст для отдачи по /metrics или записи в файл node_exporter textfile
+        :rtype: str
+        """
+
+        name = self.prefix
+        lines = []
+        with self.lock:
+            lines.append(f'# HELP {name}_request_duration_seconds Yandex 360 API request latency')
+            lines.append(f'# TYPE {name}_request_duration_seconds histogram')
+            for (path, method), histogram in sorted(self.latency.items()):
+                for le in self.buckets:
+                    lines.append(f'{name}_request_duration_seconds_bucket{_labels(endpoint=path, method=method, le=le)} {histogram.cumulative(le)}')
+                lines.append(f'{name}_request_duration_seconds_bucket{_labels(endpoint=path, method=method, le="+Inf")} {histogram.count}')
+                lines.append(f'{name}_request_duration_seconds_sum{_labels(endpoint=path, method=method)} {histogram.sum}')
+                lines.append(f'{name}_request_duration_seconds_count{_labels(endpoint=path, method=method)} {histogram.count}')
+
+            lines.append(f'# HELP {name}_requests_total Yandex 360 API responses by status')
+            lines.append(f'# TYPE {name}_requests_total counter')
+            for (path, method, status), count in sorted(self.statuses.items()):
+                lines.append(f'{name}_requests_total{_labels(endpoint=path, method=method, status=status)} {count}')
+
+            lines.append(f'# HELP {name}_response_bytes_total Yandex 360 API response body size')
+            lines.append(f'# TYPE {name}_response_bytes_total counter')
+            for (path, method), size in sorted(self.bytes.items()):
+                lines.append(f'{name}_response_bytes_total{_labels(endpoint=path, method=method)} {size}')
+
+            lines.append(f'# HELP {name}_request_errors_total Yandex 360 API connection and decoding errors')
+            lines.append(f'# TYPE {name}_request_errors_total counter')
+            for (path, method, error), count in sorted(self.errors.items()):
+                lines.append(f'{name}_request_errors_total{_labels(endpoint=path, method=method, error=error)} {count}')
+
+        return '\n'.join(lines) + '\n'
+
+class SpanHook(_Installable):
+    """Спаны запросов в формате OpenTelemetry
+
+    Если передан exporter, для каждого запроса вызывается ``exporter(span)`` со словарем
+    (name, kind, startTimeUnixNano, endTimeUnixNano, attributes, status). Иначе спаны создаются
+    через tracer OpenTelemetry (по умолчанию ``opentelemetry.trace.get_tracer('yandex_360')``).
+    Атрибуты соответствуют семантическим соглашениям HTTP: http.request.method, http.route,
+    url.full, http.response.status_code, http.response.body.size.
+
+    :param tracer: tracer OpenTelemetry
+    :type tracer: opentelemetry.trace.Tracer
+    :param exporter: функция, получающая спан в виде словаря
+    :type exporter: function
+    """
+
+    def __init__(self, tracer=None, exporter=None):
+        self.exporter = exporter
+        self.tracer = tracer
+        if exporter is None and tracer is None:
+            from opentelemetry import trace
+            self.tracer = trace.get_tracer('yandex_360')
+
+    def _attributes(self, info):
+        return {'http.request.method': info['method'], 'http.route': endpoint(info['url']), 'url.full': info['url']}
+
+    def before(self, info):
+        info['startTimeUnixNano'] = time.time_ns()
+        if self.exporter is None:
+            from opentelemetry.trace import SpanKind
+            info['span'] = self.tracer.start_span(f"{info['method']} {endpoint(info['url'])}", kind=SpanKind.CLIENT,
+                                                  attributes=self._attributes(info))
+
+    def _finish(self, info, exc=None):
+        error = exc is not None or (info['status'] or 0) >= 400
+        if self.exporter is not None:
+            attributes = self._attributes(info)
+            if info['status'] is not None:
+                attributes['http.response.status_code'] = info['status']
+                attributes['http.response.body.size'] = info['bytes']
+            if exc is not None:
+                attributes['error.type'] = type(exc).__name__
+            self.exporter({
+                'name': f"{info['method']} {endpoint(info['url'])}",
+                'kind': 'CLIENT',
+                'startTimeUnixNano': info['startTimeUnixNano'],
+                'endTimeUnixNano': time.time_ns(),
+                'attributes': attributes,
+                'status': {'code': 'ERROR' if error else 'UNSET'},
+            })
+            return
+
+        from opentelemetry.trace import Status, StatusCode
+        span = info.pop('span')
+        if info['status'] is not None:
+            span.set_attribute('http.response.status_code', info['status'])
+            span.set_attribute('http.response.body.size', info['bytes'])
+        if exc is not None:
+            span.set_attribute('error.type', type(exc).__name__)
+            span.record_exception(exc)
+        if error:
+            span.set_status(Status(StatusCode.ERROR))
+        span.end()
+
+    def after(self, info):
+        self._finish(info)
+
+    def error(self, info, exc):
+        if info['status'] is None:
+            self._finish(info, exc)
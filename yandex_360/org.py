@@ -1,7 +1,7 @@
 """Модуль функций для просмотра организаций пользователя
 """
 
-from jreq.jreq import safe_request
+from .client import safe_request
 import json
 
 def show_orgs(token, orgID, pageSize=100, pageToken=None):
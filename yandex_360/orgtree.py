@@ -0,0 +1,200 @@
+"""Модуль дерева подразделений организации.
+
+Плоский список подразделений (``parentId``) преобразуется в дерево с предвычисленными родителями,
+глубиной и интервалами обхода в глубину (Euler tour), что дает проверку «подразделение A входит в B»
+за O(1) и выборку поддерева одним срезом. Сотрудники привязываются к подразделениям по ``departmentId``.
+
+.. code-block:: python
+
+    from yandex_360.orgtree import DepartmentTree
+
+    tree = DepartmentTree.from_api(token, orgID)
+    tree.is_ancestor(1, 42)           # подразделение 42 входит в 1
+    tree.subtree_user_count(5)        # сотрудники подразделения 5 с вложенными
+    for user in tree.subtree_users(5):
+        print(user['nickname'])
+
+"""
+
+from itertools import accumulate
+
+from . import tools
+
+class DepartmentTree:
+    """Дерево подразделений
+
+    :param departments: подразделения (:numref:`результат запроса %s <Результат запроса get_departments>`,
+        поле departments)
+    :type departments: iterable
+    :param users: сотрудники (необязательно), привязываются по departmentId
+    :type users: iterable
+
+    Если parentId подразделений образуют цикл, он разрывается: одно из подразделений цикла
+    становится корнем и попадает в список ``cycle_roots``.
+    """
+
+    def __init__(self, departments, users=None):
+        self.departments = {dep['id']: dep for dep in departments}
+        self.parent = {}
+        self.children = {dep_id: [] for dep_id in self.departments}
+        for dep_id, dep in self.departments.items():
+            parent = dep.get('parentId')
+            if parent in self.departments and parent != dep_id:
+                self.parent[dep_id] = parent
+                self.children[parent].append(dep_id)
+            else:
+                self.parent[dep_id] = None
+        self.roots = [dep_id for dep_id, parent in self.parent.items() if parent is None]
+
+        self.depth = {}
+        self.tin = {}
+        self.tout = {}
+        self.order = []
+        for root in self.roots:
+            self._visit(root)
+
+        # подразделения, не достижимые из корней, лежат на цикле parentId или под ним:
+        # цикл разрывается, подразделение, на котором он замкнулся, становится корнем
+        self.cycle_roots = []
+        for dep_id in self.departments:
+            if dep_id in self.tin:
+                continue
+            seen = set()
+            while dep_id not in seen:
+                seen.add(dep_id)
+                dep_id = self.parent[dep_id]
+            self.children[self.parent[dep_id]].remove(dep_id)
+            self.parent[dep_id] = None
+            self.roots.append(dep_id)
+            self.cycle_roots.append(dep_id)
+            self._visit(dep_id)
+
+        self.users = {}
+        self._prefix = None
+        if users is not None:
+            self.add_users(users)
+
+    def _visit(self, root):
+        stack = [(root, 0, False)]
+        while stack:
+            dep_id, depth, done = stack.pop()
+            if done:
+                self.tout[dep_id] = len(self.order)
+                continue
+            self.depth[dep_id] = depth
+            self.tin[dep_id] = len(self.order)
+            self.order.append(dep_id)
+            stack.append((dep_id, depth, True))
+            for child in reversed(self.children[dep_id]):
+                stack.append((child, depth + 1, False))
+
+    @classmethod
+    def from_api(cls, token, orgID, with_users=True, max_workers=tools.DEFAULT_MAX_WORKERS):
+        """Функция строит дерево по данным API
+
+        :param token: :term:`Яндекс токен приложения`
+        :type token: str
+        :param orgID: :term:`ID организации в Яндекс 360`
+        :type orgID: str
+        :param with_users: загрузить и привязать сотрудников
+        :type with_users: bool
+        :param max_workers: количество потоков для параллельной загрузки страниц
+        :type max_workers: int
+        :return: дерево подразделений
+        :rtype: DepartmentTree
+        :raises tools.RequestError: при ошибке запроса
+        """
+
+        deps = tools.iter_departments(token, orgID, max_workers=max_workers)
+        usrs = tools.iter_users(token, orgID, max_workers=max_workers) if with_users else None
+        return cls(deps, usrs)
+
+    def add_users(self, users):
+        """Функция привязывает сотрудников к подразделениям по departmentId
+
+        :param users: сотрудники
+        :type users: iterable
+        """
+
+        for user in users:
+            self.users.setdefault(user.get('departmentId'), []).append(user)
+        self._prefix = None
+
+    def is_ancestor(self, ancestor, dep_id):
+        """Функция проверяет, входит ли подразделение в поддерево другого (включая совпадение)
+
+        :param ancestor: ID предполагаемого родительского подразделения
+        :type ancestor: int
+        :param dep_id: ID подразделения
+        :type dep_id: int
+        :return: True, если dep_id входит в поддерево ancestor
+        :rtype: bool
+        """
+
+        return self.tin[ancestor] <= self.tin[dep_id] < self.tout[ancestor]
+
+    def ancestors(self, dep_id):
+        """Функция возвращает цепочку родителей подразделения от ближайшего к корню
+
+        :param dep_id: ID подразделения
+        :type dep_id: int
+        :return: ID подразделений
+        :rtype: list
+        """
+
+        path = []
+        parent = self.parent[dep_id]
+        while parent is not None:
+            path.append(parent)
+            parent = self.parent[parent]
+        return path
+
+    def subtree(self, dep_id):
+        """Функция возвращает подразделение и все вложенные подразделения
+
+        :param dep_id: ID подразделения
+        :type dep_id: int
+        :return: ID подразделений в порядке обхода
+        :rtype: list
+        """
+
+        return self.order[self.tin[dep_id]:self.tout[dep_id]]
+
+    def subtree_users(self, dep_id):
+        """Генератор сотрудников подразделения и всех вложенных подразделений
+
+        :param dep_id: ID подразделения
+        :type dep_id: int
+        :return: сотрудники
+        :rtype: generator
+        """
+
+        for sub in self.subtree(dep_id):
+            yield from self.users.get(sub, ())
+
+    def subtree_user_count(self, dep_id):
+        """Функция возвращает количество сотрудников подразделения с вложенными за O(1)
+
+        :param dep_id: ID подразделения
+        :type dep_id: int
+        :return: количество сотрудников
+        :rtype: int
+        """
+
+        if self._prefix is None:
+            self._prefix = [0] + list(accumulate(len(self.users.get(sub, ())) for sub in self.order))
+        return self._prefix[self.tout[dep_id]] - self._prefix[self.tin[dep_id]]
+
+    def department_of(self, user, dep_id):
+        """Функция проверяет, работает ли сотрудник в подразделении или вложенном в него
+
+        :param user: сотрудник
+        :type user: dict
+        :param dep_id: ID подразделения
+        :type dep_id: int
+        :return: True, если сотрудник входит в поддерево подразделения
+        :rtype: bool
+        """
+
+        own = user.get('departmentId')
+        return own in self.tin and self.is_ancestor(dep_id, own)
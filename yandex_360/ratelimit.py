@@ -0,0 +1,242 @@
+"""Модуль ограничения частоты запросов и повтора запросов при перегрузке API.
+
+Все запросы библиотеки проходят через общий для процесса ограничитель :data:`limiter`: для каждого
+семейства методов API (directory, security, admin) можно задать свой бюджет запросов в секунду.
+По умолчанию бюджеты не заданы и частота запросов не ограничивается; рекомендуемые бюджеты
+:data:`RECOMMENDED_BUDGETS` включаются вызовом :func:`configure`. Ответы 429 и 503 повторяются по политике :data:`retry` с экспоненциальной задержкой и случайным
+разбросом, заголовок ``Retry-After`` имеет приоритет и приостанавливает всё семейство.
+
+.. code-block:: python
+
+    from yandex_360 import ratelimit
+
+    ratelimit.configure(**ratelimit.RECOMMENDED_BUDGETS)          # 20/10/10 запросов в секунду
+    ratelimit.configure(directory=50, security=5, max_retries=8)
+    ratelimit.configure(directory=None, security=None, admin=None)  # снять ограничение
+
+"""
+
+import random
+import re
+import threading
+import time
+
+RECOMMENDED_BUDGETS = {'directory': 20, 'security': 10, 'admin': 10}
+"""Рекомендуемые бюджеты, запросов в секунду"""
+
+_FAMILY = re.compile(r'/(directory|security|admin)/v\d+/')
+
+def family(url):
+    """Функция определяет семейство методов API по адресу запроса
+
+    :param url: адрес запроса
+    :type url: str
+    :return: directory, security, admin или None
+    :rtype: str
+    """
+
+    match = _FAMILY.search(url)
+    return match.group(1) if match else None
+
+class TokenBucket:
+    """Ограничитель «корзина токенов»
+
+    :param rate: запросов в секунду
+    :type rate: float
+    :param burst: максимальное количество запросов подряд без ожидания (по умолчанию равно rate)
+    :type burst: float
+    """
+
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        self.burst = float(burst or max(rate, 1))
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Функция забирает один токен без ожидания
+
+        :return: 0, если токен получен, иначе время ожидания следующего токена, секунд
+        :rtype: float
+        """
+
+        with self._lock:
+            now = time.monotonic()
+            if now < self.paused_until:
+                return self.paused_until - now
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0
+            return (1 - self.tokens) / self.rate
+
+    def acquire(self):
+        """Функция ожидает и забирает один токен"""
+
+        wait = self.reserve()
+        while wait:
+            time.sleep(wait)
+            wait = self.reserve()
+
+    def pause(self, delay):
+        """Функция приостанавливает выдачу токенов
+
+        :param delay: пауза, секунд
+        :type delay: float
+        """
+
+        with self._lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + delay)
+
+class RateLimiter:
+    """Ограничитель частоты запросов по семействам методов API
+
+    :param budgets: бюджеты {семейство: запросов в секунду}, None — без ограничения
+    :type budgets: dict
+    """
+
+    def __init__(self, budgets=None):
+        self.buckets = {}
+        self.configure(**(budgets or {}))
+
+    def configure(self, **budgets):
+        """Функция задает бюджеты семейств
+
+        :param budgets: directory=..., security=..., admin=... (None — без ограничения)
+        """
+
+        for name, rate in budgets.items():
+            if rate:
+                self.buckets[name] = TokenBucket(rate)
+            else:
+                self.buckets.pop(name, None)
+
+    def reserve(self, url):
+        """Функция забирает разрешение на запрос без ожидания
+
+        :param url: адрес запроса
+        :type url: str
+        :return: 0, если разрешение получено, иначе время ожидания, секунд
+        :rtype: float
+        """
+
+        bucket = self.buckets.get(family(url))
+        return bucket.reserve() if bucket else 0
+
+    def acquire(self, url):
+        """Функция ожидает разрешения на запрос
+
+        :param url: адрес запроса
+        :type url: str
+        """
+
+        bucket = self.buckets.get(family(url))
+        if bucket:
+            bucket.acquire()
+
+    def pause(self, url, delay):
+        """Функция приостанавливает запросы семейства
+
+        :param url: адрес запроса
+        :type url: str
+        :param delay: пауза, секунд
+        :type delay: float
+        """
+
+        bucket = self.buckets.get(family(url))
+        if bucket:
+            bucket.pause(delay)
+
+def retry_after(headers):
+    """Функция возвращает значение заголовка Retry-After в секундах
+
+    :param headers: заголовки ответа
+    :type headers: dict
+    :return: задержка, секунд, или None
+    :rtype: float
+    """
+
+    value = headers.get('Retry-After')
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    import email.utils
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+class RetryPolicy:
+    """Политика повтора запросов при перегрузке API
+
+    :param max_retries: максимальное количество повторов
+    :type max_retries: int
+    :param backoff: начальная задержка, секунд
+    :type backoff: float
+    :param max_backoff: максимальная задержка, секунд
+    :type max_backoff: float
+    :param statuses: коды ответа, при которых запрос повторяется
+    :type statuses: tuple
+    """
+
+    def __init__(self, max_retries=5, backoff=0.5, max_backoff=30.0, statuses=(429, 503)):
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.statuses = statuses
+
+    def delay(self, attempt, status, headers):
+        """Функция возвращает задержку перед повтором или None, если повторять не нужно
+
+        :param attempt: номер повтора, начиная с 0
+        :type attempt: int
+        :param status: код ответа
+        :type status: int
+        :param headers: заголовки ответа
+        :type headers: dict
+        :return: задержка, секунд
+        :rtype: float
+        """
+
+        if status not in self.statuses or attempt >= self.max_retries:
+            return None
+
+        delay = retry_after(headers)
+        if delay is None:
+            delay = random.uniform(0, min(self.max_backoff, self.backoff * 2**attempt))
+        else:
+            delay += random.uniform(0, self.backoff)
+
+        return delay
+
+limiter = RateLimiter()
+"""Общий для процесса ограничитель частоты запросов"""
+
+retry = RetryPolicy()
+"""Общая для процесса политика повтора запросов"""
+
+def configure(max_retries=None, backoff=None, max_backoff=None, **budgets):
+    """Функция настраивает общий ограничитель и политику повтора
+
+    :param max_retries: максимальное количество повторов
+    :type max_retries: int
+    :param backoff: начальная задержка, секунд
+    :type backoff: float
+    :param max_backoff: максимальная задержка, секунд
+    :type max_backoff: float
+    :param budgets: бюджеты семейств: directory=..., security=..., admin=... (None — без ограничения)
+    """
+
+    if max_retries is not None:
+        retry.max_retries = max_retries
+    if backoff is not None:
+        retry.backoff = backoff
+    if max_backoff is not None:
+        retry.max_backoff = max_backoff
+    limiter.configure(**budgets)
@@ -0,0 +1,316 @@
+"""Модуль приведения сотрудников и состава групп к желаемому состоянию.
+
+Желаемые записи (например, из кадровой системы) сравниваются с текущим состоянием организации,
+для каждого сотрудника вычисляется минимальное тело PATCH (users.update_user) и, при расхождении
+контактов, новый список контактов (users.update_user_contacts). Состав группы сравнивается
+с groups.show_members_group, добавляются и удаляются только расходящиеся участники.
+Выполняются только необходимые запросы.
+
+.. code-block:: python
+
+    from yandex_360 import reconcile
+
+    desired = [{'nickname': 'ivanov', 'position': 'Инженер', 'departmentId': 5}]
+    plan = reconcile.plan_users(desired, token, orgID)     # план без изменений (dry run)
+    result = reconcile.apply_users(plan, token, orgID)
+
+    members = [{'type': 'user', 'id': '1130000000000001'}, {'type': 'department', 'id': 5}]
+    summary = reconcile.reconcile_group_members(groupID, members, token, orgID)
+
+"""
+
+from . import groups, tools, users
+
+WRITE_ONLY_FIELDS = ('password', 'passwordChangeRequired')
+"""Поля, которые нельзя прочитать и поэтому не сравниваются"""
+
+def _contact(contact):
+    return (contact.get('type'), contact.get('value'), contact.get('label') or '')
+
+def diff_user(desired, current):
+    """Функция вычисляет изменения сотрудника
+
+    Сравниваются только поля, переданные в desired. Поле name сравнивается по переданным подполям.
+    Контакты сравниваются без учета порядка и без автоматически созданных (synthetic).
+
+    :param desired: желаемые значения полей (:numref:`тело запроса %s <Тело запроса update_user>`)
+    :type desired: dict
+    :param current: текущая запись сотрудника (:numref:`результат запроса %s <Результат запроса show_user>`)
+    :type current: dict
+    :return: (тело PATCH, список контактов или None)
+    :rtype: tuple
+    """
+
+    patch = {}
+    for field, value in desired.items():
+        if field in WRITE_ONLY_FIELDS or field == 'contacts':
+            continue
+        old = current.get(field)
+        if field == 'name' and isinstance(value, dict):
+            old = old or {}
+            if any(old.get(key) != sub for key, sub in value.items()):
+                patch['name'] = {**old, **value}
+        elif old != value:
+            patch[field] = value
+
+    contacts = None
+    if 'contacts' in desired:
+        have = sorted(_contact(c) for c in current.get('contacts') or [] if not c.get('synthetic'))
+        want = sorted(_contact(c) for c in desired['contacts'])
+        if have != want:
+            contacts = desired['contacts']
+
+    return patch, contacts
+
+def plan_users(desired, token, orgID, key='nickname', current=None):
+    """Функция строит план изменений сотрудников без выполнения запросов на изменение
+
+    :param desired: желаемые записи сотрудников, каждая содержит поле key
+    :type desired: list
+    :param token: :term:`Яндекс токен приложения`
+    :type token: str
+    :param orgID: :term:`ID организации в Яндекс 360`
+    :type orgID: str
+    :param key: поле сопоставления: nickname, externalId, email или id
+    :type key: str
+    :param current: текущие записи сотрудников (по умолчанию загружаются tools.iter_users)
+    :type current: iterable
+    :return: :numref:`план %s <План reconcile_users>` или ответ с ошибкой
+    :rtype: dict
+
+    .. code-block:: python
+        :caption: План reconcile_users
+        :name: План reconcile_users
+
+        {
+            "updates": [
+                {
+                    "key": str,
+                    "userID": str,
+                    "patch": dict,
+                    "contacts": list
+                }
+            ],
+            "missing": [
+                str
+            ],
+            "unchanged": int
+        }
+
+    """
+
+    if current is None:
+        try:
+            current = list(tools.iter_users(token, orgID))
+        except tools.RequestError as e:
+            return e.req
+
+    index = {user.get(key): user for user in current}
+    plan = {'updates': [], 'missing': [], 'unchanged': 0}
+    for record in desired:
+        value = record[key]
+        user = index.get(value)
+        if user is None:
+            plan['missing'].append(value)
+            continue
+        patch, contacts = diff_user({field: v for field, v in record.items() if field != key}, user)
+        if patch or contacts is not None:
+            plan['updates'].append({'key': value, 'userID': user['id'], 'patch': patch, 'contacts': contacts})
+        else:
+            plan['unchanged'] += 1
+
+    return plan
+
+def apply_users(plan, token, orgID, max_workers=tools.DEFAULT_MAX_WORKERS):
+    """Функция выполняет план изменений сотрудников
+
+    :param plan: план, построенный plan_users
+    :type plan: dict
+    :param token: :term:`Яндекс токен приложения`
+    :type token: str
+    :param orgID: :term:`ID организации в Яндекс 360`
+    :type orgID: str
+    :param max_workers: количество потоков
+    :type max_workers: int
+    :return: {'ok': int, 'failed': [{'key': str, 'userID': str, 'error': dict}], 'calls': int}
+    :rtype: dict
+    """
+
+    def run(update):
+        calls = []
+        if update['patch']:
+            calls.append((users.update_user, update['patch']))
+        if update['contacts'] is not None:
+            calls.append((users.update_user_contacts, {'contacts': update['contacts']}))
+        for n, (func, body) in enumerate(calls, 1):
+            resp = func(token, orgID, update['userID'], body)
+            if not tools.check_request(resp):
+                return n, resp
+        return len(calls), None
+
+    result = {'ok': 0, 'failed': [], 'calls': 0}
+    for update, (calls, error) in zip(plan['updates'], tools.map_parallel(run, plan['updates'], max_workers)):
+        result['calls'] += calls
+        if error is None:
+            result['ok'] += 1
+        else:
+            result['failed'].append({'key': update['key'], 'userID': update['userID'], 'error': error})
+
+    return result
+
+def reconcile_users(desired, token, orgID, key='nickname', current=None, dry_run=False, max_workers=tools.DEFAULT_MAX_WORKERS):
+    """Функция приводит сотрудников к желаемому состоянию минимальным количеством запросов
+
+    :param desired: желаемые записи сотрудников, каждая содержит поле key
+    :type desired: list
+    :param token: :term:`Яндекс токен приложения`
+    :type token: str
+    :param orgID: :term:`ID организации в Яндекс 360`
+    :type orgID: str
+    :param key: поле сопоставления: nickname, externalId, email или id
+    :type key: str
+    :param current: текущие записи сотрудников (по умолчанию загружаются tools.iter_users)
+    :type current: iterable
+    :param dry_run: только построить план
+    :type dry_run: bool
+    :param max_workers: количество потоков
+    :type max_workers: int
+    :return: {'plan': dict, 'result': dict или None} или ответ с ошибкой
+    :rtype: dict
+    """
+
+    plan = plan_users(desired, token, orgID, key=key, current=current)
+    if not tools.check_request(plan):
+        return plan
+
+    if dry_run:
+        return {'plan': plan, 'result': None}
+
+    return {'plan': plan, 'result': apply_users(plan, token, orgID, max_workers=max_workers)}
+
+_MEMBER_KEYS = {'users': 'user', 'groups': 'group', 'departments': 'department'}
+
+def _member(member):
+    if isinstance(member, dict):
+        return (member['type'], str(member['id']))
+    return (member[0], str(member[1]))
+
+def plan_group_members(groupID, desired, token, orgID, current=None):
+    """Функция строит план изменения состава группы без выполнения запросов на изменение
+
+    :param groupID: ID группы
+    :type groupID: int
+    :param desired: желаемые участники: [{'type': 'user' | 'group' | 'department', 'id': str}] или [(type, id)]
+    :type desired: iterable
+    :param token: :term:`Яндекс токен приложения`
+    :type token: str
+    :param orgID: :term:`ID организации в Яндекс 360`
+    :type orgID: str
+    :param current: текущий состав (:numref:`результат запроса %s <Результат запроса show_members_group>`),
+        по умолчанию загружается groups.show_members_group
+    :type current: dict
+    :return: :numref:`план %s <План reconcile_group_members>` или ответ с ошибкой
+    :rtype: dict
+
+    .. code-block:: python
+        :caption: План reconcile_group_members
+        :name: План reconcile_group_members
+
+        {
+            "groupID": int,
+            "add": [
+                {
+                    "id": str,
+                    "type": str
+                }
+            ],
+            "remove": [
+                {
+                    "id": str,
+                    "type": str
+                }
+            ],
+            "unchanged": int
+        }
+
+    """
+
+    if current is None:
+        current = groups.show_members_group(token, orgID, groupID)
+        if not tools.check_request(current):
+            return current
+
+    have = {(kind, str(member['id'])) for key, kind in _MEMBER_KEYS.items() for member in current.get(key) or []}
+    want = {_member(member) for member in desired}
+
+    return {
+        'groupID': groupID,
+        'add': [{'type': kind, 'id': mid} for kind, mid in sorted(want - have)],
+        'remove': [{'type': kind, 'id': mid} for kind, mid in sorted(have - want)],
+        'unchanged': len(have & want),
+    }
+
+def apply_group_members(plan, token, orgID, max_workers=tools.DEFAULT_MAX_WORKERS):
+    """Функция выполняет план изменения состава группы
+
+    Сначала добавляются новые участники, затем удаляются лишние, поэтому состав группы
+    не проходит через пустое состояние.
+
+    :param plan: план, построенный plan_group_members
+    :type plan: dict
+    :param token: :term:`Яндекс токен приложения`
+    :type token: str
+    :param orgID: :term:`ID организации в Яндекс 360`
+    :type orgID: str
+    :param max_workers: количество одновременных запросов
+    :type max_workers: int
+    :return: {'added': int, 'removed': int, 'unchanged': int, 'failed': [{'action': str, 'member': dict, 'error': dict}], 'calls': int}
+    :rtype: dict
+    """
+
+    groupID = plan['groupID']
+    result = {'added': 0, 'removed': 0, 'unchanged': plan['unchanged'], 'failed': [], 'calls': 0}
+
+    def add(member):
+        return groups.add_member_group(token, orgID, groupID, member)
+
+    def remove(member):
+        return groups.delete_member_group(token, orgID, groupID, member['type'], member['id'])
+
+    for action, func, counter in (('add', add, 'added'), ('remove', remove, 'removed')):
+        for member, resp in zip(plan[action], tools.map_parallel(func, plan[action], max_workers)):
+            result['calls'] += 1
+            if tools.check_request(resp):
+                result[counter] += 1
+            else:
+                result['failed'].append({'action': action, 'member': member, 'error': resp})
+
+    return result
+
+def reconcile_group_members(groupID, desired, token, orgID, dry_run=False, max_workers=tools.DEFAULT_MAX_WORKERS):
+    """Функция приводит состав группы к желаемому минимальным количеством запросов
+
+    :param groupID: ID группы
+    :type groupID: int
+    :param desired: желаемые участники: [{'type': 'user' | 'group' | 'department', 'id': str}] или [(type, id)]
+    :type desired: iterable
+    :param token: :term:`Яндекс токен приложения`
+    :type token: str
+    :param orgID: :term:`ID организации в Яндекс 360`
+    :type orgID: str
+    :param dry_run: только построить план
+    :type dry_run: bool
+    :param max_workers: количество одновременных запросов
+    :type max_workers: int
+    :return: {'plan': dict, 'result': dict или None} или ответ с ошибкой
+    :rtype: dict
+    """
+
+    plan = plan_group_members(groupID, desired, token, orgID)
+    if not tools.check_request(plan):
+        return plan
+
+    if dry_run:
+        return {'plan': plan, 'result': None}
+
+    return {'plan': plan, 'result': apply_group_members(plan, token, orgID, max_workers=max_workers)}
@@ -0,0 +1,212 @@
+"""Модуль локальной реплики справочника организации: сотрудники, группы и подразделения.
+
+Реплика хранится в файле SQLite и обслуживает чтение без запросов к API. При обновлении списки
+загружаются постранично, но перезаписываются только изменившиеся записи: сотрудники сравниваются
+по ``updatedAt``, группы и подразделения (у которых нет ``updatedAt``) — по хешу содержимого.
+Записи, отсутствующие в API, удаляются.
+
+.. code-block:: python
+
+    from yandex_360.replica import DirectoryReplica
+
+    with DirectoryReplica('directory.db', token, orgID) as replica:
+        replica.refresh_if_stale(max_age=3600)
+        usrs = replica.get_users()
+
+"""
+
+import hashlib
+import json
+import sqlite3
+import time
+
+from . import tools
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS records (
+    kind TEXT NOT NULL,
+    id TEXT NOT NULL,
+    version TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (kind, id)
+);
+CREATE TABLE IF NOT EXISTS meta (
+    kind TEXT PRIMARY KEY,
+    refreshedAt REAL NOT NULL
+);
+'''
+
+_ITERS = {
+    'users': tools.iter_users,
+    'groups': tools.iter_groups,
+    'departments': tools.iter_departments,
+}
+
+KINDS = tuple(_ITERS)
+"""Виды записей реплики"""
+
+def _version(kind, record):
+    if kind == 'users' and record.get('updatedAt'):
+        return record['updatedAt']
+    return hashlib.sha1(json.dumps(record, sort_keys=True, ensure_ascii=False).encode()).hexdigest()
+
+class DirectoryReplica:
+    """Локальная реплика справочника организации
+
+    :param path: путь к файлу базы SQLite
+    :type path: str
+    :param token: :term:`Яндекс токен приложения`
+    :type token: str
+    :param orgID: :term:`ID организации в Яндекс 360`
+    :type orgID: str
+    """
+
+    def __init__(self, path, token, orgID):
+        self.path = path
+        self.token = token
+        self.orgID = orgID
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(_SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Функция закрывает базу"""
+
+        self.conn.close()
+
+    def refresh(self, kinds=KINDS, max_workers=tools.DEFAULT_MAX_WORKERS):
+        """Функция обновляет реплику из API, перезаписывая только изменившиеся записи
+
+        :param kinds: виды записей: users, groups, departments
+        :type kinds: tuple
+        :param max_workers: количество потоков для параллельной загрузки страниц
+        :type max_workers: int
+        :return: статистика {вид: {'added': int, 'updated': int, 'deleted': int, 'unchanged': int}}
+        :rtype: dict
+        :raises tools.RequestError: при ошибке запроса (реплика не изменяется)
+        """
+
+        stats = {}
+        for kind in kinds:
+            known = dict(self.conn.execute('SELECT id, version FROM records WHERE kind = ?', (kind,)))
+            seen = set()
+            upserts = []
+            counts = {'added': 0, 'updated': 0, 'deleted': 0, 'unchanged': 0}
+
+            for record in _ITERS[kind](self.token, self.orgID, max_workers=max_workers):
+                rid = str(record['id'])
+                seen.add(rid)
+                version = _version(kind, record)
+                old = known.get(rid)
+                if old == version:
+                    counts['unchanged'] += 1
+                    continue
+                counts['added' if old is None else 'updated'] += 1
+                upserts.append((kind, rid, version, json.dumps(record, ensure_ascii=False)))
+
+            deleted = [(kind, rid) for rid in known if rid not in seen]
+            counts['deleted'] = len(deleted)
+
+            with self.conn:
+                self.conn.executemany('INSERT OR REPLACE INTO records VALUES (?, ?, ?, ?)', upserts)
+                self.conn.executemany('DELETE FROM records WHERE kind = ? AND id = ?', deleted)
+                self.conn.execute('INSERT OR REPLACE INTO meta VALUES (?, ?)', (kind, time.time()))
+
+            stats[kind] = counts
+
+        return stats
+
+    def age(self, kind):
+        """Функция возвращает время с последнего обновления вида записей
+
+        :param kind: вид записей: users, groups, departments
+        :type kind: str
+        :return: секунд или None, если реплика еще не обновлялась
+        :rtype: float
+        """
+
+        row = self.conn.execute('SELECT refreshedAt FROM meta WHERE kind = ?', (kind,)).fetchone()
+        return time.time() - row[0] if row else None
+
+    def refresh_if_stale(self, max_age, kinds=KINDS, max_workers=tools.DEFAULT_MAX_WORKERS):
+        """Функция обновляет только те виды записей, которые старше max_age секунд
+
+        :param max_age: допустимый возраст реплики, секунд
+        :type max_age: float
+        :param kinds: виды записей: users, groups, departments
+        :type kinds: tuple
+        :param max_workers: количество потоков для параллельной загрузки страниц
+        :type max_workers: int
+        :return: статистика обновленных видов записей
+        :rtype: dict
+        """
+
+        stale = []
+        for kind in kinds:
+            age = self.age(kind)
+            if age is None or age > max_age:
+                stale.append(kind)
+
+        return self.refresh(stale, max_workers=max_workers)
+
+    def records(self, kind):
+        """Генератор записей реплики
+
+        :param kind: вид записей: users, groups, departments
+        :type kind: str
+        :return: записи
+        :rtype: generator
+        """
+
+        for (data,) in self.conn.execute('SELECT data FROM records WHERE kind = ? ORDER BY rowid', (kind,)):
+            yield json.loads(data)
+
+    def get(self, kind, id):
+        """Функция возвращает запись реплики по id
+
+        :param kind: вид записей: users, groups, departments
+        :type kind: str
+        :param id: ID записи
+        :type id: str
+        :return: запись или None
+        :rtype: dict
+        """
+
+        row = self.conn.execute('SELECT data FROM records WHERE kind = ? AND id = ?', (kind, str(id))).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _get_all(self, kind):
+        lst = list(self.records(kind))
+        return {kind:lst,"page":1,"pages":1,"perPage":len(lst),"total":len(lst)}
+
+    def get_users(self):
+        """Функция возвращает список сотрудников из реплики
+
+        :return: результат в формате :numref:`результата запроса %s <Результат запроса get_users>`
+        :rtype: dict
+        """
+
+        return self._get_all('users')
+
+    def get_groups(self):
+        """Функция возвращает список групп из реплики
+
+        :return: результат в формате :numref:`результата запроса %s <Результат запроса get_groups>`
+        :rtype: dict
+        """
+
+        return self._get_all('groups')
+
+    def get_departments(self):
+        """Функция возвращает список подразделений из реплики
+
+        :return: результат в формате :numref:`результата запроса %s <Результат запроса get_departments>`
+        :rtype: dict
+        """
+
+        return self._get_all('departments')
@@ -0,0 +1,257 @@
+"""Модуль потоковой записи событий аудит-логов в файлы.
+
+События записываются пачками по мере получения, поэтому объем выгрузки не ограничен памятью:
+
+* :class:`NDJSONSink` — NDJSON без сжатия, со сжатием gzip или zstd (требуется пакет ``zstandard``);
+* :class:`ArrowSink` — колоночные файлы Parquet или Arrow IPC с ротацией по количеству строк
+  (требуется пакет ``pyarrow``). Схема строится по полям событий из модуля :mod:`yandex_360.logs`.
+
+.. code-block:: python
+
+    from yandex_360 import sinks, tools
+
+    events = tools.iter_mail_log(token, orgID, afterDate='2024-01-01T00:00:00Z')
+    with sinks.NDJSONSink('mail.ndjson.gz') as ndjson, sinks.ArrowSink('mail-{n:04d}.parquet', sinks.MAIL_LOG_FIELDS) as parquet:
+        sinks.write_events(events, ndjson, parquet)
+
+"""
+
+import gzip
+import io
+import json
+
+MAIL_LOG_FIELDS = {
+    'bcc': 'string',
+    'cc': 'string',
+    'clientIp': 'string',
+    'date': 'timestamp',
+    'destMid': 'string',
+    'eventType': 'string',
+    'folderName': 'string',
+    'folderType': 'string',
+    'from': 'string',
+    'labels': 'list',
+    'mid': 'string',
+    'msgId': 'string',
+    'orgId': 'int',
+    'requestId': 'string',
+    'source': 'string',
+    'subject': 'string',
+    'to': 'string',
+    'uniqId': 'string',
+    'userLogin': 'string',
+    'userName': 'string',
+    'userUid': 'string',
+}
+"""Поля событий аудит-лога Почты (logs.mail_log) и их типы"""
+
+DISK_LOG_FIELDS = {
+    'clientIp': 'string',
+    'date': 'timestamp',
+    'eventType': 'string',
+    'lastModificationDate': 'timestamp',
+    'orgId': 'int',
+    'ownerLogin': 'string',
+    'ownerName': 'string',
+    'ownerUid': 'string',
+    'path': 'string',
+    'requestId': 'string',
+    'resourceFileId': 'string',
+    'rights': 'string',
+    'size': 'string',
+    'uniqId': 'string',
+    'userLogin': 'string',
+    'userName': 'string',
+    'userUid': 'string',
+}
+"""Поля событий аудит-лога Диска (logs.disk_log) и их типы"""
+
+DEFAULT_BATCH_SIZE = 10000
+"""Количество событий в пачке по умолчанию"""
+
+DEFAULT_ROWS_PER_FILE = 1000000
+"""Количество строк в файле до ротации по умолчанию"""
+
+class NDJSONSink:
+    """Запись событий в NDJSON (одно событие JSON на строку)
+
+    :param path: путь к файлу
+    :type path: str
+    :param compression: сжатие: None, gzip или zstd (по умолчанию определяется по расширению .gz/.zst)
+    :type compression: str
+    :param level: уровень сжатия
+    :type level: int
+    """
+
+    def __init__(self, path, compression=None, level=None):
+        if compression is None:
+            compression = 'gzip' if path.endswith('.gz') else 'zstd' if path.endswith('.zst') else None
+
+        if compression == 'gzip':
+            self._raw = None
+            self._file = gzip.open(path, 'wt', encoding='utf-8', compresslevel=level or 6)
+        elif compression == 'zstd':
+            import zstandard
+            self._raw = open(path, 'wb')
+            writer = zstandard.ZstdCompressor(level=level or 3).stream_writer(self._raw)
+            self._file = io.TextIOWrapper(writer, encoding='utf-8')
+        else:
+            self._raw = None
+            self._file = open(path, 'w', encoding='utf-8')
+
+        self.count = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def write_batch(self, events):
+        """Функция записывает пачку событий
+
+        :param events: события
+        :type events: list
+        """
+
+        self._file.write(''.join(json.dumps(event, ensure_ascii=False) + '\n' for event in events))
+        self.count += len(events)
+
+    def close(self):
+        """Функция завершает запись и закрывает файл"""
+
+        self._file.close()
+        if self._raw is not None and not self._raw.closed:
+            self._raw.close()
+
+def arrow_schema(fields):
+    """Функция строит схему Arrow по описанию полей
+
+    :param fields: поля и типы: MAIL_LOG_FIELDS или DISK_LOG_FIELDS
+    :type fields: dict
+    :return: схема
+    :rtype: pyarrow.Schema
+    """
+
+    import pyarrow as pa
+
+    types = {
+        'string': pa.string(),
+        'int': pa.int64(),
+        'timestamp': pa.timestamp('us', tz='UTC'),
+        'list': pa.list_(pa.string()),
+    }
+    return pa.schema([(name, types[kind]) for name, kind in fields.items()])
+
+class ArrowSink:
+    """Запись событий в колоночные файлы Parquet или Arrow IPC с ротацией
+
+    :param pattern: шаблон пути файла с номером части, например ``mail-{n:04d}.parquet``
+    :type pattern: str
+    :param fields: поля и типы: MAIL_LOG_FIELDS или DISK_LOG_FIELDS
+    :type fields: dict
+    :param format: формат: parquet или arrow
+    :type format: str
+    :param rows_per_file: количество строк в файле до ротации
+    :type rows_per_file: int
+    :param compression: сжатие Parquet (zstd, snappy, gzip, none)
+    :type compression: str
+    """
+
+    def __init__(self, pattern, fields, format='parquet', rows_per_file=DEFAULT_ROWS_PER_FILE, compression='zstd'):
+        import pyarrow
+        from .export import parse_date
+
+        self._pa = pyarrow
+        self._parse_date = parse_date
+        self.pattern = pattern
+        self.fields = fields
+        self.schema = arrow_schema(fields)
+        self.format = format
+        self.rows_per_file = rows_per_file
+        self.compression = compression
+        self.files = []
+        self.count = 0
+        self._writer = None
+        self._rows = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _open(self):
+        path = self.pattern.format(n=len(self.files))
+        if self.format == 'parquet':
+            import pyarrow.parquet as pq
+            self._writer = pq.ParquetWriter(path, self.schema, compression=self.compression)
+        else:
+            self._writer = self._pa.ipc.new_file(path, self.schema)
+        self.files.append(path)
+        self._rows = 0
+
+    def _column(self, name, kind, events):
+        values = [event.get(name) for event in events]
+        if kind == 'timestamp':
+            return [self._parse_date(value) if value else None for value in values]
+        if kind == 'int':
+            return [int(value) if value not in (None, '') else None for value in values]
+        if kind == 'string':
+            return [value if value is None or isinstance(value, str) else str(value) for value in values]
+        return values
+
+    def write_batch(self, events):
+        """Функция записывает пачку событий, при превышении rows_per_file начинает новый файл
+
+        :param events: события
+        :type events: list
+        """
+
+        while events:
+            if self._writer is None or self._rows >= self.rows_per_file:
+                self.close()
+                self._open()
+            part = events[:self.rows_per_file - self._rows]
+            events = events[len(part):]
+            columns = [self._column(name, kind, part) for name, kind in self.fields.items()]
+            batch = self._pa.RecordBatch.from_arrays([self._pa.array(column, type=field.type) for column, field in zip(columns, self.schema)], schema=self.schema)
+            self._writer.write_batch(batch)
+            self._rows += len(part)
+            self.count += len(part)
+
+    def close(self):
+        """Функция завершает запись текущего файла"""
+
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+def write_events(events, *sinks, batch_size=DEFAULT_BATCH_SIZE):
+    """Функция записывает поток событий пачками во все переданные приемники
+
+    :param events: события, например tools.iter_mail_log(...) или logsync.sync_mail_log(...)
+    :type events: iterable
+    :param sinks: приемники: NDJSONSink, ArrowSink
+    :param batch_size: количество событий в пачке
+    :type batch_size: int
+    :return: количество записанных событий
+    :rtype: int
+    """
+
+    count = 0
+    batch = []
+    for event in events:
+        batch.append(event)
+        if len(batch) >= batch_size:
+            for sink in sinks:
+                sink.write_batch(batch)
+            count += len(batch)
+            batch = []
+
+    if batch:
+        for sink in sinks:
+            sink.write_batch(batch)
+        count += len(batch)
+
+    return count
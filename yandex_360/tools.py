@@ -1,6 +1,13 @@
 """Модуль вспомогательных функций"""
 
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from . import users, groups, departments, domains, dns, org, logs
+from .client import current, using
+
+DEFAULT_MAX_WORKERS = 4
+"""Количество потоков по умолчанию для параллельной загрузки страниц"""
 
 def check_request(req):
     """Функция проверки ответа запроса
@@ -13,6 +20,176 @@ def check_request(req):
 
     return True
 
+class RequestError(Exception):
+    """Ошибка запроса при потоковом обходе списков (iter_*)
+
+    :param req: ответ запроса с ошибкой: {'code': int, 'message': str}
+    :type req: dict
+    """
+
+    def __init__(self, req):
+        super().__init__(req.get('code'), req.get('message'))
+        self.req = req
+
+def map_parallel(func, items, max_workers=DEFAULT_MAX_WORKERS):
+    """Генератор результатов func(item) для каждого элемента, вычисляемых в max_workers потоков
+
+    Результаты выдаются в порядке элементов, одновременно выполняется не более 2*max_workers вызовов,
+    поэтому items может быть потоком (генератором) любой длины. Потоки используют активный клиент.
+
+    :param func: функция одного аргумента
+    :type func: function
+    :param items: элементы
+    :type items: iterable
+    :param max_workers: количество потоков
+    :type max_workers: int
+    :return: результаты
+    :rtype: generator
+    """
+
+    client = current()
+
+    def call(item):
+        with using(client):
+            return func(item)
+
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        try:
+            for item in items:
+                pending.append(pool.submit(call, item))
+                if len(pending) >= 2 * max_workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+class Paginator:
+    """Постраничный обход списков Yandex 360 API
+
+    Списки с нумерацией страниц (``page``/``pages``) загружаются так: первая страница, затем страницы
+    2..pages параллельно в ``max_workers`` потоков. Списки с ``nextPageToken`` загружаются по цепочке токенов.
+    Обход останавливается ровно на последней странице, количество выполненных запросов хранится в ``calls``.
+
+    .. code-block:: python
+
+        pgn = tools.Paginator(users.show_users, token, orgID)
+        usrs = pgn.collect('users')
+        pgn.calls   # == usrs['pages']
+
+    :param show: функция запроса одной страницы (например, users.show_users)
+    :type show: function
+    :param token: :term:`Яндекс токен приложения`
+    :type token: str
+    :param orgID: :term:`ID организации в Яндекс 360`
+    :type orgID: str
+    :param args: дополнительные позиционные аргументы функции show
+    :param max_workers: количество потоков для параллельной загрузки страниц
+    :type max_workers: int
+    :param kwargs: дополнительные именованные аргументы функции show
+    """
+
+    def __init__(self, show, token, orgID, *args, max_workers=DEFAULT_MAX_WORKERS, **kwargs):
+        self.show = show
+        self.token = token
+        self.orgID = orgID
+        self.args = args
+        self.kwargs = kwargs
+        self.max_workers = max_workers
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def _request(self, **extra):
+        with self._lock:
+            self.calls += 1
+        return self.show(self.token, self.orgID, *self.args, **self.kwargs, **extra)
+
+    def pages(self):
+        """Генератор ответов по страницам в порядке страниц
+
+        При ошибке запроса генератор возвращает ответ с ошибкой и завершает обход.
+
+        :return: ответы запросов
+        :rtype: generator
+        """
+
+        resp = self._request()
+        yield resp
+        if not check_request(resp):
+            return
+
+        if 'pages' in resp:
+            yield from self._numbered(resp['pages'])
+        else:
+            while resp.get('nextPageToken'):
+                resp = self._request(pageToken=resp['nextPageToken'])
+                yield resp
+                if not check_request(resp):
+                    return
+
+    def _numbered(self, pages):
+        client = current()
+
+        def fetch(page):
+            with using(client):
+                return self._request(page=page)
+
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            try:
+                for page in range(2, pages+1):
+                    pending.append(pool.submit(fetch, page))
+                    if len(pending) >= self.max_workers:
+                        resp = pending.popleft().result()
+                        yield resp
+                        if not check_request(resp):
+                            return
+                while pending:
+                    resp = pending.popleft().result()
+                    yield resp
+                    if not check_request(resp):
+                        return
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def items(self, key):
+        """Генератор записей списка постранично, в памяти хранится не более max_workers страниц
+
+        :param key: ключ списка в ответе (users, groups, events...)
+        :type key: str
+        :return: записи списка
+        :rtype: generator
+        :raises RequestError: при ошибке запроса
+        """
+
+        for resp in self.pages():
+            if not check_request(resp):
+                raise RequestError(resp)
+            yield from resp[key]
+
+    def collect(self, key):
+        """Функция загружает все страницы и объединяет списки в порядке страниц
+
+        :param key: ключ списка в ответе (users, groups, events...)
+        :type key: str
+        :return: объединенный результат или ответ с ошибкой
+        :rtype: dict
+        """
+
+        lst = []
+        for resp in self.pages():
+            if not check_request(resp):
+                return resp
+            lst += resp[key]
+
+        if 'pages' in resp:
+            return {key:lst,"page":resp['page'],"pages":resp['pages'],"perPage":resp['perPage'],"total":resp['total']}
+
+        return {key:lst,"nextPageToken":resp.get('nextPageToken', '')}
+
 def get_id_group_by_label(sstr, token, orgID):
     """Функция преобразования label группы в id
 
@@ -27,15 +204,12 @@ def get_id_group_by_label(sstr, token, orgID):
 
     """
 
-    grps = groups.show_groups(token, orgID)
-    if check_request(grps):
-        while grps['page'] <= grps['pages']:
-            for group in grps['groups']:
-                if group['label'] == sstr:
-                    return {'id':group['id']}
-            grps = groups.show_groups(token, orgID, page=grps['page']+1)
-    else:
-        return grps
+    for resp in Paginator(groups.show_groups, token, orgID, max_workers=1).pages():
+        if not check_request(resp):
+            return resp
+        for group in resp['groups']:
+            if group['label'] == sstr:
+                return {'id':group['id']}
 
 def get_id_department_by_label(sstr, token, orgID):
     """Функция преобразования label подразделения в id
@@ -51,16 +225,12 @@ def get_id_department_by_label(sstr, token, orgID):
 
     """
 
-    dep = departments.show_departments(token, orgID)
-
-    if check_request(dep):
-        while dep['page'] <= dep['pages']:
-            for department in dep['departments']:
-                if department['label'] == sstr:
-                    return {'id':department['id']}
-            dep = departments.show_departments(token, orgID, page=dep['page']+1)
-    else:
-        return dep
+    for resp in Paginator(departments.show_departments, token, orgID, max_workers=1).pages():
+        if not check_request(resp):
+            return resp
+        for department in resp['departments']:
+            if department['label'] == sstr:
+                return {'id':department['id']}
 
 def get_id_user_by_nickname(sstr, token, orgID):
     """Функция преобразования nickname пользователя в id
@@ -75,25 +245,101 @@ def get_id_user_by_nickname(sstr, token, orgID):
     :rtype: dict
 
     """
-     
-    usrs = users.show_users(token, orgID)
-
-    if check_request(usrs):
-        while usrs['page'] <= usrs['pages']:
-            for user in usrs['users']:
-                if user['nickname'] == sstr:
-                    return {'id':user['id']}
-            usrs = users.show_users(token, orgID, page=usrs['page']+1)
-    else:
-        return usrs
-
-def get_groups(token, orgID):
+
+    for resp in Paginator(users.show_users, token, orgID, max_workers=1).pages():
+        if not check_request(resp):
+            return resp
+        for user in resp['users']:
+            if user['nickname'] == sstr:
+                return {'id':user['id']}
+
+def _resolve(show, key, field, values, token, orgID):
+    """Функция за один проход по страницам находит id для набора значений поля
+
+    :return: {значение: id или None} или ответ с ошибкой
+    :rtype: dict
+    """
+
+    result = dict.fromkeys(values)
+    left = set(result)
+    if not left:
+        return result
+
+    for resp in Paginator(show, token, orgID, max_workers=1).pages():
+        if not check_request(resp):
+            return resp
+        for item in resp[key]:
+            if item[field] in left:
+                result[item[field]] = item['id']
+                left.discard(item[field])
+        if not left:
+            break
+
+    return result
+
+def resolve_nicknames(nicknames, token, orgID):
+    """Функция преобразования набора nickname пользователей в id за один проход по списку сотрудников
+
+    Обход страниц прекращается, как только найдены все nickname.
+
+    :param nicknames: nickname пользователей
+    :type nicknames: list
+    :param token: :term:`Яндекс токен приложения`
+    :type token: str
+    :param orgID: :term:`ID организации в Яндекс 360`
+    :type orgID: str
+    :return: ID пользователей {nickname: str}, для ненайденных — None
+    :rtype: dict
+
+    """
+
+    return _resolve(users.show_users, 'users', 'nickname', nicknames, token, orgID)
+
+def resolve_group_labels(labels, token, orgID):
+    """Функция преобразования набора label групп в id за один проход по списку групп
+
+    Обход страниц прекращается, как только найдены все label.
+
+    :param labels: label групп
+    :type labels: list
+    :param token: :term:`Яндекс токен приложения`
+    :type token: str
+    :param orgID: :term:`ID организации в Яндекс 360`
+    :type orgID: str
+    :return: ID групп {label: int}, для ненайденных — None
+    :rtype: dict
+
+    """
+
+    return _resolve(groups.show_groups, 'groups', 'label', labels, token, orgID)
+
+def resolve_department_labels(labels, token, orgID):
+    """Функция преобразования набора label подразделений в id за один проход по списку подразделений
+
+    Обход страниц прекращается, как только найдены все label.
+
+    :param labels: label подразделений
+    :type labels: list
+    :param token: :term:`Яндекс токен приложения`
+    :type token: str
+    :param orgID: :term:`ID организации в Яндекс 360`
+    :type orgID: str
+    :return: ID подразделений {label: int}, для ненайденных — None
+    :rtype: dict
+
+    """
+
+    return _resolve(departments.show_departments, 'departments', 'label', labels, token, orgID)
+
+def get_groups(token, orgID, max_workers=DEFAULT_MAX_WORKERS):
     """Функция возвращает список групп
 
     :param token: :term:`Яндекс токен приложения`
     :type token: str
     :param orgID: :term:`ID организации в Яндекс 360`
     :type orgID: str
+    :param max_workers: количество потоков для параллельной загрузки страниц
+    :type max_workers: int
     :return: :numref:`результат запроса %s <Результат запроса get_groups>`
     :rtype: dict
 
@@ -140,24 +386,17 @@ def get_groups(token, orgID):
 
     """
 
-    lst_grp =[]
-
-    grps = groups.show_groups(token, orgID)
-    if check_request(grps):
-        while grps['page'] <= grps['pages']:
-            lst_grp += grps['groups']
-            grps = groups.show_groups(token, orgID, page=grps['page']+1)
-        return {"groups":lst_grp,"page":grps['page'],"pages":grps['pages'],"perPage":grps['perPage'],"total":grps['total']}
-    else:
-        return grps
+    return Paginator(groups.show_groups, token, orgID, max_workers=max_workers).collect('groups')
 
-def get_departments(token, orgID):
+def get_departments(token, orgID, max_workers=DEFAULT_MAX_WORKERS):
     """Функция возвращает список подразделений
 
     :param token: :term:`Яндекс токен приложения`
     :type token: str
     :param orgID: :term:`ID организации в Яндекс 360`
     :type orgID: str
+    :param max_workers: количество потоков для параллельной загрузки страниц
+    :type max_workers: int
     :return: :numref:`результат запроса %s <Результат запроса get_departments>`
     :rtype: dict
 
@@ -191,24 +430,17 @@ def get_departments(token, orgID):
 
     """
 
-    lst_dep =[]
+    return Paginator(departments.show_departments, token, orgID, max_workers=max_workers).collect('departments')
 
-    deps = departments.show_departments(token, orgID)
-    if check_request(deps):
-        while deps['page'] <= deps['pages']:
-            lst_dep += deps['departments']
-            deps = departments.show_departments(token, orgID, page=deps['page']+1)
-        return {"departments":lst_dep,"page":deps['page'],"pages":deps['pages'],"perPage":deps['perPage'],"total":deps['total']}
-    else:
-        return deps
-
-def get_users(token, orgID):
+def get_users(token, orgID, max_workers=DEFAULT_MAX_WORKERS):
     """Функция Возвращает список сотрудников
 
     :param token: :term:`Яндекс токен приложения`
     :type token: str
     :param orgID: :term:`ID организации в Яндекс 360`
     :type orgID: str
+    :param max_workers: количество потоков для параллельной загрузки страниц
+    :type max_workers: int
     :return: :numref:`результат запроса %s <Результат запроса get_users>`
     :rtype: dict
 
@@ -269,24 +501,17 @@ def get_users(token, orgID):
 
     """
 
-    lst_usr =[]
-
-    usrs = users.show_users(token, orgID)
-    if check_request(usrs):
-        while usrs['page'] <= usrs['pages']:
-            lst_usr += usrs['users']
-            usrs = users.show_users(token, orgID, page=usrs['page']+1)
-        return {"users":lst_usr,"page":usrs['page'],"pages":usrs['pages'],"perPage":usrs['perPage'],"total":usrs['total']}
-    else:
-        return usrs
+    return Paginator(users.show_users, token, orgID, max_workers=max_workers).collect('users')
 
-def get_domains(token, orgID):
+def get_domains(token, orgID, max_workers=DEFAULT_MAX_WORKERS):
     """Функция возвращает список доменов организации
 
     :param token: :term:`Яндекс токен приложения`
     :type token: str
     :param orgID: :term:`ID организации в Яндекс 360`
     :type orgID: str
+    :param max_workers: количество потоков для параллельной загрузки страниц
+    :type max_workers: int
     :return: :numref:`результат запроса %s <Результат запроса get_domain>`
     :rtype: dict
 
@@ -334,18 +559,9 @@ def get_domains(token, orgID):
 
     """
 
-    lst_dom =[]
-
-    doms = domains.show_domains(token, orgID)
-    if check_request(doms):
-        while doms['page'] <= doms['pages']:
-            lst_dom += doms['domains']
-            doms = domains.show_domains(token, orgID, page=doms['page']+1)
-        return {"domains":lst_dom,"page":doms['page'],"pages":doms['pages'],"perPage":doms['perPage'],"total":doms['total']}
-    else:
-        return doms
+    return Paginator(domains.show_domains, token, orgID, max_workers=max_workers).collect('domains')
 
-def get_dns(token, orgID, domain):
+def get_dns(token, orgID, domain, max_workers=DEFAULT_MAX_WORKERS):
     """Функция позволяет получить все DNS-записи, которые были установлены для домена
 
     :param token: :term:`Яндекс токен приложения`
@@ -354,6 +570,8 @@ def get_dns(token, orgID, domain):
     :type orgID: str
     :param domain: :term:`Полное доменное имя`
     :type domain: str
+    :param max_workers: количество потоков для параллельной загрузки страниц
+    :type max_workers: int
     :return: :numref:`результат запроса %s <Результат запроса get_dns>`
     :rtype: dict
 
@@ -389,16 +607,7 @@ def get_dns(token, orgID, domain):
 
     """
 
-    lst_dnss =[]
-
-    dnss = dns.show_dns(token, orgID, domain)
-    if check_request(dnss):
-        while dnss['page'] <= dnss['pages']:
-            lst_dnss += dnss['records']
-            dnss = dns.show_dns(token, orgID, domain, page=dnss['page']+1)
-        return {"records":lst_dnss,"page":dnss['page'],"pages":dnss['pages'],"perPage":dnss['perPage'],"total":dnss['total']}
-    else:
-        return dnss
+    return Paginator(dns.show_dns, token, orgID, domain, max_workers=max_workers).collect('records')
 
 def get_orgs(token, orgID):
     """Функция возвращает список организаций пользователя
@@ -429,18 +638,7 @@ def get_orgs(token, orgID):
 
     """
 
-    lst_orgs =[]
-
-    orgs = org.show_orgs(token, orgID)
-    if check_request(orgs):
-        lst_orgs += orgs['organizations']
-        orgs = org.show_orgs(token, orgID, pageToken=orgs['nextPageToken'])
-        while orgs['nextPageToken'] != '':
-            lst_orgs += orgs['organizations']
-            orgs = org.show_orgs(token, orgID, pageToken=orgs['nextPageToken'])
-        return {"organizations":lst_orgs,"nextPageToken":orgs['nextPageToken']}
-    else:
-        return orgs
+    return Paginator(org.show_orgs, token, orgID).collect('organizations')
 
 def get_disk_log(token, orgID, beforeDate=None, afterDate=None, includeUids=None, excludeUids=None):
     """Функция возвращает список событий в аудит-логе Диска организации.
@@ -491,18 +689,7 @@ def get_disk_log(token, orgID, beforeDate=None, afterDate=None, includeUids=None
 
     """
 
-    lst_disk =[]
-
-    disk = logs.disk_log(token, orgID, beforeDate=beforeDate, afterDate=afterDate, includeUids=includeUids, excludeUids=excludeUids)
-    if check_request(disk):
-        lst_disk += disk['events']
-        disk = logs.disk_log(token, orgID, pageToken=disk['nextPageToken'], beforeDate=beforeDate, afterDate=afterDate, includeUids=includeUids, excludeUids=excludeUids)
-        while disk['nextPageToken'] != '':
-            lst_disk += disk['events']
-            disk = logs.disk_log(token, orgID, pageToken=disk['nextPageToken'], beforeDate=beforeDate, afterDate=afterDate, includeUids=includeUids, excludeUids=excludeUids)
-        return {"events":lst_disk,"nextPageToken":disk['nextPageToken']}
-    else:
-        return disk
+    return Paginator(logs.disk_log, token, orgID, beforeDate=beforeDate, afterDate=afterDate, includeUids=includeUids, excludeUids=excludeUids).collect('events')
 
 def get_mail_log(token, orgID, beforeDate=None, afterDate=None, includeUids=None, excludeUids=None, types=None):
     """Функция возвращает список событий в аудит-логе Почте организации.
@@ -561,15 +748,116 @@ def get_mail_log(token, orgID, beforeDate=None, afterDate=None, includeUids=None
 
     """
 
-    lst_mail =[]
-
-    mail = logs.mail_log(token, orgID, beforeDate=beforeDate, afterDate=afterDate, includeUids=includeUids, excludeUids=excludeUids, types=types)
-    if check_request(mail):
-        lst_mail += mail['events']
-        mail = logs.mail_log(token, orgID, pageToken=mail['nextPageToken'], beforeDate=beforeDate, afterDate=afterDate, includeUids=includeUids, excludeUids=excludeUids, types=types)
-        while mail['nextPageToken'] != '':
-            lst_mail += mail['events']
-            mail = logs.mail_log(token, orgID, pageToken=mail['nextPageToken'], beforeDate=beforeDate, afterDate=afterDate, includeUids=includeUids, excludeUids=excludeUids, types=types)
-        return {"events":lst_mail,"nextPageToken":mail['nextPageToken']}
-    else:
-        return mail
\ No newline at end of file
+    return Paginator(logs.mail_log, token, orgID, beforeDate=beforeDate, afterDate=afterDate, includeUids=includeUids, excludeUids=excludeUids, types=types).collect('events')
+
+def iter_users(token, orgID, max_workers=DEFAULT_MAX_WORKERS):
+    """Генератор сотрудников организации, записи выдаются по мере загрузки страниц
+
+    :param token: :term:`Яндекс токен приложения`
+    :type token: str
+    :param orgID: :term:`ID организации в Яндекс 360`
+    :type orgID: str
+    :param max_workers: количество потоков для параллельной загрузки страниц
+    :type max_workers: int
+    :return: сотрудники в формате :numref:`результата запроса %s <Результат запроса show_user>`
+    :rtype: generator
+    :raises RequestError: при ошибке запроса
+    """
+
+    return Paginator(users.show_users, token, orgID, max_workers=max_workers).items('users')
+
+def iter_groups(token, orgID, max_workers=DEFAULT_MAX_WORKERS):
+    """Генератор групп организации, записи выдаются по мере загрузки страниц
+
+    :param token: :term:`Яндекс токен приложения`
+    :type token: str
+    :param orgID: :term:`ID организации в Яндекс 360`
+    :type orgID: str
+    :param max_workers: количество потоков для параллельной загрузки страниц
+    :type max_workers: int
+    :return: группы в формате :numref:`результата запроса %s <Результат запроса show_group>`
+    :rtype: generator
+    :raises RequestError: при ошибке запроса
+    """
+
+    return Paginator(groups.show_groups, token, orgID, max_workers=max_workers).items('groups')
+
+def iter_departments(token, orgID, max_workers=DEFAULT_MAX_WORKERS):
+    """Генератор подразделений организации, записи выдаются по мере загрузки страниц
+
+    :param token: :term:`Яндекс токен приложения`
+    :type token: str
+    :param orgID: :term:`ID организации в Яндекс 360`
+    :type orgID: str
+    :param max_workers: количество потоков для параллельной загрузки страниц
+    :type max_workers: int
+    :return: подразделения в формате :numref:`результата запроса %s <Результат запроса show_department>`
+    :rtype: generator
+    :raises RequestError: при ошибке запроса
+    """
+
+    return Paginator(departments.show_departments, token, orgID, max_workers=max_workers).items('departments')
+
+def iter_dns(token, orgID, domain, max_workers=DEFAULT_MAX_WORKERS):
+    """Генератор DNS-записей домена, записи выдаются по мере загрузки страниц
+
+    :param token: :term:`Яндекс токен приложения`
+    :type token: str
+    :param orgID: :term:`ID организации в Яндекс 360`
+    :type orgID: str
+    :param domain: :term:`Полное доменное имя`
+    :type domain: str
+    :param max_workers: количество потоков для параллельной загрузки страниц
+    :type max_workers: int
+    :return: DNS-записи в формате :numref:`результата запроса %s <Результат запроса get_dns>`
+    :rtype: generator
+    :raises RequestError: при ошибке запроса
+    """
+
+    return Paginator(dns.show_dns, token, orgID, domain, max_workers=max_workers).items('records')
+
+def iter_disk_log(token, orgID, beforeDate=None, afterDate=None, includeUids=None, excludeUids=None):
+    """Генератор событий аудит-лога Диска организации, события выдаются по мере загрузки страниц
+
+    :param token: :term:`Яндекс токен приложения`
+    :type token: str
+    :param orgID: :term:`ID организации в Яндекс 360`
+    :type orgID: str
+    :param beforeDate: Верхняя граница периода выборки в формате ISO 8601
+    :type beforeDate: str
+    :param afterDate: Нижняя граница периода выборки в формате ISO 8601
+    :type afterDate: str
+    :param includeUids: Список пользователей, действия которых должны быть включены в список событий
+    :type includeUids: list
+    :param excludeUids: Список пользователей, действия которых должны быть исключены из списка событий
+    :type excludeUids: list
+    :return: события в формате :numref:`результата запроса %s <Результат запроса get_disk_log>`
+    :rtype: generator
+    :raises RequestError: при ошибке запроса
+    """
+
+    return Paginator(logs.disk_log, token, orgID, beforeDate=beforeDate, afterDate=afterDate, includeUids=includeUids, excludeUids=excludeUids).items('events')
+
+def iter_mail_log(token, orgID, beforeDate=None, afterDate=None, includeUids=None, excludeUids=None, types=None):
+    """Генератор событий аудит-лога Почты организации, события выдаются по мере загрузки страниц
+
+    :param token: :term:`Яндекс токен приложения`
+    :type token: str
+    :param orgID: :term:`ID организации в Яндекс 360`
+    :type orgID: str
+    :param beforeDate: Верхняя граница периода выборки в формате ISO 8601
+    :type beforeDate: str
+    :param afterDate: Нижняя граница периода выборки в формате ISO 8601
+    :type afterDate: str
+    :param includeUids: Список пользователей, действия которых должны быть включены в список событий
+    :type includeUids: list
+    :param excludeUids: Список пользователей, действия которых должны быть исключены из списка событий
+    :type excludeUids: list
+    :param types: Типы событий которые должны быть включены в список. По умолчанию включаются все события
+    :type types: list
+    :return: события в формате :numref:`результата запроса %s <Результат запроса get_mail_log>`
+    :rtype: generator
+    :raises RequestError: при ошибке запроса
+    """
+
+    return Paginator(logs.mail_log, token, orgID, beforeDate=beforeDate, afterDate=afterDate, includeUids=includeUids, excludeUids=excludeUids, types=types).items('events')
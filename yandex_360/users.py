@@ -10,7 +10,7 @@
 
 """
 
-from jreq.jreq import safe_request
+from .client import safe_request
 import json
 
 def show_users(token, orgID, page=1, perPage=100):